@@ -0,0 +1,18 @@
+"""
+api_basics - shared helpers for the practice scripts
+====================================================
+
+The ``partN_*.py`` scripts teach one idea each. The code they have in
+common (talking to the network, caching, retrying) and the weather and
+crypto getters live here, so every script gets the same behaviour and
+other programs can import them. ``python -m api_basics`` runs the getters
+from the command line.
+
+Importing the package does no I/O, and ``requests`` is only imported when
+the first ``ApiClient`` is built (see ``benchmarks/bench_import.py``).
+"""
+
+from api_basics.cache import ResponseCache
+from api_basics.client import ApiClient, get_client, set_client
+
+__all__ = ["ApiClient", "ResponseCache", "get_client", "set_client"]
@@ -0,0 +1,164 @@
+"""
+Command Line
+============
+
+The getters from the practice scripts, without the menus. Every result is
+printed as one line of JSON, so the output can be piped into ``jq`` or
+another script:
+
+    python -m api_basics weather delhi "new york" londn
+    python -m api_basics crypto bitcoin ethereum
+    python -m api_basics user 3
+    python -m api_basics posts --user 1 --search qui --limit 5
+    python -m api_basics city bangalor
+    python -m api_basics city --near 51.5 -0.12 -k 3
+    python -m api_basics get https://jsonplaceholder.typicode.com/todos/1
+    python -m api_basics batch queries.jsonl --workers 16   # see api_basics.batch
+
+Each line is ``{"query": ..., "result": ...}``. Failures are printed as
+``{"query": ..., "error": ...}`` lines and make the exit status 1.
+Modules are imported by the command that needs them, so
+``python -m api_basics city ...`` never loads ``requests``.
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from api_basics import queries
+from api_basics.queries import QueryError
+
+
+def answer(query, func, *args):
+    """``{"query": ..., "result" or "error": ...}`` for one lookup."""
+    try:
+        return {"query": query, "result": func(*args)}
+    except QueryError as e:
+        return {"query": query, "error": str(e)}
+    except Exception as e:
+        if not is_network_error(e):
+            raise
+        return {"query": query, "error": str(e)}
+
+
+def is_network_error(error):
+    """True for the errors a getter raises when the request or response is bad."""
+    from requests import RequestException
+
+    from api_basics.ratelimit import RateLimited
+    from api_basics.records import RecordError
+    from api_basics.streaming import ResponseTooLarge
+    return isinstance(error, (RequestException, RateLimited, RecordError, ResponseTooLarge))
+
+
+def cmd_weather(args):
+    for city in args.cities:
+        yield answer(city, queries.weather, city)
+
+
+def cmd_crypto(args):
+    for coin in args.coins:
+        yield answer(coin, queries.crypto, coin)
+
+
+def cmd_user(args):
+    for user_id in args.ids:
+        yield answer(user_id, queries.user, user_id)
+
+
+def cmd_posts(args):
+    yield answer(args.search, queries.posts, args.search, args.user, args.limit)
+
+
+def cmd_city(args):
+    name = " ".join(args.name)
+    yield answer(name or args.near, queries.cities, name, args.near, args.k, args.prefix)
+
+
+def cmd_get(args):
+    from api_basics.safe_request import safe_api_request
+
+    for url in args.urls:
+        result = safe_api_request(url, timeout=args.timeout, retries=args.retries,
+                                  max_bytes=args.max_bytes)
+        if result["success"]:
+            yield {"query": url, "result": result["data"]}
+        else:
+            yield {"query": url, "error": result["error"]}
+
+
+def cmd_batch(args):
+    from api_basics.batch import run_batch
+
+    source = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+    with source:
+        yield from run_batch(source, workers=args.workers, ordered=args.ordered,
+                             window=args.window)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m api_basics",
+        description="Weather, crypto prices, JSONPlaceholder and city lookups as JSON lines.",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="log requests and retries to stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    weather = commands.add_parser("weather", help="current weather for cities")
+    weather.add_argument("cities", nargs="+", help="city names (typos are forgiven)")
+    weather.set_defaults(run=cmd_weather)
+
+    crypto = commands.add_parser("crypto", help="CoinPaprika prices")
+    crypto.add_argument("coins", nargs="+", help="bitcoin, ethereum, ...")
+    crypto.set_defaults(run=cmd_crypto)
+
+    user = commands.add_parser("user", help="JSONPlaceholder users by id")
+    user.add_argument("ids", nargs="+", type=int)
+    user.set_defaults(run=cmd_user)
+
+    posts = commands.add_parser("posts", help="JSONPlaceholder posts")
+    posts.add_argument("--user", type=int, help="only posts by this user id")
+    posts.add_argument("--search", help="text to look for in the title or body")
+    posts.add_argument("--limit", type=int, default=10)
+    posts.set_defaults(run=cmd_posts)
+
+    city = commands.add_parser("city", help="look a city up in the bundled registry")
+    city.add_argument("name", nargs="*")
+    city.add_argument("--prefix", action="store_true", help="list cities starting with NAME")
+    city.add_argument("--near", nargs=2, type=float, metavar=("LAT", "LON"))
+    city.add_argument("-k", type=int, default=5, help="results for --prefix / --near")
+    city.set_defaults(run=cmd_city)
+
+    get = commands.add_parser("get", help="GET any JSON URL with retries")
+    get.add_argument("urls", nargs="+")
+    get.add_argument("--timeout", type=float, default=5)
+    get.add_argument("--retries", type=int, default=3)
+    get.add_argument("--max-bytes", type=int, help="give up on bodies bigger than this")
+    get.set_defaults(run=cmd_get)
+
+    batch = commands.add_parser("batch", help="answer JSONL queries from a file or stdin")
+    batch.add_argument("file", nargs="?", default="-", help="JSONL queries (default: stdin)")
+    batch.add_argument("--workers", type=int, default=8, help="queries run at once")
+    batch.add_argument("--ordered", action="store_true",
+                       help="write results in input order, not as they finish")
+    batch.add_argument("--window", type=int,
+                       help="most queries read ahead of the output (default 4 x workers)")
+    batch.set_defaults(run=cmd_batch)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR,
+                        format="%(asctime)s [%(levelname)s] %(message)s", stream=sys.stderr)
+    failed = False
+    for result in args.run(args):
+        failed = failed or "error" in result
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Transport Adapters
+==================
+
+``requests`` hands each request to a transport adapter, which owns the
+urllib3 connection pools. ``ApiClient`` mounts ``TimedHTTPAdapter``, whose
+connections report how long connecting took (the "connect" phase in
+api_basics.metrics). ``CassetteAdapter`` records and replays responses
+(see api_basics.cassette).
+
+This module imports ``requests`` and ``urllib3``, so only import it where
+a session is being built; ``api_basics.client`` does so on first use.
+"""
+
+import io
+import time
+
+from requests import ConnectionError, Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.sessions import REDIRECT_STATI as REDIRECT_STATUS
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from api_basics.cassette import Recording, request_key
+from api_basics.metrics import add_connect_time
+
+
+class _TimedConnect:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            add_connect_time(time.perf_counter() - start)
+
+
+class TimedHTTPConnection(_TimedConnect, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnect, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """An HTTPAdapter whose connections report how long connecting took."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+class CassetteMiss(ConnectionError):
+    """Replay mode, and the cassette has no recording for this request."""
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    Records the responses ``inner`` gets, or answers from a cassette.
+
+    Args:
+        cassette (Cassette): where recordings are kept
+        inner (BaseAdapter): the adapter that reaches the network
+        mode (str): "record", "replay" or "auto"
+        latency (str): "none" or "recorded", for replayed responses
+    """
+
+    def __init__(self, cassette, inner, mode="auto", latency="none"):
+        super().__init__()
+        self.cassette = cassette
+        self.inner = inner
+        self.mode = mode
+        self.latency = latency
+
+    def send(self, request, **kwargs):
+        key = request_key(request.method, request.url, request.body)
+        if self.mode != "record":
+            recording = self.cassette.get(key)
+            if recording is not None:
+                return self.replay(request.url, recording, request)
+            if self.mode == "replay":
+                raise CassetteMiss(f"Not on the cassette: {key}", request=request)
+        start = time.perf_counter()
+        response = self.inner.send(request, **kwargs)
+        recording = Recording.from_response(response, time.perf_counter() - start)
+        self.cassette.put(key, recording)
+        return response
+
+    def answer(self, method, url, params=None):
+        """
+        Replay mode without going through ``requests.Session``, which costs
+        far more than the replay itself. ``ApiClient.request`` uses this for
+        requests without a body.
+
+        Returns None for a redirect; send() replays those so the session
+        can follow them.
+
+        Raises:
+            CassetteMiss: nothing recorded for the request
+        """
+        key = request_key(method, url, params=params)
+        recording = self.cassette.get(key)
+        if recording is None:
+            raise CassetteMiss(f"Not on the cassette: {key}")
+        if recording.status in REDIRECT_STATUS:
+            return None
+        return self.replay(key.split(" ")[1], recording)
+
+    def replay(self, url, recording, request=None):
+        """A fresh ``requests.Response`` for ``recording``."""
+        if self.latency == "recorded" and recording.elapsed:
+            time.sleep(recording.elapsed)
+        response = Response()
+        response.status_code = recording.status
+        response.reason = recording.reason
+        response.headers = CaseInsensitiveDict(recording.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(recording.body)
+        response._content = recording.body
+        response._content_consumed = True
+        response.url = url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        self.inner.close()
@@ -0,0 +1,303 @@
+"""
+Async Requests
+==============
+
+The ``requests`` based code blocks one thread per request. That is fine for
+a handful of lookups, but not for hundreds at once. This module does the
+same work on ``asyncio`` with ``aiohttp`` (an optional dependency:
+``pip install aiohttp``):
+
+- ``AsyncApiClient``: pooled keep-alive session with default headers/timeout
+- ``safe_api_request_async``: the async twin of ``safe_api_request``, with
+  the same retries, backoff, circuit breaker and result dict
+- ``gather_limited``: run many coroutines with a concurrency limit
+
+    results = asyncio.run(gather_limited(safe_api_request_async, urls, limit=50))
+"""
+
+import asyncio
+import json
+import logging
+import socket
+import time
+from urllib.parse import urlsplit
+
+from api_basics.cache import make_key
+from api_basics.client import DEFAULT_HEADERS, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT
+from api_basics.fanout import DeadlineExceeded
+from api_basics.metrics import metrics
+from api_basics.ratelimit import RateLimited, note_too_many_requests, wait_for_slot_async
+from api_basics.retry import backoff_delay, host_state, parse_retry_after
+from api_basics.singleflight import AsyncSingleFlight
+
+logger = logging.getLogger(__name__)
+
+# in_flight.stats() shows how many calls were deduplicated.
+in_flight = AsyncSingleFlight()
+
+# Same as api_basics.safe_request.RETRYABLE_STATUS.
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+
+def _aiohttp():
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError("async support needs aiohttp: pip install aiohttp") from None
+    return aiohttp
+
+
+class ApiRequestError(Exception):
+    """Raised by the async getters when safe_api_request_async fails."""
+
+
+class AsyncApiClient:
+    """
+    A pooled, keep-alive aiohttp client.
+
+    The session is created on first use, inside the running event loop.
+
+    Args:
+        headers (dict): extra headers sent with every request
+        timeout (float): default total timeout per request, in seconds
+        limit (int): maximum open connections overall
+        limit_per_host (int): maximum open connections per host (0 = no limit)
+        verify (bool): verify TLS certificates
+    """
+
+    def __init__(self, headers=None, timeout=DEFAULT_TIMEOUT, limit=100,
+                 limit_per_host=DEFAULT_POOL_SIZE, verify=True):
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self.timeout = timeout
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.verify = verify
+        self._session = None
+
+    def session(self):
+        if self._session is None or self._session.closed:
+            aiohttp = _aiohttp()
+            connector = aiohttp.TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host, ssl=self.verify or False,
+            )
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def fetch_json(self, url, params=None, timeout=None):
+        """
+        GET ``url`` and return ``(decoded JSON, body size in bytes)``.
+
+        Raises aiohttp.ClientResponseError for 4xx/5xx responses, and
+        RateLimited if the host's rate limit queue is too long.
+        """
+        aiohttp = _aiohttp()
+        await wait_for_slot_async(url)
+        if params:
+            # aiohttp rejects bools; send them the way requests does.
+            params = {k: str(v) for k, v in params.items()}
+        kwargs = {}
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        if metrics.enabled:
+            return await self._timed_fetch_json(url, params, kwargs)
+        async with self.session().get(url, params=params, **kwargs) as response:
+            _check_status(url, response)
+            body = await response.read()
+        return json.loads(body), len(body)
+
+    async def _timed_fetch_json(self, url, params, kwargs):
+        # aiohttp doesn't say when it opened a connection, so "ttfb" here
+        # includes any connect time and "connect" isn't recorded.
+        start = time.perf_counter()
+        try:
+            async with self.session().get(url, params=params, **kwargs) as response:
+                headers_at = time.perf_counter()
+                body = await response.read()
+                status = response.status
+        except Exception as e:
+            metrics.record_error(url, e, None, time.perf_counter() - start)
+            raise
+        end = time.perf_counter()
+        metrics.record_response(url, status, len(body), None, headers_at - start,
+                                end - headers_at, end - start)
+        _check_status(url, response)
+        data = json.loads(body)
+        metrics.observe_phase(url, "decode", time.perf_counter() - end)
+        return data, len(body)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+def _check_status(url, response):
+    if response.status == 429:
+        note_too_many_requests(url, parse_retry_after(response.headers.get("Retry-After")))
+    response.raise_for_status()
+
+
+_client = None
+_client_loop = None
+
+
+def get_async_client():
+    """Return a shared AsyncApiClient for the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client, _client_loop = AsyncApiClient(), loop
+    return _client
+
+
+async def close_async_client():
+    """Close the shared client (call before the event loop ends)."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.close()
+    _client = _client_loop = None
+
+
+def _is_dns_failure(aiohttp, error):
+    dns_error = getattr(aiohttp, "ClientConnectorDNSError", None)
+    if dns_error is not None and isinstance(error, dns_error):
+        return True
+    return isinstance(getattr(error, "os_error", None), socket.gaierror)
+
+
+async def safe_api_request_async(url, timeout=5, retries=3, retry_delay=1, max_delay=30,
+                                 cache=None, client=None):
+    """
+    Async version of ``api_basics.safe_request.safe_api_request``.
+
+    Same arguments, retry rules and result dict; ``client`` picks the
+    AsyncApiClient to use (defaults to the shared one).
+
+    Returns:
+        dict: {"success": bool, "data": dict or None, "error": str or None}
+    """
+    if retries < 1:
+        return {"success": False, "error": f"retries must be at least 1, not {retries}"}
+    if cache is not None:
+        data = cache.get(make_key(url))
+        if data is not None:
+            logger.info(f"Cache hit: {url}")
+            return {"success": True, "data": data}
+
+    # Concurrent tasks asking for the same URL share one set of attempts,
+    # if they also agree on everything else about the call.
+    flight_key = (make_key(url), timeout, retries, retry_delay, max_delay,
+                  id(cache), id(client))
+    result = await in_flight.do(flight_key, _request_with_retries,
+                                url, timeout, retries, retry_delay, max_delay, cache, client)
+    return dict(result)
+
+
+async def _request_with_retries(url, timeout, retries, retry_delay, max_delay, cache, client):
+    aiohttp = _aiohttp()
+    host = host_state(url)
+    if not host.breaker.allow_request():
+        error_msg = f"Circuit open: {urlsplit(url).hostname} is failing, retry in {host.breaker.retry_in():.0f}s."
+        logger.warning(error_msg)
+        return {"success": False, "error": error_msg}
+    host.budget.deposit()
+
+    client = client or get_async_client()
+    for attempt in range(1, retries + 1):
+        retry_after = None
+        try:
+            logger.info(f"Requesting URL: {url} (Attempt {attempt})")
+            data, size = await client.fetch_json(url, timeout=timeout)
+            host.breaker.record_success()
+            if cache is not None:
+                cache.set(make_key(url), data, size=size)
+            return {"success": True, "data": data}
+        except RateLimited as e:
+            # Our own limit, not a failure of the host.
+            host.breaker.cancel_trial()
+            logger.error(str(e))
+            return {"success": False, "error": str(e)}
+        except asyncio.TimeoutError:
+            error_msg = f"Request timed out after {timeout} seconds."
+        except aiohttp.ClientResponseError as e:
+            error_msg = f"HTTP Error: {e.status}"
+            if e.status not in RETRYABLE_STATUS:
+                host.breaker.record_success()
+                logger.error(error_msg)
+                return {"success": False, "error": error_msg}
+            retry_after = parse_retry_after((e.headers or {}).get("Retry-After"))
+        except aiohttp.ClientConnectorError as e:
+            if _is_dns_failure(aiohttp, e):
+                host.breaker.record_failure()
+                error_msg = f"Could not resolve host: {urlsplit(url).hostname}"
+                logger.error(error_msg)
+                return {"success": False, "error": error_msg}
+            error_msg = "Connection failed. Check your internet."
+        except (aiohttp.ClientError, ValueError) as e:
+            error_msg = f"Request failed: {str(e)}"
+
+        host.breaker.record_failure()
+        if attempt == retries:
+            logger.warning(f"{error_msg} Giving up.")
+            break
+        if retry_after is not None and retry_after > max_delay:
+            logger.warning(f"{error_msg} Server asked to wait {retry_after:.0f}s; giving up.")
+            break
+        if not host.breaker.allow_request():
+            logger.warning(f"{error_msg} Circuit opened; giving up.")
+            break
+        if not host.budget.try_spend():
+            logger.warning(f"{error_msg} Retry budget for this host is spent; giving up.")
+            break
+
+        delay = retry_after if retry_after is not None else backoff_delay(attempt, retry_delay, max_delay)
+        logger.warning(f"{error_msg} Retrying in {delay:.1f}s...")
+        if metrics.enabled:
+            metrics.count_retry(url)
+        await asyncio.sleep(delay)
+
+    return {"success": False, "error": error_msg}
+
+
+async def gather_limited(func, items, limit=50, deadline=None):
+    """
+    Await ``func(item)`` for every item, at most ``limit`` at a time.
+
+    The async counterpart of ``api_basics.fanout.fan_out``.
+
+    Returns:
+        list: one ``(result, error)`` tuple per item, in input order
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(item):
+        async with semaphore:
+            return await func(item)
+
+    tasks = [asyncio.ensure_future(run(item)) for item in items]
+    if not tasks:
+        return []
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+    results = []
+    for task in tasks:
+        if task in pending:
+            results.append((None, DeadlineExceeded(f"no result within {deadline}s")))
+        elif task.exception() is not None:
+            results.append((None, task.exception()))
+        else:
+            results.append((task.result(), None))
+    return results
@@ -0,0 +1,149 @@
+"""
+Batch Mode
+==========
+
+``dashboard()`` and the part3 menu wait on ``input()``, which a cron job or
+a pipeline can't answer. Batch mode reads one JSON query per line instead:
+
+    {"type": "weather", "city": "delhi"}
+    {"type": "crypto", "coin": "bitcoin"}
+    {"type": "user", "id": 3}
+    {"type": "posts", "search": "qui", "user_id": 1, "limit": 5}
+    {"type": "city", "name": "londn"}
+
+and writes one JSON line per query as soon as it is answered:
+
+    {"line": 2, "query": {...}, "result": {...}}
+    {"line": 1, "query": {...}, "error": "city not found: atlantis"}
+
+From the command line:
+
+    python -m api_basics batch queries.jsonl --workers 16
+    cat queries.jsonl | python -m api_basics batch --ordered > results.jsonl
+
+Queries run on a pool of ``workers`` threads. At most ``window`` queries
+are read ahead of the results written, so memory stays the same however
+long the input is. With ``ordered=True`` results come out in input order;
+a slow query then holds back the ones after it, up to ``window``.
+"""
+
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from api_basics import queries
+from api_basics.queries import QueryError
+
+DEFAULT_WORKERS = 8
+
+
+def _field(query, name):
+    value = query.get(name)
+    if value is None or value == "":
+        raise QueryError(f"{query.get('type')} query needs {name!r}")
+    return value
+
+
+def run_query(query):
+    """Answer one decoded query dict (see the module docstring for the shapes)."""
+    kind = query.get("type")
+    if kind == "weather":
+        return queries.weather(_field(query, "city"))
+    if kind == "crypto":
+        return queries.crypto(_field(query, "coin"))
+    if kind == "user":
+        return queries.user(_field(query, "id"))
+    if kind == "posts":
+        return queries.posts(query.get("search"), query.get("user_id"), query.get("limit", 10))
+    if kind == "city":
+        return queries.cities(query.get("name"), query.get("near"), query.get("k", 5),
+                              query.get("prefix", False))
+    raise QueryError(f"unknown query type {kind!r} (weather, crypto, user, posts or city)")
+
+
+def run_line(number, line):
+    """The output dict for input line ``number``. Never raises."""
+    try:
+        query = json.loads(line)
+    except ValueError as e:
+        return {"line": number, "error": f"not valid JSON: {e}"}
+    if not isinstance(query, dict):
+        return {"line": number, "query": query, "error": "a query must be a JSON object"}
+    try:
+        return {"line": number, "query": query, "result": run_query(query)}
+    except Exception as e:
+        return {"line": number, "query": query, "error": str(e) or type(e).__name__}
+
+
+def run_batch(lines, workers=DEFAULT_WORKERS, ordered=False, window=None):
+    """
+    Answer a stream of JSONL queries on a thread pool.
+
+    Args:
+        lines (iterable): JSON query lines, e.g. an open file or sys.stdin
+                          (blank lines are skipped)
+        workers (int): queries run at once
+        ordered (bool): yield results in input order instead of as they finish
+        window (int): most queries read but not yet yielded (default 4 x workers)
+
+    Yields:
+        dict: one output record per query (see run_line)
+    """
+    window = window or workers * 4
+    slots = threading.Semaphore(window)
+    finished = queue.Queue()        # (seq, output), or (None, count / exception) from the reader
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def submit(seq, number, line):
+        future = executor.submit(run_line, number, line)
+        future.add_done_callback(lambda f: finished.put((seq, f.result())))
+
+    def read():
+        # A thread of its own, so results are written while the input is
+        # still arriving (e.g. from a slow pipe).
+        seq = 0
+        try:
+            for number, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                while not slots.acquire(timeout=0.1):
+                    if stop.is_set():
+                        return
+                if stop.is_set():
+                    return
+                submit(seq, number, line)
+                seq += 1
+        except Exception as e:
+            finished.put((None, e))
+        else:
+            finished.put((None, seq))
+
+    reader = threading.Thread(target=read, name="batch-reader", daemon=True)
+    reader.start()
+    total = None
+    done = 0
+    held = {}          # ordered mode: finished results waiting for earlier ones
+    try:
+        while total is None or done < total:
+            seq, output = finished.get()
+            if seq is None:
+                if isinstance(output, Exception):
+                    raise output
+                total = output
+                continue
+            if not ordered:
+                done += 1
+                slots.release()
+                yield output
+                continue
+            held[seq] = output
+            while done in held:
+                output = held.pop(done)
+                done += 1
+                slots.release()
+                yield output
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
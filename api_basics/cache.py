@@ -0,0 +1,240 @@
+"""
+Response Cache
+==============
+
+Open-Meteo's ``current_weather`` only changes every ``interval`` seconds
+(900 in ``weather_result.json``), so asking for the same city twice in a
+row should not cost two network calls.
+
+``ResponseCache`` is an in-memory cache keyed by the normalized URL and
+query parameters. Entries expire after a per-endpoint TTL, and the least
+recently used entries are evicted once ``max_entries`` or ``max_bytes``
+is exceeded.
+
+If the response came with an ``ETag`` or ``Last-Modified`` header, an
+expired entry is kept (for up to ``keep_stale`` seconds) together with
+those validators. The next request then asks "has it changed?"
+(``If-None-Match`` / ``If-Modified-Since``), and on a ``304 Not
+Modified`` the stored value is used again without downloading or parsing
+the body (see ``ApiClient.get_json``).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_TTL = 30   # seconds
+DEFAULT_KEEP_STALE = 24 * 3600   # seconds an expired entry is kept for revalidation
+
+# Per-host TTLs, used when the response itself doesn't say.
+DEFAULT_TTL_RULES = {
+    "api.open-meteo.com": 900,
+    "api.coinpaprika.com": 60,
+}
+
+
+def make_key(url, params=None):
+    """
+    Build a cache key that ignores parameter order and host case.
+
+    ``make_key("https://X.com/a?b=2", {"a": 1})`` and
+    ``make_key("https://x.com/a?a=1&b=2")`` give the same key.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((k, str(v)) for k, v in params.items())
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or "/",
+        urlencode(sorted(query)),
+        "",
+    ))
+
+
+def ttl_from_response(data):
+    """Use Open-Meteo's own update ``interval`` when the response has one."""
+    if isinstance(data, dict):
+        interval = data.get("current_weather", {}).get("interval")
+        if isinstance(interval, (int, float)) and interval > 0:
+            return interval
+    return None
+
+
+def pick_ttl(key, data, ttl_rules, default_ttl):
+    """TTL for a response: the response's own interval, else the host rule."""
+    ttl = ttl_from_response(data)
+    if ttl is not None:
+        return ttl
+    return ttl_rules.get(urlsplit(key).hostname, default_ttl)
+
+
+def validators_of(response):
+    """``(etag, last_modified)`` headers of a response (None where missing)."""
+    return response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+
+class CacheEntry:
+    __slots__ = ("value", "size", "expires_at", "etag", "last_modified", "decode_seconds")
+
+    def __init__(self, value, size, expires_at, etag=None, last_modified=None,
+                 decode_seconds=0.0):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.decode_seconds = decode_seconds    # what parsing the body took
+
+    def can_revalidate(self):
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self):
+        """``If-None-Match`` / ``If-Modified-Since`` headers for revalidating."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL + LRU cache for decoded JSON responses.
+
+    Cached values are shared between callers, so treat them as read-only.
+
+    Args:
+        max_entries (int): evict least-recently-used entries beyond this count
+        max_bytes (int): evict beyond this many response-body bytes (None = no limit)
+        default_ttl (float): seconds an entry lives when no rule matches
+        ttl_rules (dict): host -> TTL in seconds
+        keep_stale (float): seconds an expired entry with validators is kept
+    """
+
+    def __init__(self, max_entries=256, max_bytes=None, default_ttl=DEFAULT_TTL,
+                 ttl_rules=None, keep_stale=DEFAULT_KEEP_STALE):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_rules = dict(DEFAULT_TTL_RULES if ttl_rules is None else ttl_rules)
+        self.keep_stale = keep_stale
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.revalidations = 0
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, key, data=None):
+        """TTL for a response: the response's own interval, else the host rule."""
+        return pick_ttl(key, data, self.ttl_rules, self.default_ttl)
+
+    def get(self, key):
+        """Return the cached value for ``key``, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            now = time.monotonic()
+            if entry.expires_at <= now:
+                if not self._revalidatable(entry, now):
+                    self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def get_stale(self, key):
+        """The entry for ``key`` if it has validators to revalidate with, else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not self._revalidatable(entry, time.monotonic()):
+                return None
+            return entry
+
+    def set(self, key, value, size=0, ttl=None, etag=None, last_modified=None,
+            decode_seconds=0.0):
+        """
+        Store ``value`` (``size`` = body bytes) for ``ttl`` seconds, with the
+        response's validators (if any) for revalidating it later.
+        """
+        if ttl is None:
+            ttl = self.ttl_for(key, value)
+        if ttl <= 0 and not (etag or last_modified):
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(value, size, time.monotonic() + ttl,
+                                            etag, last_modified, decode_seconds)
+            self.total_bytes += size
+            self._evict()
+
+    def revalidated(self, key, value, ttl=None):
+        """The server answered 304 for ``key``: its ``value`` is fresh for ``ttl`` more."""
+        if ttl is None:
+            ttl = self.ttl_for(key, value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.expires_at = time.monotonic() + ttl
+            self._entries.move_to_end(key)
+            self.revalidations += 1
+
+    def invalidate(self, key):
+        """Drop one entry. Returns True if it was cached."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+            return False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """
+        Counters as a dict (hits, misses, evictions, expirations,
+        revalidations, entries, bytes).
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "revalidations": self.revalidations,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _revalidatable(self, entry, now):
+        return entry.can_revalidate() and entry.expires_at + self.keep_stale > now
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
@@ -0,0 +1,245 @@
+"""
+Record and Replay
+=================
+
+The practice scripts talk to live services, so two runs never take the
+same time and nothing works offline. A cassette records every response
+the shared client gets, and plays them back later without the network:
+
+    API_CASSETTE=runs.cassette python part5_real_api.py       # records what's missing
+    API_CASSETTE=runs.cassette API_CASSETTE_MODE=replay python part5_real_api.py
+
+or from code:
+
+    from api_basics import get_client
+    from api_basics.cassette import use_cassette
+
+    use_cassette(get_client(), "runs.cassette", mode="replay", latency="recorded")
+
+Modes:
+
+- ``record``: every request goes to the network; responses are saved
+- ``replay``: nothing goes to the network; a request that was never
+  recorded raises ``CassetteMiss``
+- ``auto``: replay what was recorded, record the rest
+
+``latency="recorded"`` makes a replayed response take as long as the
+original did; ``"none"`` answers at once (for profiling the rest of the
+stack). In replay mode the client doesn't queue for rate limits
+(api_basics.ratelimit), since nothing goes to the network.
+
+A request is matched by its method, its URL with the query parameters
+sorted (``make_key``) and a hash of its body, if it has one.
+
+The file is plain text, one recording per line: the request key, a tab,
+and the response as JSON. New recordings are appended, and a later line
+for the same key replaces an earlier one. Opening a cassette only reads
+the keys, to build an index of key -> file offset; a recording is decoded
+the first time it is replayed and kept for the next time.
+
+Only requests made through ``ApiClient`` (requests) are recorded, not the
+aiohttp ones in api_basics.aio.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+
+from api_basics.cache import make_key
+
+MODES = ("record", "replay", "auto")
+LATENCIES = ("none", "recorded")
+
+# Not replayed as recorded: requests already undid the encoding, and the
+# length is set from the saved body.
+_DROPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+
+_url_key = lru_cache(maxsize=4096)(make_key)
+
+
+def request_key(method, url, body=None, params=None):
+    """The key a request is recorded and looked up under."""
+    key = f"{method.upper()} {make_key(url, params) if params else _url_key(url)}"
+    if body:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if isinstance(body, bytes):
+            key += " " + hashlib.sha1(body).hexdigest()[:16]
+    return key
+
+
+class Recording:
+    """One recorded response."""
+
+    __slots__ = ("status", "reason", "headers", "body", "elapsed")
+
+    def __init__(self, status, reason, headers, body, elapsed):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.elapsed = elapsed
+
+    @classmethod
+    def from_response(cls, response, elapsed):
+        """Record a ``requests.Response`` (its body is read)."""
+        body = response.content
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in _DROPPED_HEADERS}
+        headers["Content-Length"] = str(len(body))
+        return cls(response.status_code, response.reason, headers, body, elapsed)
+
+    def to_json(self):
+        try:
+            body, encoding = self.body.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(self.body).decode("ascii"), "base64"
+        return json.dumps({"status": self.status, "reason": self.reason,
+                           "headers": self.headers, "body": body, "encoding": encoding,
+                           "elapsed": round(self.elapsed, 6)}, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        body = data["body"]
+        body = base64.b64decode(body) if data["encoding"] == "base64" else body.encode("utf-8")
+        return cls(data["status"], data["reason"], data["headers"], body, data["elapsed"])
+
+
+class Cassette:
+    """
+    Recorded responses in one append-only file, indexed by request key.
+
+    Safe to use from several threads.
+
+    Args:
+        path (str): cassette file (created on the first recording)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index = {}          # key -> offset of its latest line in the file
+        self.recordings = {}     # key -> Recording, decoded on first use
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._reader = None
+        self._writer = None
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def _load_index(self):
+        try:
+            self._reader = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        offset = 0
+        for line in self._reader:
+            key, tab, _ = line.partition(b"\t")
+            if tab and line.endswith(b"\n"):    # skip a line cut short by a crash
+                self.index[key.decode("utf-8")] = offset
+            offset += len(line)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def get(self, key):
+        """The Recording for ``key``, or None."""
+        recording = self.recordings.get(key)
+        if recording is not None:
+            self.hits += 1
+            return recording
+        offset = self.index.get(key)
+        if offset is None:
+            self.misses += 1
+            return None
+        with self._lock:
+            self._reader.seek(offset)
+            line = self._reader.readline()
+        recording = self.recordings[key] = Recording.from_json(line.partition(b"\t")[2])
+        self.hits += 1
+        return recording
+
+    def put(self, key, recording):
+        """Append ``recording`` to the file under ``key``."""
+        line = f"{key}\t{recording.to_json()}\n".encode("utf-8")
+        with self._lock:
+            if self._writer is None:
+                self._writer = open(self.path, "ab")
+            offset = self._writer.tell()
+            self._writer.write(line)
+            self._writer.flush()
+            self.index[key] = offset
+            self.recordings[key] = recording
+            self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            for handle in (self._reader, self._writer):
+                if handle is not None:
+                    handle.close()
+            self._reader = self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def use_cassette(client, cassette, mode="auto", latency="none"):
+    """
+    Send ``client``'s requests through a cassette.
+
+    Every transport adapter mounted on the client's session is wrapped, so
+    requests recorded through a custom adapter (e.g. the benchmarks'
+    stand-in redirect) still go through it. In replay mode the client
+    also answers requests without a body straight from the cassette,
+    skipping the session (see ``CassetteAdapter.answer``).
+
+    Args:
+        client (ApiClient): e.g. get_client()
+        cassette (str or Cassette): cassette file
+        mode (str): "record", "replay" or "auto" (see the module docstring)
+        latency (str): "none" or "recorded", for replayed responses
+
+    Returns:
+        Cassette: for its hits / misses / recorded counters
+
+    Raises:
+        FileNotFoundError: replay mode and the cassette file doesn't exist
+    """
+    from api_basics.adapters import CassetteAdapter
+
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}, not {mode!r}")
+    if latency not in LATENCIES:
+        raise ValueError(f"latency must be one of {', '.join(LATENCIES)}, not {latency!r}")
+    if not isinstance(cassette, Cassette):
+        if mode == "replay" and not os.path.exists(cassette):
+            raise FileNotFoundError(f"no cassette to replay: {cassette}")
+        cassette = Cassette(cassette)
+
+    session = client.session
+    for prefix, adapter in list(session.adapters.items()):
+        if isinstance(adapter, CassetteAdapter):
+            adapter = adapter.inner
+        session.mount(prefix, CassetteAdapter(cassette, adapter, mode, latency))
+    client.replay = None
+    if mode == "replay":
+        client.replay = session.get_adapter("https://")
+    return cassette
+
+
+def cassette_from_environment(client):
+    """Apply ``API_CASSETTE`` (+ ``_MODE``, ``_LATENCY``) to ``client`` if it is set."""
+    path = os.environ.get("API_CASSETTE")
+    if path:
+        use_cassette(client, path, os.environ.get("API_CASSETTE_MODE", "auto"),
+                     os.environ.get("API_CASSETTE_LATENCY", "none"))
@@ -0,0 +1,451 @@
+"""
+City Registry
+=============
+
+Finds coordinates for about 34,000 places (every city with at least 15,000
+inhabitants) from a bundled binary file, ``api_basics/data/cities.bin``.
+
+    city = get_city("bangalore")          # Bengaluru, IN (12.972, 77.594)
+    find_city("londn")                    # typo -> London, GB
+    find_city("london, ca")               # London, CA
+    search_cities("san f")                # San Francisco, San Fernando, ...
+    nearest_cities(28.61, 77.21, k=3)     # [(New Delhi, 1.3 km), ...]
+
+Nothing is read until the first lookup, so importing this module costs
+nothing. The first lookup loads the file (about 20 ms). After that:
+
+- exact names and specific prefixes: 10-40 µs
+- nearest city to a point near a city: about 50 µs (a few hundred µs
+  out at sea, where the search has to look further)
+- fuzzy matches: 1-3 ms, after a one-off trigram index build (about
+  0.2 s) on the first fuzzy lookup
+
+See ``benchmarks/bench_cities.py``.
+
+File layout
+-----------
+A header ``CTY1, n records, m names, display bytes, key bytes`` followed
+by one zlib-compressed block of little-endian arrays:
+
+- latitude float32[n], longitude float32[n], population uint32[n]
+- display name offsets uint32[n+1]
+- key offsets uint32[m+1], record index uint32[m] (one per name)
+- country codes char[2n], display names and keys (UTF-8 text)
+
+Loading it is one read and one decompress to about 1.6 MB. The arrays
+are then used in place through memoryviews.
+
+Records are stored in implicit k-d tree order over their 3D unit vectors.
+The middle record of any range splits it on axis ``depth % 3``, so the
+array is the tree and nearest-neighbour search needs no extra index.
+Names are sorted by normalized key (lower case, no accents, "-" read as a
+space) and then by population, so a binary search finds the largest city
+for a name first. Besides each city's own name, cities of a million or
+more people are also listed under their common English alternatives
+("Bangalore", "Bombay", "New York").
+
+Rebuild it from a GeoNames dump (e.g. ``cities15000.txt`` from
+https://download.geonames.org/export/dump/):
+
+    python -m api_basics.cities cities15000.txt
+
+City data: GeoNames (https://www.geonames.org), CC BY 4.0.
+"""
+
+import heapq
+import math
+import os
+import re
+import struct
+import sys
+import threading
+import unicodedata
+import zlib
+from array import array
+from collections import Counter
+from difflib import SequenceMatcher
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "cities.bin")
+
+MAGIC = b"CTY1"
+HEADER = struct.Struct("<4sIIII")
+
+EARTH_RADIUS_KM = 6371.0
+
+# Alternative names are kept for cities at least this big.
+ALIAS_POPULATION = 1_000_000
+_ALIAS_RE = re.compile(r"[A-Z][A-Za-z .'-]{2,}$")
+
+
+def normalize(name):
+    """Lookup key for a name: lower case, accents removed, "-" -> " "."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return " ".join(name.casefold().replace("-", " ").split())
+
+
+def _unit_vector(lat, lon):
+    lat, lon = math.radians(lat), math.radians(lon)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+class City:
+    """One place from the registry."""
+
+    __slots__ = ("name", "country", "latitude", "longitude", "population")
+
+    def __init__(self, name, country, latitude, longitude, population):
+        self.name = name
+        self.country = country
+        self.latitude = latitude
+        self.longitude = longitude
+        self.population = population
+
+    def __eq__(self, other):
+        if not isinstance(other, City):
+            return NotImplemented
+        return (self.name, self.country, self.latitude, self.longitude) == \
+               (other.name, other.country, other.latitude, other.longitude)
+
+    def __hash__(self):
+        return hash((self.name, self.country, self.latitude, self.longitude))
+
+    def __repr__(self):
+        return f"City({self.name}, {self.country}, {self.latitude}, {self.longitude})"
+
+
+class CityRegistry:
+    """
+    Name and location lookups over a ``cities.bin`` file.
+
+    Args:
+        path (str): the binary file written by ``build()``
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._data = None
+        self._trigrams = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    with open(self.path, "rb") as f:
+                        raw = f.read()
+                    self._data = _CityData(raw)
+        return self._data
+
+    def __len__(self):
+        return self._load().n
+
+    # --- names -------------------------------------------------------------
+
+    def get(self, name, country=None):
+        """
+        The most populous city called exactly ``name`` (None if there is none).
+
+        ``country`` is an ISO code such as "GB"; it can also be given as
+        part of the name: ``get("london, gb")``.
+        """
+        data = self._load()
+        key, country = _split_country(name, country)
+        target = key.encode()
+        i = data.lower_bound(target)
+        while i < data.m and data.key(i) == target:
+            record = data.entry_record[i]
+            if country is None or data.country(record) == country:
+                return data.city(record)
+            i += 1
+        return None
+
+    def search(self, prefix, limit=10):
+        """Cities whose name (or alternative name) starts with ``prefix``, biggest first."""
+        data = self._load()
+        target = normalize(prefix).encode()
+        matches = {}
+        i = data.lower_bound(target)
+        while i < data.m and data.key(i).startswith(target):
+            record = data.entry_record[i]
+            matches[record] = data.population[record]
+            i += 1
+        best = heapq.nlargest(limit, matches, key=matches.__getitem__)
+        return [data.city(record) for record in best]
+
+    def fuzzy(self, name, limit=5, cutoff=0.75):
+        """
+        Cities whose name is close to ``name`` despite typos.
+
+        Returns:
+            list: ``(City, score)`` pairs, best first; scores run from
+                  ``cutoff`` to 1.0
+        """
+        data = self._load()
+        key, country = _split_country(name, None)
+        if not key:
+            return []
+        index = self._trigram_index()
+
+        # Names that share the most trigrams with the query ...
+        shared = Counter()
+        for gram in _trigrams(key):
+            postings = index.get(gram)
+            if postings is not None:
+                shared.update(postings)
+        # ... are compared with it properly.
+        scored = {}
+        for entry, _ in shared.most_common(50):
+            score = SequenceMatcher(None, key, data.key(entry).decode()).ratio()
+            record = data.entry_record[entry]
+            if score >= cutoff and score > scored.get(record, 0):
+                if country is None or data.country(record) == country:
+                    scored[record] = score
+        # Equal scores go to the bigger city.
+        best = sorted(scored, key=lambda r: (scored[r], data.population[r]), reverse=True)
+        return [(data.city(record), round(scored[record], 3)) for record in best[:limit]]
+
+    def find(self, name):
+        """An exact match for ``name`` if there is one, else the best fuzzy match."""
+        city = self.get(name)
+        if city is None:
+            matches = self.fuzzy(name, limit=1)
+            city = matches[0][0] if matches else None
+        return city
+
+    def _trigram_index(self):
+        if self._trigrams is None:
+            data = self._load()
+            with self._lock:
+                if self._trigrams is None:
+                    index = {}
+                    for entry in range(data.m):
+                        for gram in _trigrams(data.key(entry).decode()):
+                            postings = index.get(gram)
+                            if postings is None:
+                                postings = index[gram] = array("I")
+                            postings.append(entry)
+                    self._trigrams = index
+        return self._trigrams
+
+    # --- locations ---------------------------------------------------------
+
+    def nearest(self, latitude, longitude, k=1):
+        """
+        The ``k`` cities closest to a point.
+
+        Returns:
+            list: ``(City, distance in km)`` pairs, closest first (none if ``k <= 0``)
+        """
+        if k <= 0:
+            return []
+        data = self._load()
+        target = _unit_vector(latitude, longitude)
+        heap = []   # (-chord, record): the k best so far, worst on top
+
+        # (lo, hi, depth, lower bound on the chord to anything in lo:hi)
+        stack = [(0, data.n, 0, 0.0)]
+        while stack:
+            lo, hi, depth, bound = stack.pop()
+            if lo >= hi or (len(heap) == k and bound >= -heap[0][0]):
+                continue
+            mid = (lo + hi) // 2
+            point = _unit_vector(data.latitude[mid], data.longitude[mid])
+            chord = math.dist(point, target)
+            if len(heap) < k:
+                heapq.heappush(heap, (-chord, mid))
+            elif chord < -heap[0][0]:
+                heapq.heapreplace(heap, (-chord, mid))
+
+            axis = depth % 3
+            diff = target[axis] - point[axis]
+            near, far = ((mid + 1, hi), (lo, mid)) if diff > 0 else ((lo, mid), (mid + 1, hi))
+            # The far side is searched last, once the near side has tightened
+            # the k-th best distance, and skipped if the split plane is further.
+            stack.append((far[0], far[1], depth + 1, abs(diff)))
+            stack.append((near[0], near[1], depth + 1, bound))
+
+        result = sorted((-neg, record) for neg, record in heap)
+        return [(data.city(record), _chord_to_km(chord)) for chord, record in result]
+
+
+class _CityData:
+    """Views onto the arrays of a loaded cities.bin."""
+
+    def __init__(self, raw):
+        magic, n, m, display_size, key_size = HEADER.unpack_from(raw)
+        if magic != MAGIC:
+            raise ValueError("not a cities.bin file")
+        view = memoryview(zlib.decompress(raw[HEADER.size:]))
+        pos = 0
+
+        def take(fmt, count):
+            nonlocal pos
+            size = struct.calcsize(fmt) * count
+            part = view[pos:pos + size].cast(fmt)
+            pos += size
+            return part
+
+        self.n, self.m = n, m
+        self.latitude = take("f", n)
+        self.longitude = take("f", n)
+        self.population = take("I", n)
+        self.display_offsets = take("I", n + 1)
+        self.key_offsets = take("I", m + 1)
+        self.entry_record = take("I", m)
+        self.countries = take("B", 2 * n).tobytes()
+        self.display = take("B", display_size).tobytes()
+        self.keys = take("B", key_size).tobytes()
+
+    def key(self, entry):
+        return self.keys[self.key_offsets[entry]:self.key_offsets[entry + 1]]
+
+    def lower_bound(self, target):
+        lo, hi = 0, self.m
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def country(self, record):
+        return self.countries[2 * record:2 * record + 2].decode()
+
+    def city(self, record):
+        name = self.display[self.display_offsets[record]:self.display_offsets[record + 1]]
+        return City(name.decode(), self.country(record),
+                    round(self.latitude[record], 5), round(self.longitude[record], 5),
+                    self.population[record])
+
+
+def _split_country(name, country):
+    if country is None and "," in name:
+        name, _, code = name.rpartition(",")
+        if len(code.strip()) == 2:
+            country = code
+        else:
+            name = f"{name},{code}"
+    return normalize(name), country.strip().upper() if country else None
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# --- building the file -----------------------------------------------------
+
+def build(source, path=DEFAULT_PATH, min_population=0, alias_population=ALIAS_POPULATION):
+    """
+    Write a cities.bin from a GeoNames dump (tab-separated, one place per line).
+
+    Returns:
+        int: the number of cities written
+    """
+    places = []
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            population = int(cols[14] or 0)
+            if population < min_population:
+                continue
+            aliases = cols[3].split(",") if population >= alias_population else []
+            places.append((cols[1], cols[8][:2].ljust(2), float(cols[4]), float(cols[5]),
+                           population, aliases))
+
+    places = _kd_order(places, [_unit_vector(p[2], p[3]) for p in places])
+
+    entries = []   # (key, -population, record)
+    primary_keys = set()
+    for record, (name, _, _, _, population, _) in enumerate(places):
+        key = normalize(name)
+        primary_keys.add(key)
+        entries.append((key, -population, record))
+    for record, (name, _, _, _, population, aliases) in enumerate(places):
+        own = {normalize(name)}
+        for alias in aliases:
+            # Proper names only: skip codes like "DEL" and other cities' names.
+            key = normalize(alias)
+            if (_ALIAS_RE.match(alias) and not alias.isupper()
+                    and key not in own and key not in primary_keys):
+                own.add(key)
+                entries.append((key, -population, record))
+    entries.sort()
+
+    display = [p[0].encode() for p in places]
+    keys = [e[0].encode() for e in entries]
+    body = b"".join([
+        array("f", (p[2] for p in places)).tobytes(),
+        array("f", (p[3] for p in places)).tobytes(),
+        array("I", (p[4] for p in places)).tobytes(),
+        _offsets(display).tobytes(),
+        _offsets(keys).tobytes(),
+        array("I", (e[2] for e in entries)).tobytes(),
+        "".join(p[1] for p in places).encode("ascii"),
+        b"".join(display),
+        b"".join(keys),
+    ])
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(places), len(entries),
+                            sum(map(len, display)), sum(map(len, keys))))
+        f.write(zlib.compress(body, 9))
+    return len(places)
+
+
+def _offsets(chunks):
+    offsets, total = array("I", [0]), 0
+    for chunk in chunks:
+        total += len(chunk)
+        offsets.append(total)
+    return offsets
+
+
+def _kd_order(places, points):
+    """Reorder ``places`` so the middle of every range splits it (see File layout)."""
+    order = list(range(len(places)))
+    stack = [(0, len(order), 0)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo <= 1:
+            continue
+        axis = depth % 3
+        order[lo:hi] = sorted(order[lo:hi], key=lambda i: points[i][axis])
+        mid = (lo + hi) // 2
+        stack.append((lo, mid, depth + 1))
+        stack.append((mid + 1, hi, depth + 1))
+    return [places[i] for i in order]
+
+
+# The shared registry behind find_city() and friends.
+registry = CityRegistry()
+
+
+def get_city(name, country=None):
+    """The most populous city called exactly ``name`` (or None)."""
+    return registry.get(name, country)
+
+
+def find_city(name):
+    """City for ``name``: exact match first, then the closest spelling (or None)."""
+    return registry.find(name)
+
+
+def search_cities(prefix, limit=10):
+    return registry.search(prefix, limit)
+
+
+def nearest_cities(latitude, longitude, k=1):
+    return registry.nearest(latitude, longitude, k)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m api_basics.cities cities15000.txt")
+    count = build(sys.argv[1])
+    print(f"Wrote {count} cities to {DEFAULT_PATH}")
@@ -0,0 +1,272 @@
+"""
+Shared HTTP Client
+==================
+
+Every ``requests.get()`` call opens a brand new TCP (and TLS) connection,
+and for small JSON APIs that handshake is most of the time a request takes.
+
+``ApiClient`` wraps a single ``requests.Session`` so connections are kept
+alive and reused. Each host gets its own connection pool, and default
+headers and timeouts are applied to every request.
+
+``requests`` is imported when the first client is built, not when this
+module is, so importing api_basics stays fast and does no I/O.
+"""
+
+import threading
+import time
+
+from api_basics.cache import ResponseCache, make_key, validators_of
+from api_basics.hedging import HEDGE_METHODS
+from api_basics.metrics import connect_time, decode_json, metrics, reset_connect_time
+from api_basics.ratelimit import note_too_many_requests, wait_for_slot
+from api_basics.retry import parse_retry_after
+from api_basics.singleflight import SingleFlight
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept": "application/json",
+}
+
+DEFAULT_TIMEOUT = 10          # seconds
+DEFAULT_POOL_HOSTS = 10       # how many hosts keep a pool
+DEFAULT_POOL_SIZE = 10        # open connections kept per host
+
+# A request with one of these can't be matched to a recording without
+# preparing it first, so it takes the full session path when replaying.
+_BODY_ARGS = {"data", "json", "files"}
+
+
+class ApiClient:
+    """
+    A pooled, keep-alive HTTP client.
+
+    Args:
+        headers (dict): extra headers sent with every request
+        timeout (float or tuple): default timeout for every request
+        pool_hosts (int): number of per-host connection pools to keep
+        pool_size (int): maximum idle connections kept per host
+        verify (bool or str): TLS verification, passed to requests
+        cache (ResponseCache): cache used by get_json (None = no caching)
+        hedge (HedgePolicy): send a second copy of slow GETs (api_basics.hedging);
+                             None = never
+    """
+
+    def __init__(self, headers=None, timeout=DEFAULT_TIMEOUT,
+                 pool_hosts=DEFAULT_POOL_HOSTS, pool_size=DEFAULT_POOL_SIZE,
+                 verify=True, cache=None, hedge=None):
+        import requests
+        from api_basics.adapters import TimedHTTPAdapter
+
+        self.timeout = timeout
+        self.verify = verify
+        self.cache = cache
+        self.hedge = hedge
+        self.singleflight = SingleFlight()
+        self.replay = None      # CassetteAdapter in replay mode (api_basics.cassette)
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+
+        adapter = TimedHTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request through the shared session (default timeout applied).
+
+        Waits for a slot first if the host is rate limited (api_basics.ratelimit),
+        unless the client is replaying a cassette. With a ``hedge`` policy, a
+        slow GET is sent a second time and the first response wins
+        (api_basics.hedging).
+
+        Raises:
+            RateLimited: if that wait would be longer than the host's max_wait
+        """
+        if self.replay is not None and not kwargs.keys() & _BODY_ARGS:
+            response = self.replay.answer(method, url, kwargs.get("params"))
+            if response is not None:
+                return response
+        kwargs.setdefault("timeout", self.timeout)
+        # Passed per request: a session-level verify loses to REQUESTS_CA_BUNDLE.
+        kwargs.setdefault("verify", self.verify)
+        if (self.hedge is not None and method.upper() in HEDGE_METHODS
+                and not kwargs.keys() & _BODY_ARGS):
+            return self._hedged_request(method, url, kwargs)
+        return self._send(method, url, kwargs)
+
+    def _hedged_request(self, method, url, kwargs):
+        # Each copy stops at the headers, so the loser's body is never read.
+        stream = kwargs.pop("stream", False)
+        response = self.hedge.run(lambda: self._send(method, url, dict(kwargs, stream=True)), url)
+        if not stream:
+            response.content
+        return response
+
+    def _send(self, method, url, kwargs):
+        if self.replay is None:     # replaying never reaches the host
+            wait_for_slot(url)
+        if not metrics.enabled:
+            response = self.session.request(method, url, **kwargs)
+        else:
+            response = self._timed_request(method, url, kwargs)
+        if response.status_code == 429:
+            note_too_many_requests(url, parse_retry_after(response.headers.get("Retry-After")))
+        return response
+
+    def _timed_request(self, method, url, kwargs):
+        # stream=True makes session.request() return once the headers are
+        # in, so the body read can be timed on its own.
+        import requests
+
+        stream = kwargs.pop("stream", False)
+        reset_connect_time()
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, stream=True, **kwargs)
+            headers_at = time.perf_counter()
+            if not stream:
+                response.content
+        except requests.RequestException as e:
+            metrics.record_error(url, e, connect_time(), time.perf_counter() - start)
+            raise
+        end = time.perf_counter()
+        connect = connect_time()
+        metrics.record_response(
+            url, response.status_code, None if stream else len(response.content),
+            connect, headers_at - start - connect, end - headers_at, end - start,
+        )
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def conditional_get(self, url, cache=None, key=None, **kwargs):
+        """
+        GET ``url``, revalidating the expired cache entry for ``key`` if it has
+        an ETag or Last-Modified to send.
+
+        Returns:
+            tuple: (response, entry). ``entry`` is the cache entry when the
+            server answered 304 Not Modified (its value is still good and
+            has been marked fresh), else None.
+        """
+        stale = cache.get_stale(key) if cache is not None else None
+        if stale is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **stale.conditional_headers()}
+        response = self.get(url, **kwargs)
+        if stale is None or response.status_code != 304:
+            return response, None
+        cache.revalidated(key, stale.value)
+        if metrics.enabled:
+            metrics.record_not_modified(url, stale.size, stale.decode_seconds)
+        return response, stale
+
+    def get_json(self, url, params=None, use_cache=True, refresh=False, key=None,
+                 on_fetch=None, **kwargs):
+        """
+        GET ``url`` and return the decoded JSON body, going through the cache.
+
+        An expired entry is revalidated if the response had an ETag or
+        Last-Modified; on 304 Not Modified the cached value is returned
+        without downloading or decoding the body again.
+
+        Args:
+            url (str): API endpoint
+            params (dict): query parameters
+            use_cache (bool): False bypasses the cache for this call
+            refresh (bool): skip any cached value and store the fresh one
+            key (str): cache and single-flight key, when requests that differ
+                       should still share one (defaults to url + params)
+            on_fetch (callable): called with the decoded data when it comes
+                                 from the network rather than the cache
+
+        Raises:
+            requests.HTTPError: for 4xx/5xx responses (these are never cached)
+        """
+        cache = self.cache if use_cache else None
+        key = key or make_key(url, params)
+        if cache is not None and not refresh:
+            data = cache.get(key)
+            if data is not None:
+                return data
+
+        # Concurrent callers asking for the same key share one request.
+        return self.singleflight.do(key, self._fetch_json, key, url, params, cache,
+                                    on_fetch, kwargs)
+
+    def _fetch_json(self, key, url, params, cache, on_fetch, kwargs):
+        response, not_modified = self.conditional_get(url, cache, key, params=params, **kwargs)
+        if not_modified is not None:
+            return not_modified.value
+        response.raise_for_status()
+        start = time.perf_counter()
+        data = decode_json(response, url)
+        decode_seconds = time.perf_counter() - start
+        if on_fetch is not None:
+            on_fetch(data)
+        if cache is not None:
+            store_response(cache, key, data, response, decode_seconds)
+        return data
+
+    def invalidate(self, url, params=None, key=None):
+        """Drop the cached response for one URL + params (or one get_json key)."""
+        if self.cache is not None:
+            self.cache.invalidate(key or make_key(url, params))
+
+    def close(self):
+        """Close every pooled connection."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def store_response(cache, key, data, response, decode_seconds=0.0):
+    """Cache ``data`` decoded from ``response``, with its validators for revalidation."""
+    etag, last_modified = validators_of(response)
+    cache.set(key, data, size=len(response.content), etag=etag, last_modified=last_modified,
+              decode_seconds=decode_seconds)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Return the process-wide client, creating it on first use.
+
+    If ``API_CASSETTE`` is set, the new client records to / replays from
+    that cassette (see api_basics.cassette).
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from api_basics.cassette import cassette_from_environment
+
+                client = ApiClient(cache=ResponseCache())
+                cassette_from_environment(client)
+                _client = client
+    return _client
+
+
+def set_client(client):
+    """
+    Replace the process-wide client (e.g. with different pool sizes).
+
+    Returns the previous client so callers can restore or close it.
+    """
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    return previous
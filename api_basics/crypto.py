@@ -0,0 +1,83 @@
+"""
+Crypto Prices (CoinPaprika)
+===========================
+
+The crypto getters behind part5's dashboard and ``python -m api_basics
+crypto``. Coins are looked up by the friendly names in ``CRYPTO_IDS``.
+
+    get_crypto("bitcoin")          # Ticker, or None if the coin is unknown
+    use_ticker_snapshot(60)        # serve every coin from one bulk download
+
+Every quote seen is added to ``quote_store`` for rolling stats.
+"""
+
+from api_basics.client import get_client
+from api_basics.records import Ticker
+from api_basics.tickers import TickerSnapshot
+from api_basics.timeseries import QuoteStore
+
+CRYPTO_IDS = {
+    "bitcoin": "btc-bitcoin",
+    "ethereum": "eth-ethereum",
+    "dogecoin": "doge-dogecoin",
+    "cardano": "ada-cardano",
+    "solana": "sol-solana",
+    "ripple": "xrp-xrp",
+}
+
+TICKER_URL = "https://api.coinpaprika.com/v1/tickers/{}"
+
+# Every quote get_crypto sees, with rolling stats over the last 10 / 60 samples.
+quote_store = QuoteStore(windows=(10, 60))
+
+# Set by use_ticker_snapshot(): serve tickers from one bulk download.
+ticker_snapshot = None
+
+
+def use_ticker_snapshot(refresh_interval=60):
+    """
+    Serve get_crypto (and so display_crypto / compare_cryptos) from one
+    bulk /v1/tickers download, refreshed every ``refresh_interval`` seconds.
+    Pass ``refresh_interval=None`` to go back to one request per coin.
+    """
+    global ticker_snapshot
+    if refresh_interval is None:
+        ticker_snapshot = None
+    else:
+        ticker_snapshot = TickerSnapshot(CRYPTO_IDS.values(), refresh_interval)
+    return ticker_snapshot
+
+
+def get_crypto(coin, use_cache=True, refresh=False):
+    """
+    Ticker record for one of CRYPTO_IDS (None if unknown).
+
+    ``use_cache`` / ``refresh`` work as in get_weather().
+    """
+    coin_id = CRYPTO_IDS.get(coin.lower())
+    if not coin_id:
+        return None
+
+    if ticker_snapshot is not None:
+        data = ticker_snapshot.get(coin_id)
+    else:
+        url = TICKER_URL.format(coin_id)
+        data = Ticker.decode(get_client().get_json(url, use_cache=use_cache, refresh=refresh))
+
+    if data:
+        quote_store.record(coin.lower(), data)
+    return data
+
+
+async def get_crypto_async(coin, client=None):
+    """Async get_crypto() built on safe_api_request_async (needs aiohttp)."""
+    from api_basics.aio import ApiRequestError, safe_api_request_async
+
+    coin_id = CRYPTO_IDS.get(coin.lower())
+    if not coin_id:
+        return None
+
+    result = await safe_api_request_async(TICKER_URL.format(coin_id), client=client)
+    if not result["success"]:
+        raise ApiRequestError(result["error"])
+    return Ticker.decode(result["data"])
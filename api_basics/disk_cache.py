@@ -0,0 +1,250 @@
+"""
+Disk Response Cache
+===================
+
+The in-memory ``ResponseCache`` is empty every time a script starts.
+``SQLiteCache`` has the same interface, but it keeps entries in a single
+SQLite file, so a restarted dashboard can answer from data that is still
+fresh.
+
+Entries with an ``ETag`` or ``Last-Modified`` are revalidated after they
+expire, as in ``ResponseCache``.
+
+SQLite runs in WAL mode, so several processes can read and write the same
+file safely. Readers don't block the writer. Each thread gets its own
+connection.
+
+    from api_basics import ApiClient, set_client
+    from api_basics.disk_cache import SQLiteCache
+
+    set_client(ApiClient(cache=SQLiteCache("api_cache.sqlite")))
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+from api_basics.cache import (DEFAULT_KEEP_STALE, DEFAULT_TTL, DEFAULT_TTL_RULES, CacheEntry,
+                              pick_ttl)
+
+DEFAULT_PATH = "api_cache.sqlite"
+
+# Expired rows that can't be revalidated, or were kept as long as allowed.
+_DEAD = "expires_at <= ? AND ((etag IS NULL AND last_modified IS NULL) OR expires_at <= ?)"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key            TEXT PRIMARY KEY,
+    value          TEXT NOT NULL,
+    size           INTEGER NOT NULL,
+    expires_at     REAL NOT NULL,
+    accessed       REAL NOT NULL,
+    etag           TEXT,
+    last_modified  TEXT,
+    decode_seconds REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires_at);
+"""
+
+
+class SQLiteCache:
+    """
+    Persistent TTL + size-capped cache stored in one SQLite file.
+
+    Expiry uses wall-clock time (``time.time()``) so it stays valid across
+    processes. Every ``compact_every`` writes, expired rows are deleted and
+    the least recently used rows are dropped until the cache fits
+    ``max_entries`` / ``max_bytes``.
+
+    Args:
+        path (str): database file
+        max_entries (int): keep at most this many rows
+        max_bytes (int): keep at most this many response-body bytes (None = no limit)
+        default_ttl (float): seconds an entry lives when no rule matches
+        ttl_rules (dict): host -> TTL in seconds
+        compact_every (int): run compact() after this many set() calls
+        keep_stale (float): seconds an expired entry with validators is kept
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=10_000, max_bytes=50_000_000,
+                 default_ttl=DEFAULT_TTL, ttl_rules=None, compact_every=100,
+                 keep_stale=DEFAULT_KEEP_STALE):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_rules = dict(DEFAULT_TTL_RULES if ttl_rules is None else ttl_rules)
+        self.compact_every = compact_every
+        self.keep_stale = keep_stale
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.revalidations = 0
+        self._writes = 0
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit; each statement is its own short transaction.
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name, amount=1):
+        with self._counter_lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def ttl_for(self, key, data=None):
+        """TTL for a response: the response's own interval, else the host rule."""
+        return pick_ttl(key, data, self.ttl_rules, self.default_ttl)
+
+    def get(self, key):
+        """Return the cached value for ``key``, or None on a miss."""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+
+        now = time.time()
+        if row[1] <= now:
+            conn.execute(f"DELETE FROM responses WHERE key = ? AND {_DEAD}",
+                         (key, now, now - self.keep_stale))
+            self._count("expirations")
+            self._count("misses")
+            return None
+
+        conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self._count("hits")
+        return json.loads(row[0])
+
+    def get_stale(self, key):
+        """The entry for ``key`` if it has validators to revalidate with, else None."""
+        row = self._connect().execute(
+            "SELECT value, size, expires_at, etag, last_modified, decode_seconds "
+            "FROM responses WHERE key = ? AND (etag IS NOT NULL OR last_modified IS NOT NULL) "
+            "AND expires_at > ?",
+            (key, time.time() - self.keep_stale),
+        ).fetchone()
+        if row is None:
+            return None
+        value, size, expires_at, etag, last_modified, decode_seconds = row
+        return CacheEntry(json.loads(value), size, expires_at, etag, last_modified,
+                          decode_seconds)
+
+    def set(self, key, value, size=None, ttl=None, etag=None, last_modified=None,
+            decode_seconds=0.0):
+        """
+        Store ``value`` for ``ttl`` seconds (``size`` defaults to its JSON
+        length), with the response's validators (if any).
+        """
+        if ttl is None:
+            ttl = self.ttl_for(key, value)
+        if ttl <= 0 and not (etag or last_modified):
+            return
+        text = json.dumps(value, separators=(",", ":"))
+        if size is None:
+            size = len(text)
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO responses (key, value, size, expires_at, accessed, "
+            "etag, last_modified, decode_seconds) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, text, size, now + ttl, now, etag, last_modified, decode_seconds),
+        )
+        with self._counter_lock:
+            self._writes += 1
+            due = self._writes % self.compact_every == 0
+        if due:
+            self.compact()
+
+    def revalidated(self, key, value, ttl=None):
+        """The server answered 304 for ``key``: its ``value`` is fresh for ``ttl`` more."""
+        if ttl is None:
+            ttl = self.ttl_for(key, value)
+        now = time.time()
+        self._connect().execute(
+            "UPDATE responses SET expires_at = ?, accessed = ? WHERE key = ?",
+            (now + ttl, now, key),
+        )
+        self._count("revalidations")
+
+    def invalidate(self, key):
+        """Drop one entry. Returns True if it was cached."""
+        cursor = self._connect().execute("DELETE FROM responses WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def clear(self):
+        self._connect().execute("DELETE FROM responses")
+
+    def compact(self, vacuum=False):
+        """
+        Delete expired rows, then least-recently-used rows beyond the caps.
+
+        Args:
+            vacuum (bool): also rewrite the file to give the space back to the OS
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            expired = conn.execute(
+                f"DELETE FROM responses WHERE {_DEAD}", (now, now - self.keep_stale)
+            ).rowcount
+            evicted = conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+            if self.max_bytes is not None:
+                evicted += conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed DESC)"
+                    " AS running FROM responses) WHERE running > ?)",
+                    (self.max_bytes,),
+                ).rowcount
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._count("expirations", expired)
+        self._count("evictions", evicted)
+        if vacuum:
+            conn.execute("VACUUM")
+
+    def stats(self):
+        """
+        Counters as a dict (hits, misses, evictions, expirations,
+        revalidations, entries, bytes).
+        """
+        entries, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "revalidations": self.revalidations,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,54 @@
+"""
+Concurrent Fan-out
+==================
+
+Run the same blocking function over many inputs on a small thread pool.
+Network calls spend nearly all their time waiting, so N lookups finish in
+roughly the time of the slowest one instead of the sum of all of them.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class DeadlineExceeded(Exception):
+    """The whole fan-out ran out of time before this item finished."""
+
+
+def fan_out(func, items, max_workers=DEFAULT_MAX_WORKERS, deadline=None):
+    """
+    Call ``func(item)`` for every item with bounded parallelism.
+
+    Args:
+        func (callable): function taking one item
+        items (iterable): inputs
+        max_workers (int): maximum calls in flight at once
+        deadline (float): seconds allowed for the whole call (None = no limit)
+
+    Returns:
+        list: one ``(result, error)`` tuple per item, in input order.
+              ``error`` is the exception raised (or ``DeadlineExceeded``),
+              otherwise None.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items))))
+    try:
+        futures = [executor.submit(func, item) for item in items]
+        wait(futures, timeout=deadline)
+    finally:
+        # Don't block on stragglers once the deadline has passed.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for future in futures:
+        if future.cancelled() or not future.done():
+            results.append((None, DeadlineExceeded(f"no result within {deadline}s")))
+        elif future.exception() is not None:
+            results.append((None, future.exception()))
+        else:
+            results.append((future.result(), None))
+    return results
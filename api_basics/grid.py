@@ -0,0 +1,119 @@
+"""
+Grid-snapped Weather Keys
+=========================
+
+Open-Meteo answers from the nearest point of its model grid. We ask for
+28.6139, 77.2090 and ``weather_result.json`` says 28.625, 77.25. Every
+location inside that grid cell gets the same data back, so caching by the
+exact coordinates stores the same data many times over and fetches it
+that many times too.
+
+``GridSnapper`` learns the grid from responses. Each answer pairs the
+coordinates we asked for with the grid point we got. For each axis it
+keeps the largest step (from ``CANDIDATE_STEPS``) that
+
+- rounds every recent asked value to the grid point it was answered
+  from, and
+- is actually needed: at least one asked value lies more than a quarter
+  step from its grid point. (On a grid twice as coarse as the real one,
+  every point would sit in the inner half of its cell.)
+
+Once ``min_observations`` pairs covering at least two grid points agree,
+``cell()`` predicts the grid point for new coordinates. Callers then key
+their cache and in-flight requests by it:
+
+    cell = weather_grid.cell(lat, lon)        # None until the grid is known
+    ...fetch, keyed by cell...
+    weather_grid.observe(lat, lon, data["latitude"], data["longitude"])
+
+Only responses fetched for the asked coordinates should be observed, not
+ones served from a cell's cache entry. A fetched response that lands
+somewhere else than predicted is recorded like any other, so a wrong guess
+shrinks or drops the learned step.
+"""
+
+import math
+import threading
+from collections import deque
+
+# Grid spacings (degrees) to try, largest first.
+CANDIDATE_STEPS = (1.0, 0.5, 0.25, 0.2, 0.125, 0.1, 0.0625, 0.05, 0.04, 0.025, 0.02, 0.01)
+
+MIN_OBSERVATIONS = 8
+MAX_OBSERVATIONS = 64
+EPSILON = 1e-4   # responses round coordinates to a few decimals
+
+
+class AxisGrid:
+    """The learned grid along one axis (latitude or longitude)."""
+
+    __slots__ = ("observations", "points", "step", "offset")
+
+    def __init__(self):
+        self.observations = deque(maxlen=MAX_OBSERVATIONS)   # (asked, answered)
+        self.points = 0      # distinct grid points among the observations
+        self.step = None
+        self.offset = 0.0
+
+    def observe(self, asked, answered):
+        self.observations.append((asked, answered))
+        self.points = len({round(b, 4) for _, b in self.observations})
+        farthest = max(abs(a - b) for a, b in self.observations)
+        self.step, self.offset = None, 0.0
+        for step in CANDIDATE_STEPS:
+            offset = math.remainder(answered, step)
+            if farthest > step / 4 and all(_close(_snap(a, step, offset), b)
+                                           for a, b in self.observations):
+                self.step, self.offset = step, offset
+                break
+
+    def snap(self, value):
+        return round(_snap(value, self.step, self.offset), 6)
+
+
+def _snap(value, step, offset):
+    return offset + round((value - offset) / step) * step
+
+
+def _close(a, b):
+    return abs(a - b) <= EPSILON
+
+
+class GridSnapper:
+    """
+    Learns a model grid from (asked, answered) coordinate pairs.
+
+    Args:
+        min_observations (int): pairs needed before cells are predicted
+    """
+
+    def __init__(self, min_observations=MIN_OBSERVATIONS):
+        self.min_observations = min_observations
+        self.latitude = AxisGrid()
+        self.longitude = AxisGrid()
+        self._lock = threading.Lock()
+
+    def observe(self, lat, lon, grid_lat, grid_lon):
+        """Record that asking for (lat, lon) was answered from (grid_lat, grid_lon)."""
+        if grid_lat is None or grid_lon is None:
+            return
+        with self._lock:
+            self.latitude.observe(float(lat), float(grid_lat))
+            self.longitude.observe(float(lon), float(grid_lon))
+
+    def resolution(self):
+        """``(latitude step, longitude step)``; either is None while unknown."""
+        return self.latitude.step, self.longitude.step
+
+    def matches(self, cell, grid_lat, grid_lon):
+        """True if a response from (grid_lat, grid_lon) came from ``cell``."""
+        return _close(cell[0], float(grid_lat)) and _close(cell[1], float(grid_lon))
+
+    def cell(self, lat, lon):
+        """Predicted grid point for (lat, lon), or None until the grid is learned."""
+        with self._lock:
+            for axis in (self.latitude, self.longitude):
+                if (axis.step is None or axis.points < 2
+                        or len(axis.observations) < self.min_observations):
+                    return None
+            return self.latitude.snap(lat), self.longitude.snap(lon)
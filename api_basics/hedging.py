@@ -0,0 +1,202 @@
+"""
+Hedged Requests
+===============
+
+Most responses arrive quickly, but now and then one upstream response is
+very slow, and that one response sets the p99 of ``get_crypto`` and
+``get_weather``. Waiting for it until ``timeout`` and then retrying from
+scratch makes the slow case slower still.
+
+A hedged GET sends a second, identical request if the first hasn't
+answered after a short delay, and uses whichever answers first:
+
+    from api_basics import get_client
+    from api_basics.hedging import HedgePolicy
+
+    get_client().hedge = HedgePolicy()            # delay = the host's observed p95
+    get_client().hedge = HedgePolicy(delay=0.2)   # or a fixed delay
+
+Only GETs (and HEADs) without a body are hedged, since sending those twice
+is harmless. The delay is either fixed or the ``percentile`` of the host's
+recent response times; until ``min_samples`` responses have been seen
+nothing is hedged. Every hedge spends a token from a per-host
+``RetryBudget`` (``budget_ratio`` tokens are earned per request), so
+hedging adds at most about that fraction of extra load, even when a host
+is slow for everyone.
+
+The losing request is cancelled if it hasn't started yet. A request that
+is already waiting on the network can't be interrupted from another
+thread; its response is closed as soon as it has headers, without its
+body being read.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+from api_basics.retry import RetryBudget
+
+HEDGE_METHODS = {"GET", "HEAD"}
+HEDGE_WORKERS = 64        # threads sending hedged requests, shared by all policies
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS,
+                                               thread_name_prefix="hedge")
+    return _executor
+
+
+class LatencyWindow:
+    """The last ``size`` response times of one host."""
+
+    def __init__(self, size=200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p, min_samples=1):
+        """Nearest-rank percentile, or None with fewer than ``min_samples`` samples."""
+        with self._lock:
+            if len(self._samples) < max(1, min_samples):
+                return None
+            ordered = sorted(self._samples)
+        rank = max(1, round(p / 100 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+
+class HostHedge:
+    """Response times and hedge budget for one host."""
+
+    def __init__(self, window, budget):
+        self.latency = window
+        self.budget = budget
+
+
+class HedgePolicy:
+    """
+    When to send a second copy of a slow GET.
+
+    Args:
+        delay (float): seconds to wait before hedging; None = the host's
+                       ``percentile`` response time
+        percentile (float): percentile of recent response times used as the delay
+        min_samples (int): responses to see from a host before hedging it
+                           (with ``delay=None``)
+        budget_ratio (float): hedges allowed per request, per host
+        max_tokens (float): hedges that may be sent in a burst
+        window (int): response times remembered per host
+    """
+
+    def __init__(self, delay=None, percentile=95, min_samples=20, budget_ratio=0.1,
+                 max_tokens=5, window=200):
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.budget_ratio = budget_ratio
+        self.max_tokens = max_tokens
+        self.window = window
+        self.requests = 0
+        self.hedged = 0          # second requests sent
+        self.hedge_wins = 0      # ... that answered first
+        self.refused = 0         # slow requests not hedged because the budget was spent
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def host(self, url):
+        host = (urlsplit(url).hostname or "").lower()
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = HostHedge(
+                    LatencyWindow(self.window), RetryBudget(self.budget_ratio, self.max_tokens))
+            return state
+
+    def delay_for(self, host):
+        """Seconds to wait before hedging a request to ``host`` (None = don't hedge)."""
+        if self.delay is not None:
+            return self.delay
+        return host.latency.percentile(self.percentile, self.min_samples)
+
+    def run(self, send, url):
+        """
+        Call ``send()`` (which makes one request and returns its response),
+        calling it a second time if the first is slower than the delay.
+
+        Returns:
+            the first response to arrive; if one attempt raises, the other's
+            response (or the error, if both fail)
+        """
+        host = self.host(url)
+        host.budget.deposit()
+        with self._lock:
+            self.requests += 1
+
+        def attempt():
+            start = time.perf_counter()
+            response = send()
+            host.latency.observe(time.perf_counter() - start)
+            return response
+
+        delay = self.delay_for(host)
+        if delay is None:
+            return attempt()
+
+        executor = _get_executor()
+        first = executor.submit(attempt)
+        done, _ = wait((first,), timeout=delay)
+        if done:
+            return first.result()
+        if not host.budget.try_spend():
+            with self._lock:
+                self.refused += 1
+            return first.result()
+
+        second = executor.submit(attempt)
+        with self._lock:
+            self.hedged += 1
+        pending = {first, second}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((f for f in done if f.exception() is None), None)
+            if winner is not None:
+                break
+        else:
+            # Both failed: report the first request's error.
+            return first.result()
+        if winner is second:
+            with self._lock:
+                self.hedge_wins += 1
+        for loser in (first, second):
+            if loser is not winner:
+                _discard(loser)
+        return winner.result()
+
+    def stats(self):
+        """Counters as a dict (requests, hedged, hedge_wins, refused)."""
+        with self._lock:
+            return {"requests": self.requests, "hedged": self.hedged,
+                    "hedge_wins": self.hedge_wins, "refused": self.refused}
+
+
+def _discard(future):
+    """Cancel a losing attempt, or close its response once it arrives."""
+    if future.cancel():
+        return
+
+    def close(finished):
+        if finished.exception() is None:
+            finished.result().close()
+
+    future.add_done_callback(close)
@@ -0,0 +1,291 @@
+"""
+Request Metrics
+===============
+
+A log line saying "Requesting URL ... (Attempt 2)" doesn't tell you where
+the time went. When metrics are switched on, every request made through
+``ApiClient`` is split into phases and recorded per host and endpoint:
+
+- ``connect``: DNS + TCP + TLS for a new connection (0 when one is reused)
+- ``ttfb``: from sending the request to the response headers arriving
+- ``body``: reading the response body
+- ``decode``: ``json.loads`` of the body (timed by ``decode_json``)
+- ``total``: everything except decode and queue
+- ``queue``: waiting for a slot from the host's rate limiter
+  (api_basics.ratelimit), before the request is sent
+
+Response sizes, outcomes ("2xx", "4xx", "ReadTimeout", ...) and retries
+are counted too, and so are ``304 Not Modified`` answers to cache
+revalidations, with the body bytes and decode time each one saved.
+Histograms use fixed buckets, so recording a value is one ``bisect`` and
+one increment.
+
+    from api_basics.metrics import metrics
+    metrics.enable()
+    ...
+    print(metrics.to_prometheus())     # or metrics.to_json()
+
+When metrics are off (the default) the request path only checks
+``metrics.enabled`` and goes straight on.
+
+Endpoints are the URL path with ids folded together, so
+``/posts/5`` and ``/posts/6`` both count as ``/posts/:id``. A path
+segment counts as an id if it is all digits or contains a "-"
+(``/v1/tickers/btc-bitcoin`` -> ``/v1/tickers/:id``).
+"""
+
+import bisect
+import json
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+# Upper bounds of the histogram buckets (a final +Inf bucket is implied).
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+PHASES = ("queue", "connect", "ttfb", "body", "decode", "total")
+
+
+class Histogram:
+    """Counts of observed values per fixed bucket, plus their sum."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """``[(upper bound, observations <= bound), ...]`` ending with +Inf."""
+        total, result = 0, []
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+@lru_cache(maxsize=1024)
+def labels_for(url):
+    """``(host, endpoint)`` for a URL, query string ignored."""
+    parts = urlsplit(url)
+    segments = [":id" if s.isdigit() or "-" in s else s for s in parts.path.split("/")]
+    endpoint = "/".join(segments) or "/"
+    return parts.hostname or "", endpoint
+
+
+def outcome_of(status=None, error=None):
+    """"2xx" / "4xx" / ... for a status code, or the exception's class name."""
+    if error is not None:
+        return type(error).__name__
+    return f"{status // 100}xx"
+
+
+class Metrics:
+    """
+    Per host/endpoint request histograms and counters.
+
+    Args:
+        enabled (bool): start recording straight away
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._phases = {}     # (host, endpoint, phase) -> Histogram
+            self._sizes = {}      # (host, endpoint) -> Histogram
+            self._outcomes = {}   # (host, endpoint, outcome) -> count
+            self._retries = {}    # (host, endpoint) -> count
+            self._not_modified = {}   # (host, endpoint) -> [304s, bytes saved, decode seconds saved]
+
+    def observe_phase(self, url, phase, seconds):
+        key = labels_for(url) + (phase,)
+        with self._lock:
+            histogram = self._phases.get(key)
+            if histogram is None:
+                histogram = self._phases[key] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def observe_size(self, url, size):
+        key = labels_for(url)
+        with self._lock:
+            histogram = self._sizes.get(key)
+            if histogram is None:
+                histogram = self._sizes[key] = Histogram(SIZE_BUCKETS)
+            histogram.observe(size)
+
+    def count_outcome(self, url, outcome):
+        key = labels_for(url) + (outcome,)
+        with self._lock:
+            self._outcomes[key] = self._outcomes.get(key, 0) + 1
+
+    def count_retry(self, url):
+        key = labels_for(url)
+        with self._lock:
+            self._retries[key] = self._retries.get(key, 0) + 1
+
+    def record_not_modified(self, url, size, decode_seconds):
+        """A 304 let a cached body of ``size`` bytes be reused without decoding it."""
+        key = labels_for(url)
+        with self._lock:
+            saved = self._not_modified.get(key)
+            if saved is None:
+                saved = self._not_modified[key] = [0, 0, 0.0]
+            saved[0] += 1
+            saved[1] += size
+            saved[2] += decode_seconds
+
+    def record_response(self, url, status, size, connect, ttfb, body, total):
+        """Record one finished request/response exchange (connect=None: unknown)."""
+        if connect is not None:
+            self.observe_phase(url, "connect", connect)
+        self.observe_phase(url, "ttfb", ttfb)
+        self.observe_phase(url, "body", body)
+        self.observe_phase(url, "total", total)
+        if size is not None:
+            self.observe_size(url, size)
+        self.count_outcome(url, outcome_of(status))
+
+    def record_error(self, url, error, connect, total):
+        """Record a request that raised before a full response was read."""
+        if connect is not None:
+            self.observe_phase(url, "connect", connect)
+        self.observe_phase(url, "total", total)
+        self.count_outcome(url, outcome_of(error=error))
+
+    def snapshot(self):
+        """Everything recorded so far, as plain lists and dicts."""
+        with self._lock:
+            phases = [
+                {"host": host, "endpoint": endpoint, "phase": phase,
+                 "count": h.count, "sum": h.sum,
+                 "buckets": [[_bound(b), n] for b, n in h.cumulative()]}
+                for (host, endpoint, phase), h in sorted(self._phases.items())
+            ]
+            sizes = [
+                {"host": host, "endpoint": endpoint, "count": h.count, "sum": h.sum,
+                 "buckets": [[_bound(b), n] for b, n in h.cumulative()]}
+                for (host, endpoint), h in sorted(self._sizes.items())
+            ]
+            outcomes = [
+                {"host": host, "endpoint": endpoint, "outcome": outcome, "count": n}
+                for (host, endpoint, outcome), n in sorted(self._outcomes.items())
+            ]
+            retries = [
+                {"host": host, "endpoint": endpoint, "count": n}
+                for (host, endpoint), n in sorted(self._retries.items())
+            ]
+            not_modified = [
+                {"host": host, "endpoint": endpoint, "count": n,
+                 "bytes_saved": size, "decode_seconds_saved": seconds}
+                for (host, endpoint), (n, size, seconds) in sorted(self._not_modified.items())
+            ]
+        return {"phase_seconds": phases, "response_bytes": sizes,
+                "requests": outcomes, "retries": retries, "not_modified": not_modified}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self):
+        """The metrics in the Prometheus text exposition format."""
+        snap = self.snapshot()
+        lines = []
+
+        def histogram(name, help_text, rows, label_names):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for row in rows:
+                labels = _labels(row, label_names)
+                for bound, n in row["buckets"]:
+                    le = "+Inf" if bound == "+Inf" else repr(bound)
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {n}')
+                lines.append(f"{name}_sum{{{labels}}} {row['sum']!r}")
+                lines.append(f"{name}_count{{{labels}}} {row['count']}")
+
+        def counter(name, help_text, rows, label_names, field="count"):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for row in rows:
+                lines.append(f"{name}{{{_labels(row, label_names)}}} {row[field]!r}")
+
+        histogram("api_request_phase_seconds", "Time spent in each phase of a request.",
+                  snap["phase_seconds"], ("host", "endpoint", "phase"))
+        histogram("api_response_bytes", "Size of response bodies.",
+                  snap["response_bytes"], ("host", "endpoint"))
+        counter("api_requests_total", "Requests by outcome.",
+                snap["requests"], ("host", "endpoint", "outcome"))
+        counter("api_retries_total", "Retries after a failed attempt.",
+                snap["retries"], ("host", "endpoint"))
+        counter("api_not_modified_total", "Cache revalidations answered 304 Not Modified.",
+                snap["not_modified"], ("host", "endpoint"))
+        counter("api_not_modified_bytes_saved_total", "Body bytes a 304 saved downloading.",
+                snap["not_modified"], ("host", "endpoint"), "bytes_saved")
+        counter("api_not_modified_decode_seconds_saved_total", "JSON decode time a 304 saved.",
+                snap["not_modified"], ("host", "endpoint"), "decode_seconds_saved")
+        return "\n".join(lines) + "\n"
+
+
+def _bound(bound):
+    return "+Inf" if bound == float("inf") else bound
+
+
+def _labels(row, names):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{name}="{escape(row[name])}"' for name in names)
+
+
+# The process-wide registry used by ApiClient and everything built on it.
+metrics = Metrics()
+
+
+def decode_json(response, url=None):
+    """``response.json()``, timed as the "decode" phase when metrics are on."""
+    if not metrics.enabled:
+        return response.json()
+    start = time.perf_counter()
+    data = response.json()
+    metrics.observe_phase(url or response.url, "decode", time.perf_counter() - start)
+    return data
+
+
+# --- Connection timing -------------------------------------------------------
+#
+# urllib3 opens connections inside the thread that sends the request, so the
+# connect time can be handed back through a thread-local. The connections
+# that report it are in api_basics.adapters.
+
+_phase = threading.local()
+
+
+def reset_connect_time():
+    _phase.connect = 0.0
+
+
+def add_connect_time(seconds):
+    _phase.connect = connect_time() + seconds
+
+
+def connect_time():
+    """Seconds spent opening connections in this thread since the last reset."""
+    return getattr(_phase, "connect", 0.0)
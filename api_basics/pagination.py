@@ -0,0 +1,160 @@
+"""
+Lazy Pagination for JSONPlaceholder
+===================================
+
+``requests.get(".../todos").json()[:10]`` downloads all 200 todos to
+show ten. The generators here ask the server for one page at a time with
+``_start`` / ``_limit``, so nothing is downloaded until it is iterated.
+
+While you read one page, the next page is fetched in the background
+(``prefetch=True``). Prefetching stays at most one page ahead and never
+goes past ``limit``. Pass ``prefetch=False`` if you want only the pages
+you actually reach to be downloaded.
+
+    for todo in iter_todos(completed=True, limit=10):
+        print(todo["title"])
+
+    count_items("comments", postId=1)   # reads X-Total-Count, not the body
+
+The iterator paginate() returns keeps that header too, as ``.total``,
+once the first page has arrived.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from api_basics.client import get_client
+
+JSONPLACEHOLDER_URL = "https://jsonplaceholder.typicode.com"
+
+DEFAULT_PAGE_SIZE = 20
+
+
+def _fetch_page(client, url, params, start, size):
+    page_params = dict(params or {}, _start=start, _limit=size)
+    response = client.get(url, params=page_params)
+    response.raise_for_status()
+    total = response.headers.get("X-Total-Count")
+    return response.json(), int(total) if total is not None else None
+
+
+class Pages:
+    """
+    The items of a paginated collection, as returned by paginate().
+
+    ``total`` is the collection's size from the first page's X-Total-Count
+    header (None before the first page is in, or if the server doesn't send
+    it), so counting the whole collection needs no extra request.
+    """
+
+    def __init__(self):
+        self.total = None
+        self._items = iter(())
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._items)
+
+    def close(self):
+        """Stop early and cancel any page being prefetched."""
+        self._items.close()
+
+
+def paginate(url, params=None, page_size=DEFAULT_PAGE_SIZE, limit=None, prefetch=True,
+             client=None):
+    """
+    Yield items from a json-server style collection, one page at a time.
+
+    Args:
+        url (str): collection URL, e.g. ".../todos"
+        params (dict): filters such as {"userId": 1}
+        page_size (int): items per request
+        limit (int): stop after this many items (None = all)
+        prefetch (bool): fetch the next page in the background
+        client (ApiClient): client to use (defaults to the shared one)
+
+    Returns:
+        Pages: an iterator over the items, with the server's ``total``
+    """
+    pages = Pages()
+    pages._items = _paginate(pages, url, params, page_size, limit, prefetch,
+                             client or get_client())
+    return pages
+
+
+def _paginate(pages, url, params, page_size, limit, prefetch, client):
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+    def page_size_at(start):
+        return page_size if limit is None else min(page_size, limit - start)
+
+    try:
+        start, total, pending = 0, None, None
+        while limit is None or start < limit:
+            size = page_size_at(start)
+            if pending is not None:
+                page, page_total = pending.result()
+                pending = None
+            else:
+                page, page_total = _fetch_page(client, url, params, start, size)
+            if page_total is not None:
+                total = pages.total = page_total
+
+            start += len(page)
+            more = (len(page) == size
+                    and (total is None or start < total)
+                    and (limit is None or start < limit))
+            if more and executor is not None:
+                pending = executor.submit(_fetch_page, client, url, params,
+                                          start, page_size_at(start))
+            yield from page
+            if not more:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def count_items(resource, client=None, **filters):
+    """
+    Number of items in a JSONPlaceholder collection, from ``X-Total-Count``.
+
+    Asks for an empty slice, so the body is just ``[]``. Servers that don't
+    send the header are counted by paging through them instead.
+
+        count_items("comments", postId=1)
+        count_items("posts/1/comments")
+    """
+    client = client or get_client()
+    url = f"{JSONPLACEHOLDER_URL}/{resource}"
+    response = client.get(url, params=dict(filters, _start=0, _end=0))
+    response.raise_for_status()
+    total = response.headers.get("X-Total-Count")
+    if total is not None:
+        return int(total)
+    return sum(1 for _ in paginate(url, filters, page_size=100, prefetch=False, client=client))
+
+
+def iter_posts(user_id=None, **kwargs):
+    """Posts, optionally filtered by author. Extra kwargs go to paginate()."""
+    params = {"userId": user_id} if user_id is not None else None
+    return paginate(f"{JSONPLACEHOLDER_URL}/posts", params, **kwargs)
+
+
+def iter_comments(post_id=None, **kwargs):
+    params = {"postId": post_id} if post_id is not None else None
+    return paginate(f"{JSONPLACEHOLDER_URL}/comments", params, **kwargs)
+
+
+def iter_todos(completed=None, user_id=None, **kwargs):
+    params = {}
+    if completed is not None:
+        params["completed"] = "true" if completed else "false"
+    if user_id is not None:
+        params["userId"] = user_id
+    return paginate(f"{JSONPLACEHOLDER_URL}/todos", params, **kwargs)
+
+
+def iter_users(**kwargs):
+    return paginate(f"{JSONPLACEHOLDER_URL}/users", **kwargs)
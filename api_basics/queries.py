@@ -0,0 +1,91 @@
+"""
+Query Handlers
+==============
+
+One function per kind of lookup, shared by ``python -m api_basics`` and
+batch mode (api_basics.batch). Each returns a JSON-ready dict (or list of
+dicts) and raises ``QueryError`` for a query that can't be answered, such
+as an unknown city. Network failures are raised as they are.
+
+Nothing here prints, so results can go straight to stdout as JSON.
+"""
+
+JSONPLACEHOLDER_URL = "https://jsonplaceholder.typicode.com"
+
+
+class QueryError(ValueError):
+    """The query itself is bad (unknown city or coin, missing field, ...)."""
+
+
+def city_dict(city):
+    return {"name": city.name, "country": city.country, "latitude": city.latitude,
+            "longitude": city.longitude, "population": city.population}
+
+
+def weather(city):
+    """Current weather for a city name, with the city it was matched to."""
+    from api_basics.cities import find_city, get_city
+    from api_basics.weather import get_weather_at
+
+    place = get_city(city) or find_city(city)
+    if place is None:
+        raise QueryError(f"city not found: {city}")
+    current = get_weather_at(place.latitude, place.longitude)
+    return {"city": place.name, "country": place.country, **current.to_dict()}
+
+
+def crypto(coin):
+    from api_basics.crypto import CRYPTO_IDS, get_crypto
+
+    ticker = get_crypto(coin)
+    if ticker is None:
+        raise QueryError(f"unknown coin {coin!r}, try one of: {', '.join(CRYPTO_IDS)}")
+    return ticker.to_dict()
+
+
+def user(user_id):
+    from api_basics.records import User
+    from api_basics.safe_request import safe_api_request
+
+    result = safe_api_request(f"{JSONPLACEHOLDER_URL}/users/{int(user_id)}")
+    if not result["success"]:
+        raise QueryError(result["error"])
+    return User.decode(result["data"]).to_dict()
+
+
+def posts(search=None, user_id=None, limit=10):
+    """Up to ``limit`` posts whose title or body contains ``search``."""
+    from api_basics.pagination import iter_posts
+    from api_basics.records import Post
+
+    text = (search or "").lower()
+    found = []
+    if limit <= 0:
+        return found
+    for item in iter_posts(user_id=user_id, prefetch=False):
+        if text in item.get("title", "").lower() or text in item.get("body", "").lower():
+            found.append(Post.decode(item).to_dict())
+            if len(found) == limit:
+                break
+    return found
+
+
+def cities(name=None, near=None, k=5, prefix=False):
+    """
+    Registry lookups: the best match for ``name``, the ``k`` cities
+    starting with ``name`` (``prefix=True``), or the ``k`` nearest to
+    ``near`` = (lat, lon).
+    """
+    from api_basics.cities import find_city, nearest_cities, search_cities
+
+    if near is not None:
+        return [{**city_dict(city), "distance_km": round(km, 2)}
+                for city, km in nearest_cities(near[0], near[1], k)]
+    if not name:
+        raise QueryError("give a city name or near=(lat, lon)")
+    if prefix:
+        return [city_dict(city) for city in search_cities(name, k)]
+    city = find_city(name)
+    if city is None:
+        raise QueryError(f"city not found: {name}")
+    return city_dict(city)
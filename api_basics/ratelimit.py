@@ -0,0 +1,220 @@
+"""
+Per-host Rate Limits
+====================
+
+Free API tiers allow only so many requests per second, minute or hour.
+Several loops running at once (the dashboard's background refresh, a
+batch job, a compare table) can go over that together, and the API then
+answers 429 for a while.
+
+Each limited host gets a ``RateLimiter`` made of token buckets, one per
+limit. A bucket holds up to ``burst`` tokens and refills at ``rate``
+tokens a second. Every request takes one token from each bucket. When a
+bucket is empty the request waits its turn instead of failing, for up to
+``max_wait`` seconds. After that it raises ``RateLimited``.
+
+A bucket with ``burst`` B and ``rate`` r lets through at most B + r*T
+requests in any T seconds, so "600 a minute" can be kept with, say,
+``(9, 60)``: 60 + 9*60 = 600.
+
+``ApiClient`` and ``AsyncApiClient`` call ``wait_for_slot`` (or its async
+twin) before every request, so threads and asyncio tasks share the same
+buckets. When metrics are on, the time spent waiting is recorded as the
+"queue" phase. A 429 response still drains the host's buckets for the
+Retry-After time, so the requests queued behind it slow down as well.
+
+    configure_rate_limit("api.coinpaprika.com", [(9, 9)], max_wait=30)
+    configure_rate_limit("api.coinpaprika.com", None)     # no limit
+"""
+
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from api_basics.metrics import metrics
+
+DEFAULT_MAX_WAIT = 10.0      # seconds a request may queue before RateLimited
+DEFAULT_PAUSE = 1.0          # seconds to back off after a 429 without Retry-After
+
+# (rate per second, burst) pairs we stay under by default. Open-Meteo's
+# free tier allows 600 calls a minute and 5000 an hour; CoinPaprika is kept
+# under 10 a second. Pass your own with configure_rate_limit().
+DEFAULT_LIMITS = {
+    "api.open-meteo.com": [(9, 60), (1.3, 300)],
+    "api.coinpaprika.com": [(9, 9)],
+}
+
+
+class RateLimited(Exception):
+    """A request would have had to queue longer than ``max_wait``."""
+
+    def __init__(self, host, wait):
+        super().__init__(f"Rate limit for {host}: next slot in {wait:.1f}s")
+        self.host = host
+        self.wait = wait
+
+
+class TokenBucket:
+    """``burst`` tokens, refilled at ``rate`` per second. Tokens may go negative
+    while requests are queued; each queued request owes one token."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self):
+        """Seconds until a token is free (after refill)."""
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    The token buckets for one host.
+
+    Args:
+        limits (list): ``(rate per second, burst)`` pairs; every one applies
+        max_wait (float): longest a request may queue for a slot
+        host (str): name used in errors
+    """
+
+    def __init__(self, limits, max_wait=DEFAULT_MAX_WAIT, host=""):
+        self.buckets = [TokenBucket(rate, burst) for rate, burst in limits]
+        self.max_wait = max_wait
+        self.host = host
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait=None):
+        """
+        Claim the next free slot and return how long to wait for it.
+
+        Raises:
+            RateLimited: if the wait would be longer than ``max_wait``
+                         (no slot is claimed then)
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            for bucket in self.buckets:
+                bucket.refill(now)
+                wait = max(wait, bucket.wait_time())
+            if wait > max_wait:
+                raise RateLimited(self.host, wait)
+            for bucket in self.buckets:
+                bucket.tokens -= 1
+        return wait
+
+    def acquire(self, max_wait=None):
+        """Block until a slot is free. Returns the seconds waited."""
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, max_wait=None):
+        """``acquire`` for asyncio: other tasks keep running while this one waits."""
+        import asyncio
+
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        """Hand out no slots for ``seconds`` (e.g. after a 429 with Retry-After)."""
+        with self._lock:
+            now = time.monotonic()
+            for bucket in self.buckets:
+                bucket.refill(now)
+                bucket.tokens = min(bucket.tokens, 1 - bucket.rate * seconds)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+_configured = {}       # host -> (limits, max_wait); None limits = unlimited
+
+
+@lru_cache(maxsize=1024)
+def _host_of(url):
+    return (urlsplit(url).hostname or "").lower()
+
+
+def limiter_for(url):
+    """The ``RateLimiter`` for the host in ``url``, or None if it has no limit."""
+    host = _host_of(url)
+    limiter = _limiters.get(host)
+    if limiter is not None or host in _limiters:
+        return limiter
+    with _limiters_lock:
+        if host not in _limiters:
+            limits, max_wait = _configured.get(host, (DEFAULT_LIMITS.get(host), DEFAULT_MAX_WAIT))
+            _limiters[host] = RateLimiter(limits, max_wait, host) if limits else None
+        return _limiters[host]
+
+
+def configure_rate_limit(host, limits, max_wait=DEFAULT_MAX_WAIT):
+    """
+    Set the limits for one host (replacing the defaults).
+
+    Args:
+        host (str): e.g. "api.coinpaprika.com"
+        limits (list): ``(rate per second, burst)`` pairs, or None for no limit
+        max_wait (float): longest a request may queue for a slot
+    """
+    host = host.lower()
+    with _limiters_lock:
+        _configured[host] = (limits, max_wait)
+        _limiters.pop(host, None)
+
+
+def reset_rate_limits():
+    """Back to DEFAULT_LIMITS, with every bucket full."""
+    with _limiters_lock:
+        _configured.clear()
+        _limiters.clear()
+
+
+def wait_for_slot(url):
+    """Queue for a slot on ``url``'s host, if it is limited. Raises RateLimited."""
+    limiter = limiter_for(url)
+    if limiter is None:
+        return
+    try:
+        waited = limiter.acquire()
+    except RateLimited:
+        if metrics.enabled:
+            metrics.count_outcome(url, "RateLimited")
+        raise
+    if metrics.enabled:
+        metrics.observe_phase(url, "queue", waited)
+
+
+async def wait_for_slot_async(url):
+    """Async ``wait_for_slot``."""
+    limiter = limiter_for(url)
+    if limiter is None:
+        return
+    try:
+        waited = await limiter.acquire_async()
+    except RateLimited:
+        if metrics.enabled:
+            metrics.count_outcome(url, "RateLimited")
+        raise
+    if metrics.enabled:
+        metrics.observe_phase(url, "queue", waited)
+
+
+def note_too_many_requests(url, retry_after=None):
+    """A 429 came back anyway: hold the host's queue for Retry-After seconds."""
+    limiter = limiter_for(url)
+    if limiter is not None:
+        limiter.pause(DEFAULT_PAUSE if retry_after is None else retry_after)
@@ -0,0 +1,161 @@
+"""
+Typed Records
+=============
+
+The scripts use a handful of fields from each response. A CoinPaprika
+ticker, for example, is about 30 keys and a nested ``quotes`` dict, but the
+dashboard only shows the name, symbol, price and 24h change.
+
+The record classes here declare the fields they need, together with where
+each one lives in the JSON. ``decode()`` copies just those values into an
+object with ``__slots__``, and the original dict can then be thrown away:
+
+    ticker = Ticker.decode(data)          # RecordError if a field is missing
+    ticker.price, ticker.percent_change_24h
+    Ticker.missing_fields(data)           # [] or e.g. ["quotes.USD.price"]
+    ticker.to_dict()                      # flat dict, for logging
+
+A slotted record has no per-instance ``__dict__``. A decoded ticker keeps
+about a quarter of the memory of the dicts it came from, and its log line
+is less than a third as long (see ``benchmarks/bench_records.py``).
+"""
+
+
+class RecordError(ValueError):
+    """Raised by Record.decode when required fields are missing."""
+
+    def __init__(self, record_type, missing):
+        super().__init__(f"{record_type} response is missing: {', '.join(missing)}")
+        self.missing = missing
+
+
+_MISSING = object()
+
+
+def _lookup(data, path):
+    for key in path:
+        if not isinstance(data, dict):
+            return _MISSING
+        data = data.get(key, _MISSING)
+        if data is _MISSING:
+            return _MISSING
+    return data
+
+
+class Record:
+    """
+    Base class for the records below.
+
+    Subclasses list ``FIELDS`` as ``(attribute, path, required)`` tuples,
+    where ``path`` is the sequence of keys leading to the value.
+    """
+
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init__(self, **values):
+        for name, _, _ in self.FIELDS:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def decode(cls, data):
+        """
+        Build a record from a decoded JSON object.
+
+        Raises:
+            RecordError: if any required field is missing
+        """
+        record = cls.__new__(cls)
+        missing = None
+        for name, path, required in cls.FIELDS:
+            value = _lookup(data, path)
+            if value is _MISSING:
+                if required:
+                    missing = (missing or []) + [".".join(path)]
+                value = None
+            setattr(record, name, value)
+        if missing:
+            raise RecordError(cls.__name__, missing)
+        return record
+
+    @classmethod
+    def decode_many(cls, items):
+        """Decode a list of JSON objects, skipping any that don't fit."""
+        records = []
+        for item in items:
+            try:
+                records.append(cls.decode(item))
+            except RecordError:
+                pass
+        return records
+
+    @classmethod
+    def missing_fields(cls, data):
+        """Dotted paths of the required fields ``data`` lacks ([] if none)."""
+        return [".".join(path) for _, path, required in cls.FIELDS
+                if required and _lookup(data, path) is _MISSING]
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name, _, _ in self.FIELDS}
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        values = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"{type(self).__name__}({values})"
+
+
+class Ticker(Record):
+    """A CoinPaprika ticker (``/v1/tickers`` and ``/v1/tickers/{id}``)."""
+
+    FIELDS = (
+        ("id", ("id",), True),
+        ("name", ("name",), True),
+        ("symbol", ("symbol",), True),
+        ("price", ("quotes", "USD", "price"), True),
+        ("market_cap", ("quotes", "USD", "market_cap"), True),
+        ("percent_change_24h", ("quotes", "USD", "percent_change_24h"), True),
+        ("volume_24h", ("quotes", "USD", "volume_24h"), False),
+        ("last_updated", ("last_updated",), False),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class CurrentWeather(Record):
+    """``current_weather`` from an Open-Meteo forecast response."""
+
+    FIELDS = (
+        ("temperature", ("current_weather", "temperature"), True),
+        ("windspeed", ("current_weather", "windspeed"), True),
+        ("time", ("current_weather", "time"), True),
+        ("latitude", ("latitude",), False),
+        ("longitude", ("longitude",), False),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class User(Record):
+    """A JSONPlaceholder user."""
+
+    FIELDS = (
+        ("id", ("id",), True),
+        ("name", ("name",), True),
+        ("email", ("email",), True),
+        ("phone", ("phone",), True),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class Post(Record):
+    """A JSONPlaceholder post."""
+
+    FIELDS = (
+        ("id", ("id",), True),
+        ("user_id", ("userId",), True),
+        ("title", ("title",), True),
+        ("body", ("body",), False),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
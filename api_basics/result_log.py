@@ -0,0 +1,154 @@
+"""
+Append-only Result Log
+======================
+
+``save_to_file`` rewrites a whole JSON file on every call. That throws
+away history, and a crash halfway through can leave a broken file.
+
+``ResultLog`` instead appends one compact JSON line per result
+(JSON Lines). A crash can at worst cut off the final line, and
+``read_results`` skips a line like that. Writes are buffered and flushed
+(optionally with fsync) once enough bytes have built up, or at most
+``flush_interval`` seconds after the first unwritten line. When the
+file passes ``max_bytes`` it is rotated to ``results.jsonl.1`` with
+``os.replace``, which is atomic.
+
+Use one ``ResultLog`` per file per process. Threads can share it.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+DEFAULT_PATH = "results.jsonl"
+
+
+class ResultLog:
+    """
+    Buffered JSONL writer with size/time flushing and rotation.
+
+    Args:
+        path (str): log file
+        flush_bytes (int): flush once this many bytes are buffered
+        flush_interval (float): flush at most this many seconds after a line is queued
+        fsync (bool): fsync after each flush (survives power loss, costs a disk sync)
+        max_bytes (int): rotate once the file would grow past this size (None = never)
+        backups (int): rotated files to keep (results.jsonl.1 ... .N)
+    """
+
+    def __init__(self, path=DEFAULT_PATH, flush_bytes=64 * 1024, flush_interval=1.0,
+                 fsync=True, max_bytes=10 * 1024 * 1024, backups=3):
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._buffer = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._file = None
+        self._timer = None      # flushes a quiet log after flush_interval
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def append(self, source, data, key=None):
+        """
+        Queue one result line: ``{"ts": ..., "source": ..., "key": ..., "data": ...}``.
+
+        Args:
+            source (str): where the data came from, e.g. "weather"
+            data: the decoded response
+            key (str): what was looked up, e.g. "delhi" (optional)
+        """
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "source": source,
+        }
+        if key is not None:
+            record["key"] = key
+        record["data"] = data
+        line = (json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n").encode()
+        with self._lock:
+            self._buffer.append(line)
+            self._buffered += len(line)
+            if (self._buffered >= self.flush_bytes
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush()
+            elif self._timer is None:
+                # Nothing may be appended after this, so don't wait for it.
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write out everything buffered so far."""
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        return self._file
+
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        data = b"".join(self._buffer)
+        self._buffer.clear()
+        self._buffered = 0
+
+        f = self._open()
+        if self.max_bytes is not None and f.tell() and f.tell() + len(data) > self.max_bytes:
+            self._rotate()
+            f = self._open()
+        f.write(data)
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+def read_results(path=DEFAULT_PATH, source=None):
+    """
+    Yield records from a result log, oldest first.
+
+    Args:
+        path (str): log file
+        source (str): only yield records from this source (e.g. "weather")
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue   # a line cut off by a crash
+            if source is None or record.get("source") == source:
+                yield record
@@ -0,0 +1,203 @@
+"""
+Retry Policy: Backoff, Retry Budgets and Circuit Breakers
+=========================================================
+
+Waiting the same fixed delay between retries either wastes time (if the
+server is fine) or keeps hitting a server that is struggling. This module
+has the pieces ``safe_api_request`` uses to retry more carefully:
+
+- ``backoff_delay``: exponential backoff with "full jitter"
+- ``parse_retry_after``: honour a server's ``Retry-After`` header
+- ``RetryBudget``: limits how many retries all callers may send to one host
+- ``CircuitBreaker``: fails fast while a host is known to be down
+
+Budgets and breakers are shared per host (see ``host_state``).
+"""
+
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0):
+    """
+    Seconds to wait before retry number ``attempt`` (1 = first retry).
+
+    Full jitter: a random value between 0 and ``base * 2**(attempt-1)``,
+    capped at ``cap``. Random delays keep clients from retrying in lockstep.
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def parse_retry_after(value):
+    """
+    Parse a ``Retry-After`` header (delay in seconds or an HTTP date).
+
+    Returns:
+        float or None: seconds to wait, or None if missing/invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    from email.utils import parsedate_to_datetime   # slow to import, rarely needed
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def is_dns_failure(error):
+    """True if a requests ``ConnectionError`` was caused by a failed DNS lookup."""
+    try:
+        from urllib3.exceptions import NameResolutionError
+    except ImportError:   # urllib3 < 2
+        NameResolutionError = None
+
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    if NameResolutionError is not None and isinstance(reason, NameResolutionError):
+        return True
+    text = str(reason or error)
+    return "Name or service not known" in text or "nodename nor servname" in text
+
+
+class RetryBudget:
+    """
+    Token bucket that caps retries as a fraction of normal traffic.
+
+    Every request deposits ``ratio`` tokens (up to ``max_tokens``) and every
+    retry spends one. When the bucket is empty, retries are refused, so a
+    failing host gets at most roughly ``ratio`` extra load.
+
+    Args:
+        ratio (float): tokens earned per request
+        max_tokens (float): bucket size, which is also the initial balance
+    """
+
+    def __init__(self, ratio=0.2, max_tokens=10):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = float(max_tokens)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self):
+        """Take one token for a retry. Returns False if the budget is spent."""
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class CircuitBreaker:
+    """
+    Stop calling a host after repeated failures.
+
+    closed    -> requests flow; ``failure_threshold`` failures in a row open it
+    open      -> requests fail fast for ``reset_timeout`` seconds
+    half-open -> one trial request; success closes it, failure re-opens it
+
+    Args:
+        failure_threshold (int): consecutive failures before opening
+        reset_timeout (float): seconds to stay open before a trial request
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """True if a request may be sent now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            # Half-open: let exactly one trial request through.
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def retry_in(self):
+        """Seconds until an open breaker allows a trial request."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def cancel_trial(self):
+        """
+        Give back a half-open trial that ended without a success or failure
+        of the host (e.g. our own rate limit stopped it), so another request
+        can be the trial.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+class HostState:
+    """The retry budget and circuit breaker shared by all calls to one host."""
+
+    def __init__(self, budget=None, breaker=None):
+        self.budget = budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+
+
+_hosts = {}
+_hosts_lock = threading.Lock()
+
+
+def host_state(url):
+    """Return the shared ``HostState`` for the host in ``url``."""
+    host = (urlsplit(url).hostname or "").lower()
+    with _hosts_lock:
+        state = _hosts.get(host)
+        if state is None:
+            state = _hosts[host] = HostState()
+        return state
+
+
+def configure_host(host, budget=None, breaker=None):
+    """Use a custom ``RetryBudget`` / ``CircuitBreaker`` for one host."""
+    with _hosts_lock:
+        _hosts[host.lower()] = HostState(budget, breaker)
+
+
+def reset_hosts():
+    """Forget every host's budget and breaker."""
+    with _hosts_lock:
+        _hosts.clear()
@@ -0,0 +1,167 @@
+"""
+Safe API Requests
+=================
+
+``safe_api_request`` never raises: it returns ``{"success": True, "data":
+...}`` or ``{"success": False, "error": "..."}``. In between it retries
+with backoff, honours Retry-After, and shares a retry budget and circuit
+breaker per host (see api_basics.retry). api_basics.aio has the async twin.
+
+    result = safe_api_request("https://jsonplaceholder.typicode.com/posts/1")
+    if result["success"]:
+        print(result["data"]["title"])
+"""
+
+import logging
+import time
+from urllib.parse import urlsplit
+
+from api_basics.cache import make_key
+from api_basics.client import get_client, store_response
+from api_basics.metrics import decode_json, metrics
+from api_basics.ratelimit import RateLimited
+from api_basics.retry import backoff_delay, host_state, is_dns_failure, parse_retry_after
+from api_basics.singleflight import SingleFlight
+from api_basics.streaming import ResponseTooLarge, read_body
+
+logger = logging.getLogger(__name__)
+
+# Shared by every thread; in_flight.stats() shows how many calls were deduplicated.
+in_flight = SingleFlight()
+
+# Statuses that mean "busy or briefly broken, try again later".
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+
+def safe_api_request(url, timeout=5, retries=3, retry_delay=1, max_delay=30, cache=None,
+                     max_bytes=None):
+    """
+    Make an API request with error handling and retry logic.
+
+    Retries wait with exponential backoff and full jitter, or for as long
+    as the server's Retry-After header says on 429/503. All calls to the
+    same host share a retry budget and a circuit breaker (see
+    api_basics.retry), so a host that is down fails fast instead of being
+    retried again and again.
+    
+    Args:
+        url (str): API endpoint
+        timeout (int): seconds to wait for response
+        retries (int): number of attempts (at least 1)
+        retry_delay (float): base delay for the exponential backoff, in seconds
+        max_delay (float): longest wait between attempts; a longer Retry-After gives up
+        cache (ResponseCache or SQLiteCache): optional cache for successful responses
+                                              (revalidated with ETag / Last-Modified
+                                              once expired)
+        max_bytes (int): read the body in chunks and give up if it is bigger
+                         than this (None = no limit; see api_basics.streaming)
+
+    Returns:
+        dict: {"success": bool, "data": dict or None, "error": str or None}
+    """
+    if retries < 1:
+        return {"success": False, "error": f"retries must be at least 1, not {retries}"}
+    if cache is not None:
+        data = cache.get(make_key(url))
+        if data is not None:
+            logger.info(f"Cache hit: {url}")
+            return {"success": True, "data": data}
+
+    # Concurrent calls for the same URL share one set of attempts, but only
+    # if every argument matches: a capped call mustn't get an uncapped body.
+    flight_key = (make_key(url), timeout, retries, retry_delay, max_delay, id(cache), max_bytes)
+    result = in_flight.do(flight_key, _request_with_retries,
+                          url, timeout, retries, retry_delay, max_delay, cache, max_bytes)
+    return dict(result)
+
+
+def _request_with_retries(url, timeout, retries, retry_delay, max_delay, cache, max_bytes):
+    from requests.exceptions import ConnectionError, HTTPError, RequestException, Timeout
+
+    from api_basics.adapters import CassetteMiss
+
+    host = host_state(url)
+    if not host.breaker.allow_request():
+        error_msg = f"Circuit open: {urlsplit(url).hostname} is failing, retry in {host.breaker.retry_in():.0f}s."
+        logger.warning(error_msg)
+        return {"success": False, "error": error_msg}
+    host.budget.deposit()
+
+    for attempt in range(1, retries + 1):
+        retry_after = None
+        try:
+            logger.info(f"Requesting URL: {url} (Attempt {attempt})")
+            response, not_modified = get_client().conditional_get(
+                url, cache, make_key(url), timeout=timeout, stream=max_bytes is not None)
+            if not_modified is not None:
+                host.breaker.record_success()
+                return {"success": True, "data": not_modified.value}
+            response.raise_for_status()
+            if max_bytes is not None:
+                read_body(response, max_bytes)
+            start = time.perf_counter()
+            data = decode_json(response, url)
+            decode_seconds = time.perf_counter() - start
+            host.breaker.record_success()
+            if cache is not None:
+                store_response(cache, make_key(url), data, response, decode_seconds)
+            return {"success": True, "data": data}
+        except RateLimited as e:
+            # Our own limit, not a failure of the host.
+            host.breaker.cancel_trial()
+            logger.error(str(e))
+            return {"success": False, "error": str(e)}
+        except ResponseTooLarge as e:
+            # The host answered; asking again would get the same body.
+            host.breaker.record_success()
+            logger.error(str(e))
+            return {"success": False, "error": str(e)}
+        except CassetteMiss as e:
+            # Replaying offline: asking again won't record it.
+            host.breaker.cancel_trial()
+            logger.error(str(e))
+            return {"success": False, "error": str(e)}
+        except ConnectionError as e:
+            if is_dns_failure(e):
+                # Retrying won't make an unknown domain resolve.
+                host.breaker.record_failure()
+                error_msg = f"Could not resolve host: {urlsplit(url).hostname}"
+                logger.error(error_msg)
+                return {"success": False, "error": error_msg}
+            error_msg = "Connection failed. Check your internet."
+        except Timeout:
+            error_msg = f"Request timed out after {timeout} seconds."
+        except HTTPError as e:
+            # A streamed response holds its connection until closed.
+            e.response.close()
+            error_msg = f"HTTP Error: {e.response.status_code}"
+            if e.response.status_code not in RETRYABLE_STATUS:
+                # The host answered; only this resource is bad.
+                host.breaker.record_success()
+                logger.error(error_msg)
+                return {"success": False, "error": error_msg}
+            retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+        except RequestException as e:
+            error_msg = f"Request failed: {str(e)}"
+
+        host.breaker.record_failure()
+        if attempt == retries:
+            logger.warning(f"{error_msg} Giving up.")
+            break
+        if retry_after is not None and retry_after > max_delay:
+            logger.warning(f"{error_msg} Server asked to wait {retry_after:.0f}s; giving up.")
+            break
+        if not host.breaker.allow_request():
+            logger.warning(f"{error_msg} Circuit opened; giving up.")
+            break
+        if not host.budget.try_spend():
+            logger.warning(f"{error_msg} Retry budget for this host is spent; giving up.")
+            break
+
+        delay = retry_after if retry_after is not None else backoff_delay(attempt, retry_delay, max_delay)
+        logger.warning(f"{error_msg} Retrying in {delay:.1f}s...")
+        if metrics.enabled:
+            metrics.count_retry(url)
+        time.sleep(delay)
+
+    return {"success": False, "error": error_msg}
@@ -0,0 +1,155 @@
+"""
+Background Refresh Scheduler
+============================
+
+Instead of fetching after every menu choice, a background thread keeps a
+watchlist fresh, and the dashboard reads whatever was fetched last.
+
+Each source (e.g. "weather", "crypto") has its own refresh interval.
+Start times are staggered and every interval gets some random jitter, so
+the sources don't all fire at once. Results are published as an immutable
+``Snapshot``. Readers take the current snapshot without locking, and it
+never changes under them.
+"""
+
+import heapq
+import logging
+import random
+import threading
+import time
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+_EMPTY = MappingProxyType({})
+
+
+class Snapshot:
+    """
+    Read-only view of the latest data for every source.
+
+    Attributes:
+        data: source -> (key -> value), all read-only mappings
+        updated: source -> ``time.time()`` of the last successful refresh
+        errors: source -> message from the last failed refresh
+    """
+
+    __slots__ = ("data", "updated", "errors")
+
+    def __init__(self, data=_EMPTY, updated=_EMPTY, errors=_EMPTY):
+        self.data = data
+        self.updated = updated
+        self.errors = errors
+
+    def get(self, source, key):
+        return self.data.get(source, _EMPTY).get(key)
+
+    def age(self, source):
+        """Seconds since ``source`` was last refreshed (None if never)."""
+        updated = self.updated.get(source)
+        return None if updated is None else time.time() - updated
+
+
+class _Job:
+    __slots__ = ("source", "func", "interval", "jitter")
+
+    def __init__(self, source, func, interval, jitter):
+        self.source = source
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+
+    def next_delay(self):
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class RefreshScheduler:
+    """
+    Run refresh functions on their own intervals in one background thread.
+
+    Args:
+        stagger (float): seconds between the first runs of successive sources
+    """
+
+    def __init__(self, stagger=1.0):
+        self.stagger = stagger
+        self.snapshot = Snapshot()
+        self._jobs = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._publish_lock = threading.Lock()
+
+    def add(self, source, func, interval, jitter=0.1):
+        """
+        Register a source.
+
+        Args:
+            source (str): name, e.g. "weather"
+            func (callable): returns a dict of key -> value for this source
+            interval (float): seconds between refreshes
+            jitter (float): fraction of ``interval`` to randomize (+/-)
+        """
+        self._jobs.append(_Job(source, func, interval, jitter))
+        return self
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="refresh-scheduler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        """Stop after the current refresh (if any) finishes."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh(self, source):
+        """Refresh one source now, in the calling thread."""
+        for job in self._jobs:
+            if job.source == source:
+                self._refresh(job)
+
+    def _run(self):
+        now = time.monotonic()
+        queue = [(now + i * self.stagger, i, job) for i, job in enumerate(self._jobs)]
+        heapq.heapify(queue)
+        while queue and not self._stop.is_set():
+            due, i, job = queue[0]
+            if self._stop.wait(max(0.0, due - time.monotonic())):
+                break
+            heapq.heapreplace(queue, (time.monotonic() + job.next_delay(), i, job))
+            self._refresh(job)
+
+    def _refresh(self, job):
+        try:
+            result = job.func()
+        except Exception as e:
+            logger.warning(f"Refreshing {job.source} failed: {e}")
+            self._publish(job.source, error=str(e))
+        else:
+            self._publish(job.source, result=result)
+
+    def _publish(self, source, result=None, error=None):
+        with self._publish_lock:
+            old = self.snapshot
+            data, updated, errors = dict(old.data), dict(old.updated), dict(old.errors)
+            if error is None:
+                data[source] = MappingProxyType(dict(result))
+                updated[source] = time.time()
+                errors.pop(source, None)
+            else:
+                errors[source] = error
+            # One reference assignment, so readers see either old or new.
+            self.snapshot = Snapshot(MappingProxyType(data), MappingProxyType(updated),
+                                     MappingProxyType(errors))
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,108 @@
+"""
+Request Coalescing (Single-flight)
+==================================
+
+If several threads ask for the same ticker at the same moment, only one
+of them needs to hit the network. The others can wait for that result.
+
+``SingleFlight`` does this for threads and ``AsyncSingleFlight`` for
+asyncio tasks. Callers that share a key while a call is in flight all
+get the same result, or the same exception.
+"""
+
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Thread-safe duplicate-call suppression.
+
+    Counters: ``calls`` (every do()), ``executions`` (calls that ran func)
+    and ``deduplicated`` (calls that waited for someone else's result).
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.deduplicated = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Run ``func(*args, **kwargs)`` unless a call for ``key`` is already
+        running, in which case wait for that call and share its outcome.
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+                self.executions += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+
+    def stats(self):
+        return {"calls": self.calls, "executions": self.executions,
+                "deduplicated": self.deduplicated}
+
+
+class AsyncSingleFlight:
+    """
+    asyncio version of ``SingleFlight``.
+
+    The shared call runs as its own task, so cancelling one waiter does
+    not cancel the fetch the other waiters depend on.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.deduplicated = 0
+        self._in_flight = {}
+
+    async def do(self, key, func, *args, **kwargs):
+        """Await ``func(*args, **kwargs)``, sharing one run per ``key``."""
+        import asyncio
+
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self.executions += 1
+        else:
+            self.deduplicated += 1
+        return await asyncio.shield(task)
+
+    def stats(self):
+        return {"calls": self.calls, "executions": self.executions,
+                "deduplicated": self.deduplicated}
@@ -0,0 +1,152 @@
+"""
+Streaming Response Bodies
+=========================
+
+``response.json()`` reads the whole body into memory first, however big
+it is. A misbehaving server can send far more than we expect, and even a
+good one can be large: CoinPaprika's ``/v1/tickers`` is several
+megabytes of JSON, which becomes many more megabytes of dicts.
+
+For a response requested with ``stream=True``:
+
+- ``read_body`` reads the body in chunks and raises ``ResponseTooLarge``
+  once it passes ``max_bytes`` (straight away if Content-Length already
+  says it will). After that ``response.json()`` and ``response.content``
+  work as usual.
+- ``iter_json_array`` parses a JSON array as it arrives and yields one
+  item at a time, so only the current chunk and item are in memory.
+
+    response = get_client().get(TICKERS_URL, stream=True)
+    for ticker in iter_json_array(response, max_bytes=50_000_000):
+        ...
+
+``safe_api_request(url, max_bytes=...)`` and ``fetch_data(url,
+max_bytes=...)`` in part1 use ``read_body``; ``TickerSnapshot`` uses
+``iter_json_array``.
+"""
+
+import codecs
+import json
+import re
+
+CHUNK_SIZE = 64 * 1024
+
+_SPACE = re.compile(r"[ \t\n\r]*")
+_AFTER_ITEM = frozenset(", ]\t\n\r")
+
+
+class ResponseTooLarge(Exception):
+    """The response body is bigger than the ``max_bytes`` we allowed."""
+
+    def __init__(self, url, max_bytes, size=None):
+        size_text = f" ({size} bytes)" if size is not None else ""
+        super().__init__(f"Response from {url} is larger than {max_bytes} bytes{size_text}")
+        self.url = url
+        self.max_bytes = max_bytes
+        self.size = size
+
+
+def iter_chunks(response, max_bytes=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield the body of ``response`` in chunks of up to ``chunk_size`` bytes.
+
+    Raises:
+        ResponseTooLarge: once more than ``max_bytes`` would be read
+                          (the connection is closed)
+    """
+    if max_bytes is not None:
+        declared = response.headers.get("Content-Length", "")
+        if declared.isdigit() and int(declared) > max_bytes:
+            response.close()
+            raise ResponseTooLarge(response.url, max_bytes, int(declared))
+    size = 0
+    for chunk in response.iter_content(chunk_size):
+        size += len(chunk)
+        if max_bytes is not None and size > max_bytes:
+            response.close()
+            raise ResponseTooLarge(response.url, max_bytes)
+        yield chunk
+
+
+def read_body(response, max_bytes=None, chunk_size=CHUNK_SIZE):
+    """
+    ``response.content``, but read in chunks and never more than ``max_bytes``.
+
+    Returns:
+        bytes: the body (also kept on the response, for ``.json()``)
+
+    Raises:
+        ResponseTooLarge: if the body is bigger than ``max_bytes``
+    """
+    content = response._content
+    if content is not False:       # already read: not streamed, or replayed
+        if max_bytes is not None and len(content) > max_bytes:
+            raise ResponseTooLarge(response.url, max_bytes, len(content))
+        return content
+    response._content = b"".join(iter_chunks(response, max_bytes, chunk_size))
+    return response._content
+
+
+def iter_json_array(response, max_bytes=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield the items of a JSON array body one at a time, as it arrives.
+
+    An item is parsed once it has arrived whole, so memory use is one
+    chunk plus the item being parsed, whatever the length of the array.
+
+    Raises:
+        ResponseTooLarge: if the body is bigger than ``max_bytes``
+        json.JSONDecodeError: if the body isn't a JSON array
+    """
+    chunks = iter_chunks(response, max_bytes, chunk_size)
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    decode = json.JSONDecoder().raw_decode
+    buffer, pos, ended = "", 0, False
+
+    def fill():
+        # Drop what has been parsed, add the next chunk.
+        nonlocal buffer, pos, ended
+        chunk = next(chunks, None)
+        if chunk is None:
+            ended = True
+            buffer = buffer[pos:] + utf8.decode(b"", final=True)
+        else:
+            buffer = buffer[pos:] + utf8.decode(chunk)
+        pos = 0
+
+    def next_char():
+        nonlocal pos
+        while True:
+            pos = _SPACE.match(buffer, pos).end()
+            if pos < len(buffer) or ended:
+                return buffer[pos:pos + 1]
+            fill()
+
+    if next_char() != "[":
+        raise json.JSONDecodeError("Expecting '['", buffer, pos)
+    pos += 1
+    if next_char() == "]":
+        return
+    while True:
+        next_char()
+        while True:
+            try:
+                item, end = decode(buffer, pos)
+            except json.JSONDecodeError:
+                if ended:
+                    raise
+                fill()         # the item isn't all here yet
+                continue
+            # Only take an item once a ",", "]" or space follows it: "1.5" at
+            # the end of the buffer may be "1.5e3" once the next chunk is in.
+            if ended or buffer[end:end + 1] in _AFTER_ITEM:
+                break
+            fill()
+        pos = end
+        yield item
+        char = next_char()
+        if char == "]":
+            return
+        if char != ",":
+            raise json.JSONDecodeError("Expecting ',' or ']'", buffer, pos)
+        pos += 1
@@ -0,0 +1,88 @@
+"""
+CoinPaprika Ticker Snapshot
+===========================
+
+``/v1/tickers/{coin_id}`` returns one coin per request, but ``/v1/tickers``
+returns every coin in a single response. ``TickerSnapshot`` downloads that
+list once, keeps the coins we care about as ``Ticker`` records, and
+answers lookups from memory until ``refresh_interval`` seconds have passed.
+
+The list is parsed one coin at a time as it downloads
+(api_basics.streaming), so the coins we don't keep are never all in
+memory together.
+"""
+
+import threading
+import time
+
+from api_basics.client import get_client
+from api_basics.records import RecordError, Ticker
+from api_basics.streaming import iter_json_array
+
+TICKERS_URL = "https://api.coinpaprika.com/v1/tickers"
+
+
+class TickerSnapshot:
+    """
+    In-memory index of CoinPaprika tickers, refreshed on demand.
+
+    Args:
+        coin_ids (iterable): ids to keep (e.g. ``CRYPTO_IDS.values()``);
+                             None keeps every coin in the response
+        refresh_interval (float): seconds before the snapshot is re-downloaded
+        url (str): the bulk tickers endpoint
+        client (ApiClient): client to use (defaults to the shared one)
+        max_bytes (int): give up on a download bigger than this (None = no limit)
+    """
+
+    def __init__(self, coin_ids=None, refresh_interval=60, url=TICKERS_URL, client=None,
+                 max_bytes=None):
+        self.coin_ids = set(coin_ids) if coin_ids is not None else None
+        self.refresh_interval = refresh_interval
+        self.url = url
+        self.client = client
+        self.max_bytes = max_bytes
+        self.fetched_at = None
+        self._index = {}
+        self._lock = threading.Lock()
+
+    def is_stale(self):
+        return (self.fetched_at is None
+                or time.monotonic() - self.fetched_at >= self.refresh_interval)
+
+    def refresh(self):
+        """
+        Download the full ticker list and rebuild the index.
+
+        Raises:
+            ResponseTooLarge: the list is bigger than ``max_bytes``
+        """
+        client = self.client or get_client()
+        index = {}
+        # Closed however this ends, so the connection goes back to the pool.
+        with client.get(self.url, stream=True) as response:
+            response.raise_for_status()
+            for ticker in iter_json_array(response, self.max_bytes):
+                coin_id = ticker.get("id")
+                if self.coin_ids is None or coin_id in self.coin_ids:
+                    try:
+                        index[coin_id] = Ticker.decode(ticker)
+                    except RecordError:
+                        pass   # e.g. a coin without a USD quote
+        self._index = index
+        self.fetched_at = time.monotonic()
+
+    def get(self, coin_id):
+        """Return the Ticker for ``coin_id`` (or None), refreshing if stale."""
+        if self.is_stale():
+            with self._lock:
+                # Another thread may have refreshed while we waited.
+                if self.is_stale():
+                    self.refresh()
+        return self._index.get(coin_id)
+
+    def age(self):
+        """Seconds since the last download (None if never downloaded)."""
+        if self.fetched_at is None:
+            return None
+        return time.monotonic() - self.fetched_at
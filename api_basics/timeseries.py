@@ -0,0 +1,230 @@
+"""
+Crypto Quote Time-series
+========================
+
+Keeps recent quotes per coin in fixed-size ring buffers built on
+``array('d')``. Each value is stored as a raw 8-byte double. A list of
+dicts would spend hundreds of bytes per sample.
+
+Memory per sample: one double each for the timestamp, price, market cap,
+percent change and volume, so ``8 * 5 = 40`` bytes, allocated once up
+front (``capacity * 40`` bytes per coin). Each rolling window also keeps
+two monotonic deques of sample indices for min/max. In the worst case
+those grow to the window length.
+
+Rolling min / max / mean / stddev and VWAP are updated as each sample
+arrives, so reading them is O(1):
+
+- mean / stddev: running sum and sum of squares
+- min / max: monotonic deques
+- VWAP: running sum(price * volume) / sum(volume)
+"""
+
+import math
+import threading
+import time
+from array import array
+from collections import deque
+from datetime import datetime
+
+FIELDS = ("price", "market_cap", "percent_change_24h", "volume_24h")
+BYTES_PER_SAMPLE = 8 * (len(FIELDS) + 1)   # + timestamp
+
+# Re-sum windows from the buffer every this many samples to cancel the
+# floating-point drift of adding and subtracting running totals.
+RESUM_EVERY = 10_000
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of doubles, addressed by global sample index."""
+
+    __slots__ = ("values", "capacity", "count")
+
+    def __init__(self, capacity):
+        self.values = array("d", bytes(8 * capacity))
+        self.capacity = capacity
+        self.count = 0
+
+    def append(self, value):
+        self.values[self.count % self.capacity] = value
+        self.count += 1
+
+    def at(self, index):
+        """Value of sample ``index`` (must be one of the last ``capacity``)."""
+        return self.values[index % self.capacity]
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+
+class WindowStats:
+    """Incremental statistics over the last ``size`` samples of one field."""
+
+    __slots__ = ("size", "total", "total_sq", "min_idx", "max_idx", "since_resum")
+
+    def __init__(self, size):
+        self.size = size
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min_idx = deque()
+        self.max_idx = deque()
+        self.since_resum = 0
+
+    def push(self, buf, i):
+        """Account for sample ``i`` just appended to ``buf``."""
+        x = buf.at(i)
+        self.total += x
+        self.total_sq += x * x
+        oldest = i - self.size
+        if oldest >= 0:
+            old = buf.at(oldest)
+            self.total -= old
+            self.total_sq -= old * old
+
+        while self.min_idx and buf.at(self.min_idx[-1]) >= x:
+            self.min_idx.pop()
+        self.min_idx.append(i)
+        while self.max_idx and buf.at(self.max_idx[-1]) <= x:
+            self.max_idx.pop()
+        self.max_idx.append(i)
+        if self.min_idx[0] <= oldest:
+            self.min_idx.popleft()
+        if self.max_idx[0] <= oldest:
+            self.max_idx.popleft()
+
+        self.since_resum += 1
+        if self.since_resum >= RESUM_EVERY:
+            values = [buf.at(j) for j in range(max(0, i - self.size + 1), i + 1)]
+            self.total = math.fsum(values)
+            self.total_sq = math.fsum(v * v for v in values)
+            self.since_resum = 0
+
+    def summary(self, buf, count):
+        n = min(count, self.size)
+        if n == 0:
+            return None
+        mean = self.total / n
+        variance = max(0.0, self.total_sq / n - mean * mean)
+        return {
+            "count": n,
+            "min": buf.at(self.min_idx[0]),
+            "max": buf.at(self.max_idx[0]),
+            "mean": mean,
+            "stddev": math.sqrt(variance),
+        }
+
+
+class CoinSeries:
+    """Ring buffers and rolling windows for one coin."""
+
+    def __init__(self, capacity, windows):
+        self.times = RingBuffer(capacity)
+        self.fields = {name: RingBuffer(capacity) for name in FIELDS}
+        self.stats = {name: {w: WindowStats(w) for w in windows} for name in FIELDS}
+        # VWAP: running sum(price * volume) and sum(volume) per window
+        self.vwap = {w: [0.0, 0.0] for w in windows}
+        self.last_updated = None
+
+    def append(self, timestamp, values):
+        i = self.times.count
+        self.times.append(timestamp)
+        for name in FIELDS:
+            self.fields[name].append(values[name])
+            for window in self.stats[name].values():
+                window.push(self.fields[name], i)
+
+        price, volume = self.fields["price"], self.fields["volume_24h"]
+        for size, sums in self.vwap.items():
+            sums[0] += price.at(i) * volume.at(i)
+            sums[1] += volume.at(i)
+            if i - size >= 0:
+                sums[0] -= price.at(i - size) * volume.at(i - size)
+                sums[1] -= volume.at(i - size)
+
+
+class QuoteStore:
+    """
+    Per-coin quote history with O(1) rolling statistics.
+
+    Args:
+        capacity (int): samples kept per coin (at least the largest window)
+        windows (tuple): window lengths, in samples, to keep statistics for
+    """
+
+    def __init__(self, capacity=1024, windows=(10, 60)):
+        self.windows = tuple(windows)
+        self.capacity = max(capacity, *self.windows)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def record(self, coin, ticker):
+        """
+        Add a ``Ticker`` record (api_basics.records) for ``coin``.
+
+        Tickers whose ``last_updated`` matches the previous sample (e.g. a
+        cached response) are skipped. Returns True if a sample was added.
+        """
+        last_updated = ticker.last_updated
+        with self._lock:
+            series = self._series.get(coin)
+            if series is None:
+                series = self._series[coin] = CoinSeries(self.capacity, self.windows)
+            if last_updated is not None and last_updated == series.last_updated:
+                return False
+            series.last_updated = last_updated
+            series.append(_timestamp(last_updated),
+                          {name: float(getattr(ticker, name) or 0.0) for name in FIELDS})
+        return True
+
+    def stats(self, coin, field="price", window=None):
+        """
+        Rolling statistics for one coin and field.
+
+        Returns:
+            dict: count, min, max, mean, stddev (and vwap for "price"),
+                  or None if there is no data
+
+        Raises:
+            ValueError: ``window`` isn't one of the store's windows
+        """
+        window = window or self.windows[0]
+        if window not in self.windows:
+            configured = ", ".join(str(w) for w in self.windows)
+            raise ValueError(f"no statistics kept for window {window} (windows: {configured})")
+        with self._lock:
+            series = self._series.get(coin)
+            if series is None:
+                return None
+            summary = series.stats[field][window].summary(series.fields[field],
+                                                          series.times.count)
+            if summary is not None and field == "price":
+                pv, volume = series.vwap[window]
+                summary["vwap"] = pv / volume if volume > 0 else summary["mean"]
+        return summary
+
+    def history(self, coin, field="price"):
+        """All kept ``(timestamp, value)`` pairs for a coin, oldest first."""
+        with self._lock:
+            series = self._series.get(coin)
+            if series is None:
+                return []
+            count = series.times.count
+            start = count - len(series.times)
+            values = series.fields[field]
+            return [(series.times.at(i), values.at(i)) for i in range(start, count)]
+
+    def memory_bytes(self):
+        """Bytes held by the ring buffers (excludes the small min/max deques)."""
+        return sum(
+            s.times.values.itemsize * s.times.capacity * (len(FIELDS) + 1)
+            for s in self._series.values()
+        )
+
+
+def _timestamp(last_updated):
+    if last_updated:
+        try:
+            return datetime.fromisoformat(last_updated.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return time.time()
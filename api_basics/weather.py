@@ -0,0 +1,180 @@
+"""
+Current Weather (Open-Meteo)
+============================
+
+The weather getters behind part5's dashboard and ``python -m api_basics
+weather``. Coordinates come from the city registry (api_basics.cities),
+so any city name works, typos included.
+
+    get_weather("delhi")                  # CurrentWeather, or None if unknown
+    get_weather_at(28.61, 77.21)
+    get_weather_many(["delhi", "pune"])   # one request for both
+
+Responses are cached and shared per Open-Meteo grid cell once
+``weather_grid`` has learned the grid (see api_basics.grid).
+"""
+
+from urllib.parse import urlencode
+
+from api_basics.cache import make_key
+from api_basics.cities import find_city, get_city
+from api_basics.client import get_client
+from api_basics.grid import GridSnapper
+from api_basics.records import CurrentWeather
+
+WEATHER_URL = "https://api.open-meteo.com/v1/forecast"
+
+# Keep batched URLs comfortably under common server/proxy limits.
+MAX_URL_LENGTH = 2000
+
+# Learns Open-Meteo's model grid from responses. Once it is known, places
+# in the same grid cell share one cache entry and one request.
+weather_grid = GridSnapper()
+
+
+def lookup_city(name):
+    """Registry City for a name, or the closest spelling of one (None if unknown)."""
+    return get_city(name) or find_city(name)
+
+
+def get_weather(city, use_cache=True, refresh=False):
+    """
+    CurrentWeather for a city name (None if unknown).
+
+    Responses are cached for Open-Meteo's update interval; pass
+    ``use_cache=False`` to bypass the cache or ``refresh=True`` to replace
+    the cached entry.
+    """
+    place = lookup_city(city)
+    if place is None:
+        return None
+    return get_weather_at(place.latitude, place.longitude, use_cache, refresh)
+
+
+def weather_params(latitude, longitude):
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "current_weather": True,
+        "timezone": "auto"
+    }
+
+
+def get_weather_at(lat, lon, use_cache=True, refresh=False):
+    """
+    CurrentWeather for a coordinate.
+
+    Cached and deduplicated per Open-Meteo grid cell once weather_grid has
+    learned the grid, so nearby points share one fetch.
+    """
+    cell = weather_grid.cell(lat, lon)
+    key = make_key(WEATHER_URL, weather_params(*cell)) if cell else None
+
+    def learn(data):
+        weather_grid.observe(lat, lon, data.get("latitude"), data.get("longitude"))
+
+    data = get_client().get_json(WEATHER_URL, params=weather_params(lat, lon),
+                                 use_cache=use_cache, refresh=refresh, key=key, on_fetch=learn)
+    weather = CurrentWeather.decode(data)
+    if (cell and weather.latitude is not None
+            and not weather_grid.matches(cell, weather.latitude, weather.longitude)):
+        # Wrong guess: don't serve this to the rest of the cell.
+        get_client().invalidate(WEATHER_URL, key=key)
+    return weather
+
+
+def batch_cities(points, max_url_length=MAX_URL_LENGTH):
+    """
+    Split ``(lat, lon)`` points into groups whose combined Open-Meteo URL
+    stays under ``max_url_length`` characters.
+    """
+    # Everything in the URL except the coordinate lists.
+    base_length = len(WEATHER_URL + "?latitude=&longitude=&current_weather=True&timezone=auto")
+    batch, length = [], base_length
+    for lat, lon in points:
+        # Each point adds "lat%2C" + "lon%2C" (an encoded comma per value).
+        extra = len(str(lat)) + len(str(lon)) + 6
+        if batch and length + extra > max_url_length:
+            yield batch
+            batch, length = [], base_length
+        batch.append((lat, lon))
+        length += extra
+    if batch:
+        yield batch
+
+
+def get_weather_many(cities, refresh=False):
+    """
+    Fetch current weather for several cities in as few requests as possible.
+
+    Open-Meteo accepts comma-separated latitude/longitude lists and answers
+    with one result per location, in the same order. Cities in the same
+    grid cell (see weather_grid) are asked for once.
+
+    Args:
+        cities (list): city names
+        refresh (bool): skip cached responses and store fresh ones
+
+    Returns:
+        dict: city name -> CurrentWeather (None for unknown cities)
+    """
+    results = {}
+    cells = {}        # grid cell (or exact point) -> [(point, name), ...]
+    guessed = set()   # keys of cells that are predicted grid points
+    for city in cities:
+        city = city.lower().strip()
+        if city in results:
+            continue
+        results[city] = None
+        place = lookup_city(city)
+        if place is not None:
+            point = (place.latitude, place.longitude)
+            cell = weather_grid.cell(*point)
+            if cell is None:
+                cell = point
+            else:
+                guessed.add(cell)
+            cells.setdefault(cell, []).append((point, city))
+
+    # Ask for the first point of each cell; the cache key names the cells.
+    # Batches are measured on the points sent, which can have more digits.
+    asked = {cell: members[0][0] for cell, members in cells.items()}
+    cell_of = {point: cell for cell, point in asked.items()}
+    for points in batch_cities(list(asked.values())):
+        batch = [cell_of[point] for point in points]
+        params = weather_params(",".join(str(p[0]) for p in points),
+                                ",".join(str(p[1]) for p in points))
+        key = make_key(WEATHER_URL, weather_params(",".join(str(c[0]) for c in batch),
+                                                   ",".join(str(c[1]) for c in batch)))
+
+        def learn(data, points=points):
+            for (lat, lon), item in zip(points, data if isinstance(data, list) else [data]):
+                weather_grid.observe(lat, lon, item.get("latitude"), item.get("longitude"))
+
+        data = get_client().get_json(WEATHER_URL, params=params, refresh=refresh,
+                                     key=key, on_fetch=learn)
+        if isinstance(data, dict):   # a single location is not wrapped in a list
+            data = [data]
+        for cell, weather in zip(batch, map(CurrentWeather.decode, data)):
+            for _, name in cells[cell]:
+                results[name] = weather
+            if (cell in guessed and weather.latitude is not None
+                    and not weather_grid.matches(cell, weather.latitude, weather.longitude)):
+                get_client().invalidate(WEATHER_URL, key=key)   # wrong grid guess
+
+    return results
+
+
+async def get_weather_async(city, client=None):
+    """Async get_weather() built on safe_api_request_async (needs aiohttp)."""
+    from api_basics.aio import ApiRequestError, safe_api_request_async
+
+    place = lookup_city(city)
+    if place is None:
+        return None
+
+    params = weather_params(place.latitude, place.longitude)
+    result = await safe_api_request_async(f"{WEATHER_URL}?{urlencode(params)}", client=client)
+    if not result["success"]:
+        raise ApiRequestError(result["error"])
+    return CurrentWeather.decode(result["data"])
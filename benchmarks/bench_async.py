@@ -0,0 +1,65 @@
+"""
+Benchmark: 500 concurrent lookups, threads vs asyncio
+=====================================================
+
+Runs the same lookups against a local stand-in server with simulated
+latency, first through the sync ``safe_api_request`` on a thread pool,
+then through ``safe_api_request_async`` with ``gather_limited``.
+
+    python -m benchmarks.bench_async --lookups 500 --latency 0.1
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from api_basics import ApiClient, set_client
+from api_basics.aio import AsyncApiClient, gather_limited, safe_api_request_async
+from api_basics.fanout import fan_out
+from api_basics.safe_request import safe_api_request
+from benchmarks.standin_server import StandinServer
+
+
+def run_sync(urls, workers):
+    set_client(ApiClient(pool_size=workers))
+    start = time.perf_counter()
+    results = fan_out(safe_api_request, urls, max_workers=workers)
+    elapsed = time.perf_counter() - start
+    ok = sum(1 for result, error in results if error is None and result["success"])
+    return elapsed, ok
+
+
+async def run_async(urls, limit):
+    async with AsyncApiClient(limit=limit, limit_per_host=0) as client:
+        start = time.perf_counter()
+        results = await gather_limited(lambda url: safe_api_request_async(url, client=client),
+                                       urls, limit=limit)
+        elapsed = time.perf_counter() - start
+    ok = sum(1 for result, error in results if error is None and result["success"])
+    return elapsed, ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--threads", type=int, default=32,
+                        help="thread pool size for the sync path")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    with StandinServer(latency=args.latency) as server:
+        urls = [f"{server.url}/v1/tickers/coin-{i}" for i in range(args.lookups)]
+        sync_time, sync_ok = run_sync(urls, args.threads)
+        async_time, async_ok = asyncio.run(run_async(urls, args.lookups))
+
+    print(f"{'mode':<22}{'ok':>6}{'total (s)':>12}{'lookups/s':>12}")
+    for name, total, ok in ((f"sync ({args.threads} threads)", sync_time, sync_ok),
+                            ("async", async_time, async_ok)):
+        print(f"{name:<22}{ok:>6}{total:>12.2f}{ok / total:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: batch mode
+=====================
+
+Feeds generated JSONL queries (weather, crypto, user, posts, city) through
+api_basics.batch against the stand-in server and reports:
+
+- throughput with 1 worker and with ``--workers``, unordered and ordered
+- how soon the first result comes out
+- peak memory (tracemalloc) for ``--queries`` and 10x as many queries,
+  which should be about the same because input is read lazily
+
+    python -m benchmarks.bench_batch --queries 2000 --workers 16 --latency 0.02
+"""
+
+import argparse
+import json
+import logging
+import time
+import tracemalloc
+
+from api_basics import ApiClient, set_client
+from api_basics.batch import run_batch
+from benchmarks.standin_server import StandinServer, redirect_to
+
+CITIES = ["delhi", "mumbai", "londn", "tokyo", "new york", "pune", "sydney", "atlantis"]
+COINS = ["bitcoin", "ethereum", "dogecoin", "solana", "notacoin"]
+
+
+def query_lines(count):
+    """``count`` JSONL queries, generated one at a time."""
+    for i in range(count):
+        kind = i % 10
+        if kind < 4:
+            query = {"type": "weather", "city": CITIES[i % len(CITIES)]}
+        elif kind < 7:
+            query = {"type": "crypto", "coin": COINS[i % len(COINS)]}
+        elif kind < 9:
+            query = {"type": "user", "id": i % 12 + 1}
+        else:
+            query = {"type": "posts", "search": "qui", "user_id": i % 10 + 1, "limit": 2}
+        yield json.dumps(query) + "\n"
+
+
+def run(server_url, count, workers, ordered):
+    """Seconds for the whole batch, seconds to the first result, errors."""
+    client = ApiClient(pool_size=workers)   # no cache: every query goes out
+    redirect_to(client, server_url)
+    set_client(client)
+    start = time.perf_counter()
+    first = None
+    errors = 0
+    for output in run_batch(query_lines(count), workers=workers, ordered=ordered):
+        if first is None:
+            first = time.perf_counter() - start
+        errors += "error" in output
+        json.dumps(output)
+    return time.perf_counter() - start, first, errors
+
+
+def peak_memory(server_url, count, workers):
+    tracemalloc.start()
+    run(server_url, count, workers, ordered=True)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with StandinServer(latency=args.latency) as server:
+        serial = max(1, args.queries // 10)
+        rows = [
+            (f"1 worker ({serial} queries)", serial, run(server.url, serial, 1, False)),
+            (f"{args.workers} workers, unordered", args.queries,
+             run(server.url, args.queries, args.workers, False)),
+            (f"{args.workers} workers, ordered", args.queries,
+             run(server.url, args.queries, args.workers, True)),
+        ]
+        server.httpd.latency = 0.0
+        small = peak_memory(server.url, args.queries, args.workers)
+        large = peak_memory(server.url, args.queries * 10, args.workers)
+
+    print(f"{'':<32}{'queries/s':>10}{'first result':>14}{'errors':>8}")
+    for name, count, (total, first, errors) in rows:
+        print(f"{name:<32}{count / total:>10.0f}{first * 1000:>12.1f}ms{errors:>8}")
+    print(f"\npeak memory, {args.queries} queries : {small / 1e6:6.2f} MB")
+    print(f"peak memory, {args.queries * 10} queries: {large / 1e6:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
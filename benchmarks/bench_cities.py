@@ -0,0 +1,86 @@
+"""
+Benchmark: city registry lookups
+================================
+
+Times the bundled city registry (api_basics.cities):
+- first load of cities.bin, and the one-off trigram index build
+- exact, prefix, fuzzy and nearest-city lookups
+- nearest-city results checked against a brute-force scan
+
+    python -m benchmarks.bench_cities
+"""
+
+import argparse
+import math
+import random
+import time
+
+from api_basics.cities import CityRegistry, _unit_vector
+
+NAMES = ["delhi", "new york", "london, ca", "sao paulo", "bangalore", "springfield"]
+TYPOS = ["londn", "bangaloer", "new yrok", "tokio", "sidney", "muumbai"]
+
+
+def per_call(func, args, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for arg in args:
+            func(arg)
+    return (time.perf_counter() - start) / (repeat * len(args))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--checks", type=int, default=200, help="brute-force nearest checks")
+    args = parser.parse_args()
+    random.seed(1)
+
+    registry = CityRegistry()
+    start = time.perf_counter()
+    count = len(registry)
+    load = time.perf_counter() - start
+    start = time.perf_counter()
+    registry.fuzzy("warmup")
+    index = time.perf_counter() - start
+
+    # Points a few km from a real city, and anywhere at all (mostly sea).
+    data = registry._load()
+    near_city = [(data.latitude[i] + random.uniform(-0.1, 0.1),
+                  data.longitude[i] + random.uniform(-0.1, 0.1))
+                 for i in random.sample(range(data.n), 200)]
+    anywhere = [(random.uniform(-60, 70), random.uniform(-180, 180)) for _ in range(200)]
+    timings = {
+        "get (exact)": per_call(registry.get, NAMES, args.repeat),
+        "search ('new y')": per_call(registry.search, ["new y"], args.repeat),
+        "search ('san')": per_call(registry.search, ["san"], args.repeat // 10),
+        "fuzzy (typos)": per_call(registry.fuzzy, TYPOS, max(1, args.repeat // 50)),
+        "nearest, near a city": per_call(lambda p: registry.nearest(*p), near_city,
+                                         args.repeat // 100),
+        "nearest, anywhere": per_call(lambda p: registry.nearest(*p), anywhere,
+                                      args.repeat // 100),
+        "nearest k=5, near a city": per_call(lambda p: registry.nearest(*p, k=5), near_city,
+                                             args.repeat // 100),
+    }
+
+    coords = [(data.latitude[i], data.longitude[i]) for i in range(data.n)]
+    vectors = [_unit_vector(lat, lon) for lat, lon in coords]
+    for _ in range(args.checks):
+        lat, lon = random.uniform(-90, 90), random.uniform(-180, 180)
+        target = _unit_vector(lat, lon)
+        best = min(range(data.n), key=lambda i: math.dist(vectors[i], target))
+        city, _ = registry.nearest(lat, lon)[0]
+        assert (city.latitude, city.longitude) == tuple(round(v, 5) for v in coords[best])
+
+    print(f"cities            : {count}")
+    print(f"load cities.bin   : {load * 1000:.1f} ms")
+    print(f"trigram index     : {index * 1000:.0f} ms (first fuzzy lookup only)")
+    for name, seconds in timings.items():
+        print(f"{name:<26}: {seconds * 1e6:8.1f} µs")
+    for typo in TYPOS:
+        print(f"  {typo!r:<12} -> {registry.find(typo)}")
+    print(f"nearest matches brute force on {args.checks} random points: ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: warm lookups from the SQLite disk cache
+==================================================
+
+Fills a SQLiteCache file, then starts a fresh Python process that opens
+the same file and times lookups, the way a restarted dashboard would.
+
+    python -m benchmarks.bench_disk_cache --entries 1000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from api_basics.disk_cache import SQLiteCache
+from benchmarks.standin_server import WEATHER_PAYLOAD
+
+
+def key_for(i):
+    return f"https://api.open-meteo.com/v1/forecast?latitude={i}&longitude={i}"
+
+
+def populate(path, entries):
+    cache = SQLiteCache(path, compact_every=entries + 1)
+    for i in range(entries):
+        cache.set(key_for(i), WEATHER_PAYLOAD)
+    cache.close()
+
+
+def lookup(path, entries, rounds):
+    """Run in the child process: time ``rounds`` passes over every key."""
+    start = time.perf_counter()
+    cache = SQLiteCache(path)
+    opened = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for i in range(entries):
+            assert cache.get(key_for(i)) is not None
+    elapsed = time.perf_counter() - start
+    lookups = entries * rounds
+    print(json.dumps({
+        "open_ms": opened * 1000,
+        "lookups": lookups,
+        "per_lookup_us": elapsed / lookups * 1e6,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--lookup", metavar="PATH", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.lookup:
+        lookup(args.lookup, args.entries, args.rounds)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite")
+        populate(path, args.entries)
+        result = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_disk_cache", "--lookup", path,
+             "--entries", str(args.entries), "--rounds", str(args.rounds)],
+            check=True, capture_output=True, text=True,
+        )
+    stats = json.loads(result.stdout)
+    print(f"open           : {stats['open_ms']:.2f} ms")
+    print(f"lookups        : {stats['lookups']}")
+    print(f"per lookup     : {stats['per_lookup_us']:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: hedged requests
+==========================
+
+Sends ``--requests`` sequential GETs, alternating the CoinPaprika ticker
+and Open-Meteo endpoints, to a stand-in server where a ``--slow`` fraction
+of requests stall for ``--hang`` seconds before answering:
+
+- ``no hedging``: every slow request is waited out
+- ``fixed``: a second copy is sent after ``--delay`` seconds
+- ``p95``: a second copy is sent after the host's observed p95
+
+Reported per mode: p50/p95/p99/max latency, hedges sent (the extra load on
+the server), how many of them answered first, and slow requests the hedge
+budget refused to hedge. ``--warmup`` requests are sent first and not
+counted, so the p95 policy has samples to work from.
+
+    python -m benchmarks.bench_hedge --requests 2000 --slow 0.03 --hang 0.3
+"""
+
+import argparse
+import time
+
+from api_basics import ApiClient
+from api_basics.hedging import HedgePolicy
+from benchmarks.standin_server import StandinServer, redirect_to
+
+URLS = [
+    "https://api.coinpaprika.com/v1/tickers/btc-bitcoin",
+    "https://api.open-meteo.com/v1/forecast?latitude=52.52&longitude=13.41&current_weather=true",
+]
+
+
+def percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def run(server, policy, requests, warmup):
+    """Latencies (sorted) of ``requests`` GETs, after ``warmup`` uncounted ones."""
+    client = ApiClient(hedge=policy)
+    redirect_to(client, server.url)
+    for i in range(warmup):
+        client.get(URLS[i % len(URLS)]).json()
+    if policy is not None:
+        policy.requests = policy.hedged = policy.hedge_wins = policy.refused = 0
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        client.get(URLS[i % len(URLS)]).json()
+        latencies.append(time.perf_counter() - start)
+    client.close()
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--jitter", type=float, default=0.005)
+    parser.add_argument("--slow", type=float, default=0.03)
+    parser.add_argument("--hang", type=float, default=0.3)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    modes = [("no hedging", None),
+             (f"fixed {args.delay * 1000:g}ms", HedgePolicy(delay=args.delay)),
+             ("p95", HedgePolicy())]
+    rows = []
+    with StandinServer(latency=args.latency, jitter=args.jitter,
+                       timeout_rate=args.slow, hang=args.hang) as server:
+        for name, policy in modes:
+            rows.append((name, policy, run(server, policy, args.requests, args.warmup)))
+
+    print(f"{args.requests} GETs, {args.slow:.0%} stall for {args.hang * 1000:g}ms\n")
+    print(f"{'':<14}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}{'hedges':>9}{'won':>6}{'refused':>9}")
+    for name, policy, latencies in rows:
+        stats = policy.stats() if policy else {"hedged": 0, "hedge_wins": 0, "refused": 0}
+        ms = [percentile(latencies, p) * 1000 for p in (50, 95, 99, 100)]
+        print(f"{name:<14}" + "".join(f"{value:>6.1f}ms" for value in ms)
+              + f"{stats['hedged']:>5} ({stats['hedged'] / args.requests:.0%})"
+              + f"{stats['hedge_wins']:>5}{stats['refused']:>9}")
+
+
+if __name__ == "__main__":
+    main()
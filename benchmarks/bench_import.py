@@ -0,0 +1,99 @@
+"""
+Benchmark: import time
+======================
+
+Imports each library module and practice script in a fresh interpreter
+and checks that importing it
+
+- takes less than ``--budget`` milliseconds (best of ``--repeat`` runs),
+- leaves ``requests``, ``urllib3``, ``asyncio``, ``aiohttp`` and
+  ``sqlite3`` unloaded (they load on first use), and
+- does no I/O: no sockets, subprocesses or databases, and no files opened
+  other than the modules being imported.
+
+Exits with status 1 if any check fails, so it can guard cold-start time.
+
+    python -m benchmarks.bench_import --budget 60
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "api_basics",
+    "api_basics.weather",
+    "api_basics.crypto",
+    "api_basics.safe_request",
+    "api_basics.__main__",
+    "api_basics.batch",
+    "part1_basic_request",
+    "part2_status_codes",
+    "part3_user_input",
+    "part4_error_handling",
+    "part5_real_api",
+]
+
+LAZY = ("requests", "urllib3", "asyncio", "aiohttp", "sqlite3")
+
+# Run in the child: watch I/O through audit hooks, then time one import.
+PROBE = """
+import importlib, json, sys, time
+module, lazy = sys.argv[1], sys.argv[2:]
+io = []
+
+def hook(event, args):
+    if event == "open" and not str(args[0]).endswith((".py", ".pyc", ".so")):
+        io.append(f"open {args[0]}")
+    elif event.startswith(("socket.", "subprocess.", "sqlite3.")):
+        io.append(event)
+
+sys.addaudithook(hook)
+start = time.perf_counter()
+importlib.import_module(module)
+elapsed = time.perf_counter() - start
+print(json.dumps({"ms": elapsed * 1000, "io": io,
+                  "loaded": [m for m in lazy if m in sys.modules]}))
+"""
+
+
+def probe(module):
+    out = subprocess.run([sys.executable, "-c", PROBE, module, *LAZY], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget", type=float, default=60, help="milliseconds per import")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<26}{'best':>9}{'worst':>9}  problems")
+    for module in MODULES:
+        runs = [probe(module) for _ in range(args.repeat)]
+        times = [run["ms"] for run in runs]
+        problems = []
+        if min(times) > args.budget:
+            problems.append(f"over {args.budget:.0f} ms")
+        if runs[0]["loaded"]:
+            problems.append("loads " + ", ".join(runs[0]["loaded"]))
+        if runs[0]["io"]:
+            problems.append("I/O: " + "; ".join(runs[0]["io"][:3]))
+        print(f"{module:<26}{min(times):>7.1f}ms{max(times):>7.1f}ms  {', '.join(problems) or 'ok'}")
+        if problems:
+            failures.append(module)
+
+    if failures:
+        print(f"\nFAILED: {', '.join(failures)}")
+        sys.exit(1)
+    print("\nall imports within budget, lazy and free of I/O")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark: bare requests.get vs the pooled ApiClient
+====================================================
+
+Sends the same number of GETs to a local HTTPS stand-in server, first
+with a fresh connection each time (``requests.get``), then through one
+keep-alive ``ApiClient``. The difference is the TCP+TLS handshake cost.
+
+    python -m benchmarks.bench_pooling --requests 200
+"""
+
+import argparse
+import time
+import warnings
+
+import requests
+from urllib3.exceptions import InsecureRequestWarning
+
+from api_basics import ApiClient
+from benchmarks.standin_server import StandinServer
+
+
+def time_calls(fetch, url, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        fetch(url).raise_for_status()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore", InsecureRequestWarning)
+
+    with StandinServer(tls=True) as server:
+        url = server.url + "/v1/tickers/btc-bitcoin"
+
+        bare = time_calls(lambda u: requests.get(u, verify=False, timeout=10),
+                          url, args.requests)
+        with ApiClient(verify=False) as client:
+            pooled = time_calls(client.get, url, args.requests)
+
+    print(f"{'mode':<10}{'total (s)':>12}{'per call (ms)':>16}")
+    for name, total in (("bare", bare), ("pooled", pooled)):
+        print(f"{name:<10}{total:>12.3f}{total / args.requests * 1000:>16.2f}")
+    print(f"speedup: {bare / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
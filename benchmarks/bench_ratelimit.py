@@ -0,0 +1,113 @@
+"""
+Benchmark: client-side rate limiting
+====================================
+
+The stand-in server plays a free tier that allows ``--limit`` requests
+per second and answers 429 to the rest. ``--threads`` threads then fetch
+tickers as fast as they can for ``--seconds``, first with the client
+limiter switched off and then with it on (``--limit`` minus a little
+headroom, burst 1). Reported per run:
+
+- requests that got through and requests that got 429
+- achieved rate of successful requests, against the allowed rate
+- time spent queueing for a slot ("queue" phase in api_basics.metrics):
+  mean, and the histogram bucket holding the 95th percentile
+
+    python -m benchmarks.bench_ratelimit --limit 20 --threads 32 --seconds 5
+"""
+
+import argparse
+import threading
+import time
+
+from api_basics import ApiClient
+from api_basics.metrics import metrics
+from api_basics.ratelimit import RateLimited, configure_rate_limit, reset_rate_limits
+from benchmarks.standin_server import StandinServer, redirect_to
+
+HOST = "api.coinpaprika.com"
+URL = f"https://{HOST}/v1/tickers/btc-bitcoin"
+
+
+def queue_stats():
+    """(mean seconds, upper bound of the p95 bucket) of the "queue" phase."""
+    for row in metrics.snapshot()["phase_seconds"]:
+        if row["phase"] == "queue" and row["count"]:
+            target = 0.95 * row["count"]
+            p95 = next(bound for bound, n in row["buckets"] if n >= target)
+            return row["sum"] / row["count"], p95
+    return None, None
+
+
+def run(server, threads, seconds, limits):
+    """Hammer the server from ``threads`` threads. Returns (counts, seconds, queue_stats())."""
+    client = ApiClient(pool_size=threads)
+    redirect_to(client, server.url)
+    configure_rate_limit(HOST, limits)
+    metrics.reset()
+    time.sleep(1.0)     # let the server's window used by the previous run run out
+    counts = {"ok": 0, "429": 0, "error": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def worker():
+        while time.monotonic() < deadline:
+            try:
+                status = client.request("GET", URL).status_code
+                outcome = "ok" if status == 200 else "429" if status == 429 else "error"
+            except RateLimited:
+                outcome = "error"
+            with lock:
+                counts[outcome] += 1
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.monotonic()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.monotonic() - start
+    client.close()
+    return counts, elapsed, queue_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--limit", type=int, default=20, help="requests/s the server allows")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--headroom", type=float, default=0.05,
+                        help="fraction of --limit the client limiter leaves unused")
+    parser.add_argument("--latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    # Burst 1: the server counts fixed one-second windows, and a bucket with
+    # burst B and rate r can put B + r requests into one of them.
+    rate = args.limit * (1 - args.headroom)
+    metrics.enable()
+    with StandinServer(latency=args.latency, rate_limit=args.limit) as server:
+        rows = [
+            ("no client limiter", run(server, args.threads, args.seconds, None)),
+            (f"limiter {rate:g}/s, burst 1",
+             run(server, args.threads, args.seconds, [(rate, 1)])),
+        ]
+    metrics.disable()
+    reset_rate_limits()
+
+    print(f"server allows {args.limit} requests/s; {args.threads} threads for {args.seconds:g}s\n")
+    print(f"{'':<26}{'ok':>7}{'429':>8}{'errors':>8}{'ok/s':>8}{'of limit':>10}"
+          f"{'queue mean':>12}{'queue p95':>11}")
+    for name, (counts, elapsed, (mean, p95)) in rows:
+        ok_rate = counts["ok"] / elapsed
+        if mean is None:
+            mean_text = p95_text = "-"
+        else:
+            mean_text = f"{mean * 1000:.0f}ms"
+            p95_text = f"<={p95 * 1000:g}ms" if p95 != "+Inf" else ">10s"
+        print(f"{name:<26}{counts['ok']:>7}{counts['429']:>8}{counts['error']:>8}"
+              f"{ok_rate:>8.1f}{ok_rate / args.limit:>10.0%}"
+              f"{mean_text:>12}{p95_text:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: Ticker records vs raw ticker dicts
+=============================================
+
+Decodes a large ``/v1/tickers`` body (the stand-in's synthetic coins) two ways:
+
+- dicts:   ``json.loads(body)`` and keep the result
+- records: ``json.loads(body)`` then ``Ticker.decode_many``, dicts dropped
+
+and reports memory kept afterwards (tracemalloc), decode time, and the cost
+of writing each form as a JSONL log line.
+
+    python -m benchmarks.bench_records --coins 10000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from api_basics.records import Ticker
+from benchmarks.standin_server import all_tickers
+
+
+def retained(build):
+    """Bytes still allocated after ``build()`` returns, and the result."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return sum(s.size_diff for s in after.compare_to(before, "filename")), result
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--coins", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body = json.dumps(all_tickers(args.coins)).encode()
+
+    def as_dicts():
+        return json.loads(body)
+
+    def as_records():
+        return Ticker.decode_many(json.loads(body))
+
+    dict_bytes, dicts = retained(as_dicts)
+    record_bytes, records = retained(as_records)
+    assert len(records) == len(dicts) == args.coins
+    assert records[0].price == dicts[0]["quotes"]["USD"]["price"]
+
+    loads_time = best_of(as_dicts, args.repeat)
+    decode_time = best_of(as_records, args.repeat)
+    dump_dicts = best_of(lambda: [json.dumps(d) for d in dicts], args.repeat)
+    dump_records = best_of(lambda: [json.dumps(r.to_dict()) for r in records], args.repeat)
+    line_dicts = sum(len(json.dumps(d)) for d in dicts) / args.coins
+    line_records = sum(len(json.dumps(r.to_dict())) for r in records) / args.coins
+
+    n = args.coins
+    print(f"{n} tickers, {len(body) / 1e6:.1f} MB body\n")
+    print(f"{'':<26}{'dicts':>12}{'records':>12}")
+    print(f"{'kept memory / ticker':<26}{dict_bytes / n:>11.0f}B{record_bytes / n:>11.0f}B")
+    print(f"{'decode / ticker':<26}{loads_time / n * 1e6:>10.2f}µs{decode_time / n * 1e6:>10.2f}µs")
+    print(f"{'JSONL encode / ticker':<26}{dump_dicts / n * 1e6:>10.2f}µs{dump_records / n * 1e6:>10.2f}µs")
+    print(f"{'JSONL line length':<26}{line_dicts:>11.0f}B{line_records:>11.0f}B")
+    print(f"\nmemory kept: {1 - record_bytes / dict_bytes:.0%} less with records")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: record and replay
+============================
+
+Records ``--urls`` different requests (users, posts, tickers, weather)
+from the stand-in server into a cassette, then sends them again:
+
+- live, through the stand-in server with ``--latency``
+- replayed with the recorded latency
+- replayed with no latency, through ``client.get``, ``client.get_json``
+  (adds the JSON decode) and ``safe_api_request`` (adds retries,
+  breaker and single-flight bookkeeping)
+
+and reports requests per second for each, plus how long opening (indexing)
+the cassette took.
+
+    python -m benchmarks.bench_replay --urls 2000 --latency 0.02
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from api_basics import ApiClient, set_client
+from api_basics.cassette import Cassette, use_cassette
+from api_basics.safe_request import safe_api_request
+from benchmarks.standin_server import StandinServer, redirect_to
+
+
+def test_urls(count):
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            yield f"https://jsonplaceholder.typicode.com/users/{i % 10 + 1}?n={i}"
+        elif kind == 1:
+            yield f"https://jsonplaceholder.typicode.com/posts/{i % 100 + 1}?n={i}"
+        elif kind == 2:
+            yield f"https://api.coinpaprika.com/v1/tickers/btc-bitcoin?n={i}"
+        else:
+            yield (f"https://api.open-meteo.com/v1/forecast?latitude={i / 100:.2f}"
+                   f"&longitude={i % 180}&current_weather=true")
+
+
+def rate(func, urls, seconds):
+    """Calls per second of ``func(url)``, cycling through ``urls`` for about ``seconds``."""
+    done = 0
+    start = time.perf_counter()
+    while True:
+        for url in urls:
+            func(url)
+        done += len(urls)
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return done / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--urls", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--seconds", type=float, default=2.0, help="per measurement")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    urls = list(test_urls(args.urls))
+    sample = urls[:50]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.cassette")
+        rows = []
+        with StandinServer(latency=args.latency) as server:
+            client = ApiClient()
+            redirect_to(client, server.url)
+            rows.append(("live (stand-in)", rate(client.get, sample, args.seconds)))
+            with use_cassette(client, path, mode="record"):
+                for url in sample:
+                    client.get(url)
+                server.httpd.latency = 0.0      # the rest only need to exist
+                for url in urls[len(sample):]:
+                    client.get(url)
+            client.close()
+
+        start = time.perf_counter()
+        cassette = Cassette(path)
+        index_time = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        client = ApiClient()
+        use_cassette(client, cassette, mode="replay", latency="recorded")
+        rows.append(("replay, recorded latency", rate(client.get, sample, args.seconds)))
+        use_cassette(client, cassette, mode="replay")
+        rows.append(("replay: client.get", rate(client.get, urls, args.seconds)))
+        rows.append(("replay: client.get_json",
+                     rate(lambda url: client.get_json(url, use_cache=False), urls, args.seconds)))
+        set_client(client)
+        rows.append(("replay: safe_api_request", rate(safe_api_request, urls, args.seconds)))
+        cassette.close()
+
+    print(f"cassette: {len(cassette)} recordings, {size / 1e6:.2f} MB, "
+          f"indexed in {index_time * 1000:.1f}ms\n")
+    print(f"{'':<28}{'requests/s':>12}")
+    for name, per_second in rows:
+        print(f"{name:<28}{per_second:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: ETag revalidation
+============================
+
+Refreshes a few endpoints ``--rounds`` times through ``get_json`` with a
+cache whose entries are always expired, so every call goes back to the
+stand-in server (which answers 304 when the ETag still matches):
+
+- ``re-download``: expired entries are dropped, every refresh is a 200
+- ``revalidate``: expired entries are revalidated with If-None-Match
+
+Reported per endpoint, from api_basics.metrics: body bytes downloaded,
+304s, bytes and JSON decode time saved, and the time per refresh.
+
+    python -m benchmarks.bench_revalidate --rounds 50 --latency 0.01
+"""
+
+import argparse
+import time
+
+from api_basics import ApiClient, ResponseCache
+from api_basics.metrics import metrics
+from benchmarks.standin_server import StandinServer, redirect_to
+
+ENDPOINTS = [
+    "https://jsonplaceholder.typicode.com/posts",
+    "https://jsonplaceholder.typicode.com/comments",
+    "https://jsonplaceholder.typicode.com/users/1",
+    "https://api.coinpaprika.com/v1/tickers",
+]
+
+
+def run(server, rounds, keep_stale):
+    """Per endpoint: (seconds per refresh, bytes downloaded, 304s, bytes saved, decode saved)."""
+    client = ApiClient(cache=ResponseCache(default_ttl=0, ttl_rules={}, keep_stale=keep_stale))
+    redirect_to(client, server.url)
+    for url in ENDPOINTS:
+        client.get_json(url)        # first download, not counted
+    metrics.reset()
+    seconds = {}
+    for url in ENDPOINTS:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            client.get_json(url)
+        seconds[url] = (time.perf_counter() - start) / rounds
+    client.close()
+
+    snapshot = metrics.snapshot()
+    downloaded = {row["endpoint"]: row["sum"] for row in snapshot["response_bytes"]}
+    saved = {row["endpoint"]: row for row in snapshot["not_modified"]}
+    rows = {}
+    for url in ENDPOINTS:
+        endpoint = url.split(".com", 1)[1].replace("/1", "/:id")
+        row = saved.get(endpoint, {})
+        rows[url] = (seconds[url], downloaded.get(endpoint, 0), row.get("count", 0),
+                     row.get("bytes_saved", 0), row.get("decode_seconds_saved", 0.0))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    metrics.enable()
+    with StandinServer(latency=args.latency) as server:
+        results = [("re-download", run(server, args.rounds, keep_stale=0)),
+                   ("revalidate", run(server, args.rounds, keep_stale=3600))]
+    metrics.disable()
+
+    print(f"{args.rounds} refreshes per endpoint, first download not counted\n")
+    print(f"{'':<13}{'ms/refresh':>11}{'downloaded':>13}{'304s':>6}"
+          f"{'bytes saved':>13}{'decode saved':>14}")
+    for url in ENDPOINTS:
+        print(url.split("//")[1])
+        for name, rows in results:
+            per_call, downloaded, not_modified, bytes_saved, decode_saved = rows[url]
+            print(f"  {name:<11}{per_call * 1000:>11.2f}{downloaded / 1e6:>11.2f}MB"
+                  f"{not_modified:>6}{bytes_saved / 1e6:>11.2f}MB{decode_saved * 1000:>12.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
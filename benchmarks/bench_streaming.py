@@ -0,0 +1,92 @@
+"""
+Benchmark: streaming bodies and memory caps
+===========================================
+
+The stand-in server sends an oversized ``/v1/tickers`` list (``--coins``
+tickers, chunked, about 1 KB each). Each way of reading it runs in a
+fresh process so its peak RSS can be measured on its own:
+
+- ``buffered``: ``response.json()``, as fetch_data did
+- ``capped``: ``safe_api_request(max_bytes=--max-mb)``, which gives up early
+- ``streamed``: ``iter_json_array``, counting the items one at a time
+- ``snapshot``: ``TickerSnapshot.refresh`` (streamed, keeps 6 coins)
+
+Reported per run: peak RSS above the process's RSS before the request,
+time taken, and the outcome.
+
+    python -m benchmarks.bench_streaming --coins 100000 --max-mb 10
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.standin_server import StandinServer, redirect_to
+
+MODES = ("buffered", "capped", "streamed", "snapshot")
+
+
+def child(mode, server_url, coins, max_bytes):
+    """Run one mode in this process and print a JSON result line."""
+    from api_basics import get_client
+    from api_basics.safe_request import safe_api_request
+    from api_basics.streaming import iter_json_array
+    from api_basics.tickers import TickerSnapshot
+
+    client = get_client()
+    redirect_to(client, server_url)
+    url = f"https://api.coinpaprika.com/v1/tickers?count={coins}"
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "buffered":
+        outcome = f"{len(client.get(url).json())} items"
+    elif mode == "capped":
+        result = safe_api_request(url, retries=1, max_bytes=max_bytes)
+        outcome = "ok" if result["success"] else result["error"].split(" is ")[-1]
+    elif mode == "streamed":
+        response = client.get(url, stream=True)
+        outcome = f"{sum(1 for _ in iter_json_array(response))} items"
+    else:
+        snapshot = TickerSnapshot(["btc-bitcoin", "eth-ethereum", "doge-dogecoin",
+                                   "ada-cardano", "sol-solana", "xrp-xrp"], url=url)
+        snapshot.refresh()
+        outcome = f"kept {len(snapshot._index)} coins"
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"mode": mode, "rss_kb": peak - before, "seconds": elapsed,
+                      "outcome": outcome}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--coins", type=int, default=100_000)
+    parser.add_argument("--max-mb", type=float, default=10.0)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "SERVER_URL"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    max_bytes = int(args.max_mb * 1e6)
+
+    if args.child:
+        child(args.child[0], args.child[1], args.coins, max_bytes)
+        return
+
+    rows = []
+    with StandinServer() as server:
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_streaming", "--coins", str(args.coins),
+                 "--max-mb", str(args.max_mb), "--child", mode, server.url],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            rows.append(json.loads(output.splitlines()[-1]))
+
+    print(f"{args.coins} tickers (about {args.coins / 1000:.0f} MB), cap {args.max_mb:g} MB\n")
+    print(f"{'':<10}{'peak RSS':>12}{'time':>10}  outcome")
+    for row in rows:
+        print(f"{row['mode']:<10}{row['rss_kb'] / 1024:>9.1f} MB{row['seconds']:>9.2f}s  {row['outcome']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: QuoteStore memory per sample and query cost
+======================================================
+
+Fills a QuoteStore with synthetic tickers and reports:
+- bytes allocated per sample (tracemalloc), against the documented 40
+- time per record() and per stats() call
+- the rolling stats checked against a brute-force recomputation
+
+    python -m benchmarks.bench_timeseries --samples 100000
+"""
+
+import argparse
+import math
+import random
+import statistics
+import time
+import tracemalloc
+
+from api_basics.records import Ticker
+from api_basics.timeseries import BYTES_PER_SAMPLE, QuoteStore
+
+
+def ticker(i, price, volume):
+    return Ticker(
+        id="btc-bitcoin", name="Bitcoin", symbol="BTC",
+        last_updated=f"2026-01-01T00:00:00.{i:06d}Z" if i < 1_000_000 else None,
+        price=price,
+        market_cap=price * 19_000_000,
+        percent_change_24h=random.uniform(-5, 5),
+        volume_24h=volume,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=100_000)
+    parser.add_argument("--capacity", type=int, default=100_000)
+    args = parser.parse_args()
+
+    random.seed(1)
+    prices = [30_000 + random.gauss(0, 500) for _ in range(args.samples)]
+    volumes = [random.uniform(1e6, 1e7) for _ in range(args.samples)]
+    tickers = [ticker(i, p, v) for i, (p, v) in enumerate(zip(prices, volumes))]
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    store = QuoteStore(capacity=args.capacity, windows=(10, 60))
+    for t in tickers:
+        store.record("btc", t)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(s.size_diff for s in after.compare_to(before, "filename"))
+
+    # Time a second fill with tracemalloc off.
+    store = QuoteStore(capacity=args.capacity, windows=(10, 60))
+    start = time.perf_counter()
+    for t in tickers:
+        store.record("btc", t)
+    record_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    queries = 100_000
+    for _ in range(queries):
+        store.stats("btc", "price", 60)
+    query_time = time.perf_counter() - start
+
+    stats = store.stats("btc", "price", 60)
+    window_p, window_v = prices[-60:], volumes[-60:]
+    assert math.isclose(stats["mean"], statistics.fmean(window_p), rel_tol=1e-9)
+    assert math.isclose(stats["stddev"], statistics.pstdev(window_p), rel_tol=1e-6)
+    assert stats["min"] == min(window_p) and stats["max"] == max(window_p)
+    vwap = sum(p * v for p, v in zip(window_p, window_v)) / sum(window_v)
+    assert math.isclose(stats["vwap"], vwap, rel_tol=1e-9)
+
+    print(f"documented bytes/sample : {BYTES_PER_SAMPLE}")
+    print(f"measured bytes/sample   : {allocated / args.capacity:.1f}")
+    print(f"record()                : {record_time / args.samples * 1e6:.2f} µs")
+    print(f"stats()                 : {query_time / queries * 1e6:.2f} µs")
+    print("rolling stats match brute force: ok")
+
+
+if __name__ == "__main__":
+    main()
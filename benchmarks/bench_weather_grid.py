@@ -0,0 +1,87 @@
+"""
+Benchmark: grid-snapped weather keys
+====================================
+
+Asks the stand-in server (0.125° grid, like ``weather_result.json``) for the
+weather at many points around one metro area, as a suburb list would. It
+does this three times:
+
+- exact keys: one cache entry and one request per distinct point
+- learned grid, one point at a time with get_weather_at()
+- learned grid, all points at once with get_weather_many()
+
+and reports the requests sent and whether every answer came from the grid
+cell of its own point.
+
+    python -m benchmarks.bench_weather_grid --points 300 --spread 0.3
+"""
+
+import argparse
+import random
+from unittest import mock
+
+from api_basics import ApiClient, ResponseCache, set_client, weather
+from api_basics.cities import City
+from api_basics.grid import GridSnapper
+from api_basics.metrics import metrics
+from benchmarks.standin_server import StandinServer, redirect_to, snap
+
+
+def forecast_requests():
+    return sum(row["count"] for row in metrics.snapshot()["requests"]
+               if row["endpoint"] == "/v1/forecast")
+
+
+def run(server, points, grid, many):
+    client = ApiClient(cache=ResponseCache())
+    redirect_to(client, server.url)
+    set_client(client)
+    weather.weather_grid = grid
+    metrics.reset()
+
+    if many:
+        places = {f"p{i}": City(f"p{i}", "IN", lat, lon, 0) for i, (lat, lon) in enumerate(points)}
+        with mock.patch.object(weather, "lookup_city", places.get):
+            answers = weather.get_weather_many(list(places))
+        answers = [answers[f"p{i}"] for i in range(len(points))]
+    else:
+        answers = [weather.get_weather_at(lat, lon) for lat, lon in points]
+
+    wrong = sum((w.latitude, w.longitude) != (snap(lat), snap(lon))
+                for w, (lat, lon) in zip(answers, points))
+    return forecast_requests(), client.cache.stats()["entries"], wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--points", type=int, default=300)
+    parser.add_argument("--spread", type=float, default=0.3, help="degrees around the centre")
+    args = parser.parse_args()
+
+    random.seed(1)
+    lat0, lon0 = 28.6139, 77.2090
+    points = [(round(lat0 + random.uniform(-args.spread, args.spread), 4),
+               round(lon0 + random.uniform(-args.spread, args.spread), 4))
+              for _ in range(args.points)]
+    cells = len({(snap(lat), snap(lon)) for lat, lon in points})
+
+    metrics.enable()
+    with StandinServer() as server:
+        never = GridSnapper(min_observations=float("inf"))
+        learned = GridSnapper()
+        rows = {
+            "exact keys": run(server, points, never, many=False),
+            "grid, one by one": run(server, points, learned, many=False),
+            # Reuses the grid learned in the run above.
+            "grid, learned, batched": run(server, points, learned, many=True),
+        }
+
+    step = learned.resolution()
+    print(f"{args.points} points, {cells} grid cells, learned step {step}\n")
+    print(f"{'':<24}{'requests':>10}{'cache entries':>15}{'wrong cell':>12}")
+    for name, (requests_sent, entries, wrong) in rows.items():
+        print(f"{name:<24}{requests_sent:>10}{entries:>15}{wrong:>12}")
+
+
+if __name__ == "__main__":
+    main()
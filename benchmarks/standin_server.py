@@ -0,0 +1,468 @@
+"""
+Local Stand-in API Server
+=========================
+
+A threaded HTTP(S) server that answers the same paths as Open-Meteo,
+CoinPaprika and JSONPlaceholder, with realistically shaped payloads, so
+benchmarks can run without the real internet.
+
+- ``/v1/forecast``: ``weather_result.json``-shaped, one object per location;
+  comma-separated lists return an array, coordinates snap to a 0.125° grid
+- ``/v1/tickers`` and ``/v1/tickers/{id}``: CoinPaprika tickers
+  (404 for ids that don't look like ``sym-name``); stand-in only:
+  ``/v1/tickers?count=N`` sends N tickers, chunked without a
+  Content-Length, as they are generated (for oversized bodies)
+- ``/posts``, ``/comments``, ``/todos``, ``/users`` (+ ``/{id}``,
+  ``/posts/{id}/comments``): field filters, ``_start``/``_end``/``_limit``/
+  ``_page`` and ``X-Total-Count``, like json-server
+
+Successful GETs carry a weak ``ETag`` and are answered ``304 Not
+Modified`` when ``If-None-Match`` matches, as JSONPlaceholder does.
+
+Faults can be injected per server: fixed latency plus random jitter, a
+fraction of 503 responses, a fraction of requests that hang long enough
+to trip client timeouts, and a free-tier style limit of ``rate_limit``
+requests per second (more get 429 with Retry-After).
+
+    with StandinServer(latency=0.05, jitter=0.02, error_rate=0.01) as server:
+        redirect_to(get_client(), server.url)   # real URLs now hit the stand-in
+"""
+
+import hashlib
+import json
+import os
+import random
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+from api_basics.adapters import TimedHTTPAdapter
+from api_basics.ratelimit import configure_rate_limit
+
+REAL_HOSTS = (
+    "https://api.open-meteo.com",
+    "https://api.coinpaprika.com",
+    "https://jsonplaceholder.typicode.com",
+)
+
+GRID = 0.125   # degrees; 28.6139, 77.2090 -> 28.625, 77.25 as in weather_result.json
+
+WEATHER_PAYLOAD = {
+    "latitude": 28.625,
+    "longitude": 77.25,
+    "generationtime_ms": 0.067,
+    "utc_offset_seconds": 19800,
+    "timezone": "Asia/Kolkata",
+    "timezone_abbreviation": "GMT+5:30",
+    "elevation": 214.0,
+    "current_weather_units": {
+        "time": "iso8601",
+        "interval": "seconds",
+        "temperature": "°C",
+        "windspeed": "km/h",
+        "winddirection": "°",
+        "is_day": "",
+        "weathercode": "wmo code",
+    },
+    "current_weather": {
+        "time": "2026-02-03T10:30",
+        "interval": 900,
+        "temperature": 15.1,
+        "windspeed": 3.4,
+        "winddirection": 288,
+        "is_day": 1,
+        "weathercode": 1,
+    },
+}
+
+# The CRYPTO_IDS coins first, then filler coins for the bulk endpoint.
+KNOWN_COINS = ["btc-bitcoin", "eth-ethereum", "doge-dogecoin", "ada-cardano",
+               "sol-solana", "xrp-xrp"]
+TICKER_COUNT = 2500
+
+
+def snap(value):
+    return round(round(value / GRID) * GRID, 4)
+
+
+def weather_payload(lat, lon):
+    payload = dict(WEATHER_PAYLOAD, latitude=snap(lat), longitude=snap(lon))
+    weather = dict(payload["current_weather"])
+    # Same grid cell, same data: like Open-Meteo.
+    weather["temperature"] = round(15 + (snap(lat) % 10) - (snap(lon) % 5), 1)
+    payload["current_weather"] = weather
+    return payload
+
+
+def ticker_payload(coin_id, rank=1):
+    symbol = coin_id.split("-")[0].upper()
+    seed = sum(map(ord, coin_id))
+    price = 0.01 + seed % 5000 + (seed % 97) / 100
+    usd = {
+        "price": price,
+        "volume_24h": price * 1_000_000,
+        "volume_24h_change_24h": 1.2,
+        "market_cap": price * 19_000_000,
+        "market_cap_change_24h": 0.8,
+        "percent_change_15m": 0.01,
+        "percent_change_30m": 0.02,
+        "percent_change_1h": 0.1,
+        "percent_change_6h": 0.4,
+        "percent_change_12h": 0.7,
+        "percent_change_24h": round((seed % 200 - 100) / 10, 2),
+        "percent_change_7d": 3.1,
+        "percent_change_30d": -2.4,
+        "percent_change_1y": 45.2,
+        "ath_price": price * 1.8,
+        "ath_date": "2025-11-10T14:24:00Z",
+        "percent_from_price_ath": -44.4,
+    }
+    return {
+        "id": coin_id,
+        "name": coin_id.split("-", 1)[-1].replace("-", " ").title(),
+        "symbol": symbol,
+        "rank": rank,
+        "total_supply": 19_000_000,
+        "max_supply": 21_000_000,
+        "beta_value": 0.9,
+        "first_data_at": "2010-07-17T00:00:00Z",
+        "last_updated": "2026-02-03T10:30:00Z",
+        "quotes": {"USD": usd},
+    }
+
+
+def ticker_ids(count=TICKER_COUNT):
+    return KNOWN_COINS[:count] + [f"c{i}-coin-{i}" for i in range(count - len(KNOWN_COINS))]
+
+
+def all_tickers(count=TICKER_COUNT):
+    return [ticker_payload(coin_id, rank) for rank, coin_id in enumerate(ticker_ids(count), 1)]
+
+
+def iter_tickers(count):
+    for rank, coin_id in enumerate(ticker_ids(count), 1):
+        yield ticker_payload(coin_id, rank)
+
+
+def _jsonplaceholder_data():
+    users = [{
+        "id": u,
+        "name": f"User {u}",
+        "username": f"user{u}",
+        "email": f"user{u}@example.com",
+        "address": {"street": "Main St", "suite": f"Apt. {u}", "city": "Gwenborough",
+                    "zipcode": "92998-3874", "geo": {"lat": "-37.3159", "lng": "81.1496"}},
+        "phone": f"1-770-736-80{u:02d}",
+        "website": f"user{u}.org",
+        "company": {"name": f"Company {u}", "catchPhrase": "Multi-layered client-server",
+                    "bs": "harness real-time e-markets"},
+    } for u in range(1, 11)]
+    posts = [{"userId": (p - 1) // 10 + 1, "id": p, "title": f"post title {p}",
+              "body": "quia et suscipit\nsuscipit recusandae consequuntur " * 3}
+             for p in range(1, 101)]
+    comments = [{"postId": (c - 1) // 5 + 1, "id": c, "name": f"comment {c}",
+                 "email": f"c{c}@example.com", "body": "laudantium enim quasi est " * 4}
+                for c in range(1, 501)]
+    todos = [{"userId": (t - 1) // 20 + 1, "id": t, "title": f"todo {t}",
+              "completed": t % 3 == 0}
+             for t in range(1, 201)]
+    return {"users": users, "posts": posts, "comments": comments, "todos": todos}
+
+
+COLLECTIONS = _jsonplaceholder_data()
+
+
+def _matches(item, filters):
+    for key, value in filters.items():
+        if str(item.get(key)).lower() != value.lower():
+            return False
+    return True
+
+
+def list_collection(items, query):
+    """Filter and slice like json-server. Returns (items, total)."""
+    filters = {k: v for k, v in query.items() if not k.startswith("_")}
+    items = [item for item in items if _matches(item, filters)]
+    total = len(items)
+    if "_page" in query:
+        limit = int(query.get("_limit", 10))
+        start = (int(query["_page"]) - 1) * limit
+        return items[start:start + limit], total
+    start = int(query.get("_start", 0))
+    if "_end" in query:
+        return items[start:int(query["_end"])], total
+    if "_limit" in query:
+        return items[start:start + int(query["_limit"])], total
+    return items[start:], total
+
+
+def route(path, query):
+    """
+    Answer one GET.
+
+    Returns:
+        tuple: (status, payload, extra headers)
+    """
+    parts = [p for p in path.split("/") if p]
+
+    if parts[:2] == ["v1", "forecast"]:
+        lats = [float(x) for x in query.get("latitude", "28.6139").split(",")]
+        lons = [float(x) for x in query.get("longitude", "77.2090").split(",")]
+        payloads = [weather_payload(lat, lon) for lat, lon in zip(lats, lons)]
+        return 200, payloads if len(payloads) > 1 else payloads[0], {}
+
+    if parts[:2] == ["v1", "tickers"]:
+        if len(parts) == 2:
+            return 200, all_tickers(), {}
+        coin_id = parts[2]
+        if "-" not in coin_id:
+            return 404, {"error": "id not found"}, {}
+        return 200, ticker_payload(coin_id), {}
+
+    if parts and parts[0] in COLLECTIONS:
+        items = COLLECTIONS[parts[0]]
+        if len(parts) == 3 and parts[0] == "posts" and parts[2] == "comments":
+            query = dict(query, postId=parts[1])
+            items = COLLECTIONS["comments"]
+        elif len(parts) == 2:
+            found = [item for item in items if str(item["id"]) == parts[1]]
+            return (200, found[0], {}) if found else (404, {}, {})
+        page, total = list_collection(items, query)
+        headers = {"X-Total-Count": str(total)} if any(k.startswith("_") for k in query) else {}
+        return 200, page, headers
+
+    return 404, {}, {}
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.inject_faults():
+            return
+        parts = urlsplit(self.path)
+        query = dict(parse_qsl(parts.query))
+        if parts.path.rstrip("/") == "/v1/tickers" and "count" in query:
+            self.send_json_array(iter_tickers(int(query["count"])))
+            return
+        status, payload, headers = route(parts.path, query)
+        self.send_json(status, payload, headers, etag=status == 200)
+
+    def do_POST(self):
+        if self.inject_faults():
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        body["id"] = 101
+        self.send_json(201, body)
+
+    def inject_faults(self):
+        """Apply latency/errors/hangs. Returns True if a response was already sent."""
+        server = self.server
+        if server.rate_limit and not server.take_slot():
+            self.send_json(429, {"error": "rate limit exceeded"}, {"Retry-After": "1"})
+            return True
+        if server.timeout_rate and random.random() < server.timeout_rate:
+            time.sleep(server.hang)
+        delay = server.latency
+        if server.jitter:
+            delay += random.uniform(-server.jitter, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if server.error_rate and random.random() < server.error_rate:
+            self.send_json(503, {"error": "injected failure"}, {"Retry-After": "0"})
+            return True
+        return False
+
+    def send_json(self, status, payload, headers=None, etag=False):
+        body = json.dumps(payload).encode()
+        if etag:
+            tag = f'W/"{len(body):x}-{hashlib.sha1(body).hexdigest()[:27]}"'
+            headers = dict(headers or {}, ETag=tag)
+            if self.headers.get("If-None-Match") == tag:
+                self.server.not_modified += 1
+                status, body = 304, b""
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True    # the client gave up, e.g. over max_bytes
+
+    def send_json_array(self, items, batch=100):
+        """Send a JSON array with chunked encoding, ``batch`` items per chunk."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        pieces = ["["]
+        try:
+            for i, item in enumerate(items):
+                pieces.append(("," if i else "") + json.dumps(item))
+                if len(pieces) >= batch:
+                    self.write_chunk("".join(pieces).encode())
+                    pieces = []
+            pieces.append("]")
+            self.write_chunk("".join(pieces).encode())
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True    # the client gave up, e.g. over max_bytes
+
+    def write_chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_self_signed_cert(directory):
+    """Create a throwaway localhost certificate with the openssl CLI."""
+    if shutil.which("openssl") is None:
+        raise RuntimeError("openssl is needed to run the stand-in server with TLS")
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+         "-keyout", key, "-out", cert, "-days", "1", "-subj", "/CN=localhost"],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024   # room for hundreds of concurrent clients
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    timeout_rate = 0.0
+    hang = 30.0
+    rate_limit = 0          # requests per one-second window (0 = unlimited)
+    accepted = 0
+    rejected = 0
+    not_modified = 0        # 304s sent
+    _window = None
+    _window_count = 0
+    _lock = threading.Lock()
+
+    def take_slot(self):
+        """Count a request against the current one-second window."""
+        with self._lock:
+            window = int(time.monotonic())
+            if window != self._window:
+                self._window, self._window_count = window, 0
+            if self._window_count >= self.rate_limit:
+                self.rejected += 1
+                return False
+            self._window_count += 1
+            self.accepted += 1
+            return True
+
+    def handle_error(self, request, client_address):
+        # A client closing a connection it gave up on (e.g. the losing copy
+        # of a hedged request) isn't a server error.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StandinServer:
+    """
+    Run ``StandinHandler`` on a background thread.
+
+    Args:
+        tls (bool): serve HTTPS with a throwaway self-signed certificate
+        handler (type): request handler class to use
+        latency (float): seconds every response is delayed by
+        jitter (float): extra random delay of up to +/- this many seconds
+        error_rate (float): fraction of requests answered with 503
+        timeout_rate (float): fraction of requests that stall for ``hang`` seconds
+        hang (float): how long a stalled request waits before answering
+        rate_limit (int): requests allowed per one-second window (0 = no limit)
+    """
+
+    def __init__(self, tls=False, handler=StandinHandler, latency=0.0, jitter=0.0,
+                 error_rate=0.0, timeout_rate=0.0, hang=30.0, rate_limit=0):
+        self.tls = tls
+        self.httpd = _HTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.latency = latency
+        self.httpd.jitter = jitter
+        self.httpd.error_rate = error_rate
+        self.httpd.timeout_rate = timeout_rate
+        self.httpd.hang = hang
+        self.httpd.rate_limit = rate_limit
+        self._tmpdir = None
+        if tls:
+            self._tmpdir = tempfile.mkdtemp()
+            cert, key = make_self_signed_cert(self._tmpdir)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(cert, key)
+            self.httpd.socket = context.wrap_socket(self.httpd.socket, server_side=True)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        scheme = "https" if self.tls else "http"
+        return f"{scheme}://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def config(self):
+        """Fault-injection settings, for benchmark reports."""
+        return {name: getattr(self.httpd, name)
+                for name in ("latency", "jitter", "error_rate", "timeout_rate", "hang",
+                             "rate_limit")}
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._tmpdir:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class RedirectAdapter(TimedHTTPAdapter):
+    """Transport adapter that sends every request to ``target`` instead."""
+
+    def __init__(self, target, **kwargs):
+        super().__init__(**kwargs)
+        self.target = urlsplit(target)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = urlunsplit((self.target.scheme, self.target.netloc,
+                                  parts.path, parts.query, ""))
+        return super().send(request, **kwargs)
+
+
+def redirect_to(client, server_url, hosts=REAL_HOSTS):
+    """
+    Point ``client`` at the stand-in server for the real API hosts.
+
+    The real hosts' rate limits (api_basics.ratelimit) are switched off, as
+    the stand-in has its own (``rate_limit``); benchmarks that want them
+    call configure_rate_limit() afterwards.
+    """
+    adapter = RedirectAdapter(server_url, pool_maxsize=64)
+    for host in hosts:
+        client.session.mount(host, adapter)
+        configure_rate_limit(urlsplit(host).hostname, None)
+    return adapter
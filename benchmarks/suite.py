@@ -0,0 +1,189 @@
+"""
+Offline Benchmark Suite
+=======================
+
+Starts a local stand-in server (see ``standin_server.py``), sends the
+real API hosts to it, and times the project's own code paths:
+
+    fetch_data, safe_api_request, get_weather, get_crypto, compare_cryptos
+
+Prints throughput and p50/p95/p99 latency per scenario and writes the
+same numbers as JSON, so runs from different commits can be compared:
+
+    python -m benchmarks.suite --latency 0.02 --jitter 0.01 --output bench.json
+    git checkout other-branch
+    python -m benchmarks.suite --latency 0.02 --jitter 0.01 --baseline bench.json
+
+``--metrics metrics.prom`` also switches on request metrics
+(``api_basics.metrics``) and writes them out in Prometheus text format
+(or as JSON if the file name ends in ``.json``).
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+
+from api_basics import ApiClient, set_client
+from api_basics.metrics import metrics
+from api_basics.retry import reset_hosts
+from benchmarks.standin_server import StandinServer, redirect_to
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, round(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def call(func):
+    try:
+        return func()
+    except Exception:
+        return False
+
+
+def run_scenario(func, iterations, warmup):
+    """Call ``func`` repeatedly; it returns True on success."""
+    # The scripts print as they go; keep that out of the report.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            call(func)
+
+        latencies, errors = [], 0
+        start = time.perf_counter()
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            ok = call(func)
+            latencies.append(time.perf_counter() - t0)
+            errors += not ok
+        total = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "calls": iterations,
+        "errors": errors,
+        "throughput_per_s": iterations / total,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def scenarios(retry_delay):
+    """name -> zero-argument callable returning True on success."""
+    import part1_basic_request
+    import part5_real_api
+    from api_basics.safe_request import safe_api_request
+
+    def compare():
+        part5_real_api.compare_cryptos(list(part5_real_api.CRYPTO_IDS))
+        return True
+
+    return {
+        "fetch_data": lambda: part1_basic_request.fetch_data(
+            "https://jsonplaceholder.typicode.com/posts/5") is not None,
+        "safe_api_request": lambda: safe_api_request(
+            "https://jsonplaceholder.typicode.com/users/1", retry_delay=retry_delay)["success"],
+        "get_weather": lambda: part5_real_api.get_weather("delhi", use_cache=False) is not None,
+        "get_crypto": lambda: part5_real_api.get_crypto("bitcoin", use_cache=False) is not None,
+        "compare_cryptos": compare,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report, baseline=None):
+    print(f"{'scenario':<18}{'calls':>7}{'errors':>8}{'req/s':>10}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in report["results"].items():
+        line = (f"{name:<18}{r['calls']:>7}{r['errors']:>8}{r['throughput_per_s']:>10.1f}"
+                f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}")
+        old = (baseline or {}).get("results", {}).get(name)
+        if old:
+            line += f"   p50 {r['p50_ms'] / old['p50_ms'] - 1:+.0%} vs baseline"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- seconds of random delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503s")
+    parser.add_argument("--timeout-rate", type=float, default=0.0,
+                        help="fraction of requests that hang past the client timeout")
+    parser.add_argument("--only", action="append", help="run just this scenario (repeatable)")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--metrics", help="record request metrics and write them here")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    if args.metrics:
+        metrics.enable()
+
+    # No response cache: every call should reach the server.
+    client = ApiClient(timeout=2)
+    set_client(client)
+
+    with StandinServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                       timeout_rate=args.timeout_rate, hang=3) as server:
+        redirect_to(client, server.url)
+        results = {}
+        for name, func in scenarios(retry_delay=0.05).items():
+            if args.only and name not in args.only:
+                continue
+            reset_hosts()
+            results[name] = run_scenario(func, args.iterations, args.warmup)
+        server_config = server.config()
+
+    report = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "server": server_config,
+        "iterations": args.iterations,
+        "results": results,
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    else:
+        print()
+        print(json.dumps(report))
+
+    if args.metrics:
+        with open(args.metrics, "w") as f:
+            if args.metrics.endswith(".json"):
+                f.write(metrics.to_json(indent=2))
+            else:
+                f.write(metrics.to_prometheus())
+        print(f"Metrics written to {args.metrics}")
+
+
+if __name__ == "__main__":
+    main()
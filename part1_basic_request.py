@@ -8,55 +8,66 @@ Learn: How to make a simple GET request and view the response.
 We'll use JSONPlaceholder - a free fake API for testing.
 """
 
-import requests
+from api_basics import get_client
+from api_basics.metrics import decode_json
+from api_basics.ratelimit import RateLimited
+from api_basics.streaming import ResponseTooLarge, read_body
 
-headers = {
-    "User-Agent": "Mozilla/5.0"
-}
 
-def fetch_data(url):
+def fetch_data(url, max_bytes=None):
+    # Imported here so that importing this file stays quick.
+    import requests
+
     try:
-        response = requests.get(url, timeout=10)
+        # With max_bytes, the body is read in chunks and a response that is
+        # too big is given up on instead of filling up memory.
+        response = get_client().get(url, stream=max_bytes is not None)
         response.raise_for_status()  # Raises error for 4xx/5xx
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        if max_bytes is not None:
+            read_body(response, max_bytes)
+        return decode_json(response, url)
+    except (requests.exceptions.RequestException, ResponseTooLarge) as e:
+        print("❌ Error:", e)
+        return None
+    except RateLimited as e:
+        # Our own per-host limit (api_basics.ratelimit): nothing was sent.
         print("❌ Error:", e)
         return None
 
 
-print("===================================")
-print(" Exercise 1: Fetch Post #5")
-print("===================================")
-
-url_post_5 = "https://jsonplaceholder.typicode.com/posts/5"
-data1 = fetch_data(url_post_5)
+def main():
+    print("===================================")
+    print(" Exercise 1: Fetch Post #5")
+    print("===================================")
 
-if data1:
-    print(data1)
+    url_post_5 = "https://jsonplaceholder.typicode.com/posts/5"
+    data1 = fetch_data(url_post_5)
 
+    if data1:
+        print(data1)
 
-print("\n===================================")
-print(" Exercise 2: Fetch All Users")
-print("===================================")
+    print("\n===================================")
+    print(" Exercise 2: Fetch All Users")
+    print("===================================")
 
-url_users = "https://jsonplaceholder.typicode.com/users"
-data2 = fetch_data(url_users)
+    url_users = "https://jsonplaceholder.typicode.com/users"
+    data2 = fetch_data(url_users)
 
-if data2:
-    print(data2)
+    if data2:
+        print(data2)
 
+    print("\n===================================")
+    print(" Exercise 3: Fetch Invalid Post")
+    print("===================================")
 
-print("\n===================================")
-print(" Exercise 3: Fetch Invalid Post")
-print("===================================")
+    url_invalid = "https://jsonplaceholder.typicode.com/posts/999"
+    data3 = fetch_data(url_invalid)
 
-url_invalid = "https://jsonplaceholder.typicode.com/posts/999"
-data3 = fetch_data(url_invalid)
+    if data3:
+        print(data3)
+    else:
+        print("No data found.")
 
-if data3:
-    print(data3)
-else:
-    print("No data found.")
 
 # --- EXERCISES ---
 # Try these on your own:
@@ -69,3 +80,7 @@ else:
 #
 # Exercise 3: What happens if you fetch a post that doesn't exist?
 #             Try: https://jsonplaceholder.typicode.com/posts/999
+
+
+if __name__ == "__main__":
+    main()
@@ -15,16 +15,9 @@ Part 3: Dynamic Queries with User Input
 Difficulty: Intermediate
 """
 
-import requests
-
-# Mapping some cities to latitude/longitude for weather exercise
-CITY_COORDINATES = {
-    "delhi": (28.61, 77.23),
-    "mumbai": (19.07, 72.87),
-    "bangalore": (12.97, 77.59),
-    "chennai": (13.08, 80.27),
-    "kolkata": (22.57, 88.36)
-}
+from api_basics import get_client
+from api_basics.cities import find_city
+from api_basics.pagination import count_items, iter_posts, iter_todos
 
 
 def get_user_info():
@@ -37,7 +30,7 @@ def get_user_info():
         return
 
     url = f"https://jsonplaceholder.typicode.com/users/{user_id}"
-    response = requests.get(url)
+    response = get_client().get(url)
 
     if response.status_code == 200:
         data = response.json()
@@ -59,17 +52,15 @@ def search_posts():
         print("Invalid user ID! Must be a number between 1 and 10.")
         return
 
-    url = "https://jsonplaceholder.typicode.com/posts"
-    params = {"userId": user_id}
-
-    response = requests.get(url, params=params)
-    posts = response.json()
+    # Pages are fetched as the loop reaches them.
+    found = False
+    for i, post in enumerate(iter_posts(user_id=user_id), 1):
+        if not found:
+            print(f"\n--- Posts by User #{user_id} ---")
+            found = True
+        print(f"{i}. {post['title']}")
 
-    if posts:
-        print(f"\n--- Posts by User #{user_id} ---")
-        for i, post in enumerate(posts, 1):
-            print(f"{i}. {post['title']}")
-    else:
+    if not found:
         print("No posts found for this user.")
 
 
@@ -81,7 +72,7 @@ def get_crypto_price():
     coin_id = input("Enter coin ID (e.g., btc-bitcoin): ").lower().strip()
 
     url = f"https://api.coinpaprika.com/v1/tickers/{coin_id}"
-    response = requests.get(url)
+    response = get_client().get(url)
 
     if response.status_code == 200:
         data = response.json()
@@ -99,21 +90,22 @@ def get_crypto_price():
 def get_weather():
     """Fetch current weather for a city."""
     print("\n=== Weather Checker ===\n")
-    print("Available cities:", ", ".join(CITY_COORDINATES.keys()))
+    print("Any city works, e.g. Delhi, Mumbai, Bangalore, London (add ', GB' to pick a country)")
     
     city = input("Enter city name: ").lower().strip()
-    if city not in CITY_COORDINATES:
-        print("City not available! Try one from the list.")
+    place = find_city(city)
+    if place is None:
+        print("City not found! Check the spelling.")
         return
 
-    lat, lon = CITY_COORDINATES[city]
+    lat, lon = place.latitude, place.longitude
     url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
-    response = requests.get(url)
+    response = get_client().get(url)
 
     if response.status_code == 200:
         data = response.json()
         weather = data.get("current_weather", {})
-        print(f"\n--- Weather in {city.title()} ---")
+        print(f"\n--- Weather in {place.name}, {place.country} ---")
         print(f"Temperature: {weather.get('temperature', 'N/A')}°C")
         print(f"Wind Speed: {weather.get('windspeed', 'N/A')} km/h")
         print(f"Weather Code: {weather.get('weathercode', 'N/A')}")
@@ -131,18 +123,21 @@ def search_todos():
         return
 
     completed = True if status == "yes" else False
-    url = "https://jsonplaceholder.typicode.com/todos"
-    params = {"completed": completed}
-    
-    response = requests.get(url, params=params)
-    todos = response.json()
+
+    # Only the first 10 are downloaded; the total comes from a header.
+    pages = iter_todos(completed=completed, limit=10, page_size=10)
+    todos = list(pages)
 
     if todos:
         print(f"\n--- Todos where completed={completed} ---")
-        for i, todo in enumerate(todos[:10], 1):  # Show only first 10 for brevity
+        for i, todo in enumerate(todos, 1):  # Show only first 10 for brevity
             print(f"{i}. {todo['title']}")
-        if len(todos) > 10:
-            print(f"...and {len(todos)-10} more todos.")
+        if len(todos) == 10:
+            total = pages.total
+            if total is None:   # the server didn't send X-Total-Count
+                total = count_items("todos", completed=str(completed).lower())
+            if total > 10:
+                print(f"...and {total-10} more todos.")
     else:
         print("No todos found.")
 
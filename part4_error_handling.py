@@ -3,60 +3,11 @@ Part 4: Robust Error Handling with Logging & Retry
 ==================================================
 """
 
-import requests
-import time
 import logging
-from requests.exceptions import (
-    ConnectionError,
-    Timeout,
-    HTTPError,
-    RequestException
-)
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s"
-)
-
-
-def safe_api_request(url, timeout=5, retries=3, retry_delay=2):
-    """
-    Make an API request with error handling and retry logic.
-    
-    Args:
-        url (str): API endpoint
-        timeout (int): seconds to wait for response
-        retries (int): number of retry attempts
-        retry_delay (int): seconds to wait between retries
-
-    Returns:
-        dict: {"success": bool, "data": dict or None, "error": str or None}
-    """
-    for attempt in range(1, retries + 1):
-        try:
-            logging.info(f"Requesting URL: {url} (Attempt {attempt})")
-            response = requests.get(url, timeout=timeout)
-            response.raise_for_status()
-            return {"success": True, "data": response.json()}
-        except ConnectionError:
-            logging.warning("Connection failed. Retrying..." if attempt < retries else "Connection failed.")
-            error_msg = "Connection failed. Check your internet."
-        except Timeout:
-            logging.warning("Timeout occurred. Retrying..." if attempt < retries else "Timeout occurred.")
-            error_msg = f"Request timed out after {timeout} seconds."
-        except HTTPError as e:
-            error_msg = f"HTTP Error: {e.response.status_code}"
-            logging.error(error_msg)
-            return {"success": False, "error": error_msg}  # <-- FIXED
-        except RequestException as e:
-            logging.warning(f"Request failed: {str(e)}. Retrying..." if attempt < retries else f"Request failed: {str(e)}")
-            error_msg = f"Request failed: {str(e)}"
-
-        if attempt < retries:
-            time.sleep(retry_delay)
-        else:
-            return {"success": False, "error": error_msg}
+from api_basics.records import RecordError, Ticker, User
+# The retrying request itself lives in the package so other code can use it.
+from api_basics.safe_request import safe_api_request
 
 
 def validate_crypto_response(data):
@@ -65,13 +16,7 @@ def validate_crypto_response(data):
     
     Returns True if valid, False otherwise.
     """
-    if not isinstance(data, dict):
-        return False
-    if "quotes" not in data:
-        return False
-    if "USD" not in data["quotes"]:
-        return False
-    return True
+    return not Ticker.missing_fields(data)
 
 
 def demo_error_handling():
@@ -124,15 +69,14 @@ def fetch_crypto_safely():
     result = safe_api_request(url)
 
     if result["success"]:
-        data = result["data"]
-        if validate_crypto_response(data):
-            price = data["quotes"]["USD"]["price"]
-            change_24h = data["quotes"]["USD"]["percent_change_24h"]
-            print(f"\n{data['name']} ({data['symbol']})")
-            print(f"Price: ${price:,.2f}")
-            print(f"24h Change: {change_24h:+.2f}%")
-        else:
-            print("Error: Invalid crypto response structure!")
+        try:
+            ticker = Ticker.decode(result["data"])
+        except RecordError as e:
+            print(f"Error: Invalid crypto response structure! {e}")
+            return
+        print(f"\n{ticker.name} ({ticker.symbol})")
+        print(f"Price: ${ticker.price:,.2f}")
+        print(f"24h Change: {ticker.percent_change_24h:+.2f}%")
     else:
         print(f"\nError: {result['error']}")
         print("Tip: Try 'btc-bitcoin' or 'eth-ethereum'")
@@ -146,23 +90,27 @@ def validate_json_response():
     result = safe_api_request(url)
 
     if result["success"]:
-        data = result["data"]
-        required_fields = ["name", "email", "phone"]
-        missing = [f for f in required_fields if f not in data]
-
-        if missing:
-            print(f"Warning: Missing fields: {missing}")
+        try:
+            user = User.decode(result["data"])
+        except RecordError as e:
+            print(f"Warning: Missing fields: {e.missing}")
         else:
             print("All required fields present!")
-            print(f"Name: {data['name']}")
-            print(f"Email: {data['email']}")
-            print(f"Phone: {data['phone']}")
+            print(f"Name: {user.name}")
+            print(f"Email: {user.email}")
+            print(f"Phone: {user.phone}")
     else:
         print(f"Error: {result['error']}")
 
 
 def main():
     """Run all demos."""
+    # Setup logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s"
+    )
+
     demo_error_handling()
     print("\n" + "=" * 40 + "\n")
     validate_json_response()
@@ -4,132 +4,194 @@ Part 5: Real-World APIs - Weather & Crypto Dashboard
 Difficulty: Advanced
 """
 
-import requests
 import json
 import os
 from datetime import datetime
 
+from api_basics import get_client
+from api_basics.cities import find_city, get_city
+from api_basics.crypto import CRYPTO_IDS, get_crypto, get_crypto_async, quote_store
+from api_basics.fanout import fan_out
+from api_basics.records import Record
+from api_basics.result_log import ResultLog
+from api_basics.scheduler import RefreshScheduler
+from api_basics.weather import get_weather, get_weather_many
+
 
 # ==================================================
 # Exercise 1: Added more cities
 # ==================================================
-CITIES = {
-    "delhi": (28.6139, 77.2090),
-    "mumbai": (19.0760, 72.8777),
-    "bangalore": (12.9716, 77.5946),
-    "chennai": (13.0827, 80.2707),
-    "kolkata": (22.5726, 88.3639),
-    "hyderabad": (17.3850, 78.4867),
-    "pune": (18.5204, 73.8567),
-    "nagpur": (21.1458, 79.0882),
-    "new york": (40.7128, -74.0060),
-    "london": (51.5074, -0.1278),
-    "tokyo": (35.6762, 139.6503),
-    "sydney": (-33.8688, 151.2093),
-}
-
-
-CRYPTO_IDS = {
-    "bitcoin": "btc-bitcoin",
-    "ethereum": "eth-ethereum",
-    "dogecoin": "doge-dogecoin",
-    "cardano": "ada-cardano",
-    "solana": "sol-solana",
-    "ripple": "xrp-xrp",
-}
+# Shown for "all" and kept fresh in the background. Any other city name
+# works too: coordinates come from the city registry (api_basics.cities),
+# which also forgives typos ("londn", "bangalor").
+CITIES = [
+    "delhi", "mumbai", "bangalore", "chennai", "kolkata", "hyderabad",
+    "pune", "nagpur", "new york", "london", "tokyo", "sydney",
+]
 
 
 # ==================================================
 # WEATHER (Open-Meteo – Free API)
 # ==================================================
-def get_weather(city):
-    city = city.lower()
-    if city not in CITIES:
-        print("City not found.")
-        return None
-
-    lat, lon = CITIES[city]
-    url = "https://api.open-meteo.com/v1/forecast"
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "current_weather": True,
-        "timezone": "auto"
-    }
-
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    return response.json()
-
-
-def display_weather(city):
-    data = get_weather(city)
-    if not data:
-        return
+# The getters (get_weather, get_weather_at, get_weather_many) live in
+# api_basics.weather so other code can import them.
 
-    weather = data["current_weather"]
 
+def print_weather(city, weather):
     print("\n" + "=" * 40)
     print(f" Weather in {city.title()}")
     print("=" * 40)
-    print(f" Temperature : {weather['temperature']} °C")
-    print(f" Wind Speed : {weather['windspeed']} km/h")
-    print(f" Time       : {weather['time']}")
+    print(f" Temperature : {weather.temperature} °C")
+    print(f" Wind Speed : {weather.windspeed} km/h")
+    print(f" Time       : {weather.time}")
     print("=" * 40)
 
-    save_to_file("weather_result.json", data)
+
+def check_city(city):
+    """Say when a city is unknown or a typo was corrected. Returns False if unknown."""
+    if get_city(city) is not None:
+        return True
+    place = find_city(city)
+    if place is None:
+        print(f"City not found: {city}")
+        return False
+    print(f"(no city called '{city}', using {place.name}, {place.country})")
+    return True
+
+
+def display_weather(city):
+    """
+    Show the weather for one city, a list of cities, or "all" of CITIES.
+    Several cities are fetched together with get_weather_many().
+    """
+    if isinstance(city, str) and city.lower().strip() == "all":
+        city = list(CITIES)
+
+    if isinstance(city, str):
+        data = background_value("weather", city.lower())
+        if data:
+            print_data_age("weather")
+        elif check_city(city):
+            data = get_weather(city)
+        if not data:
+            return
+        print_weather(city, data)
+        save_result("weather", data, city.lower())
+        return
+
+    cities = [c.lower().strip() for c in city]
+    results = {c: background_value("weather", c) for c in cities}
+    missing = [c for c, data in results.items() if data is None]
+    if len(missing) < len(cities):
+        print_data_age("weather")
+    if missing:
+        for name in missing:
+            check_city(name)
+        results.update(get_weather_many(missing))
+    for name, data in results.items():
+        if data:
+            print_weather(name, data)
+            save_result("weather", data, name, snapshot=False)
+    if SAVE_SNAPSHOTS:
+        save_to_file("weather_result.json",
+                     {name: data.to_dict() for name, data in results.items() if data})
 
 
 # ==================================================
 # CRYPTO (CoinPaprika – Free API)
 # ==================================================
-def get_crypto(coin):
-    coin_id = CRYPTO_IDS.get(coin.lower())
-    if not coin_id:
-        return None
-
-    url = f"https://api.coinpaprika.com/v1/tickers/{coin_id}"
-    response = requests.get(url)
-    response.raise_for_status()
-    return response.json()
+# get_crypto and use_ticker_snapshot live in api_basics.crypto.
 
 
 def display_crypto(coin):
-    data = get_crypto(coin)
+    data = background_value("crypto", coin.lower())
+    if data:
+        print_data_age("crypto")
+    else:
+        data = get_crypto(coin)
     if not data:
         print("Crypto not found.")
         return
 
-    usd = data["quotes"]["USD"]
-
     print("\n" + "=" * 40)
-    print(f" {data['name']} ({data['symbol']})")
+    print(f" {data.name} ({data.symbol})")
     print("=" * 40)
-    print(f" Price        : ${usd['price']:.2f}")
-    print(f" Market Cap   : ${usd['market_cap']:.0f}")
-    print(f" 24h Change   : {usd['percent_change_24h']}%")
+    print(f" Price        : ${data.price:.2f}")
+    print(f" Market Cap   : ${data.market_cap:.0f}")
+    print(f" 24h Change   : {data.percent_change_24h}%")
     print("=" * 40)
 
-    save_to_file("crypto_result.json", data)
+    save_result("crypto", data, coin.lower())
 
 
 # ==================================================
 # Exercise 2: Compare Multiple Cryptos
 # ==================================================
-def compare_cryptos(coins):
-    print("\n" + "=" * 55)
+def compare_cryptos(coins, max_workers=6, deadline=15, stats_window=None):
+    """
+    Print a price table for several coins.
+
+    The coins are fetched concurrently (at most ``max_workers`` at a time)
+    and the whole table gives up after ``deadline`` seconds. Rows keep the
+    input order, and a coin that fails shows its error in its own row.
+    ``stats_window`` (10 or 60, the windows quote_store keeps) adds rolling
+    price stats; other windows show "n/a".
+    """
+    def lookup(coin):
+        return background_value("crypto", coin.lower()) or get_crypto(coin)
+
+    results = fan_out(lookup, coins, max_workers=max_workers, deadline=deadline)
+    if scheduler is not None:
+        print_data_age("crypto")
+    print_crypto_table(coins, results, stats_window)
+
+
+def print_crypto_table(coins, results, stats_window=None):
+    """Print one row per coin from ``(Ticker, error)`` pairs."""
+    width = 55 if stats_window is None else 100
+    print("\n" + "=" * width)
     print(" Crypto Comparison")
-    print("=" * 55)
-    print(f"{'Coin':<15}{'Price($)':<15}{'24h Change'}")
-    print("-" * 55)
+    print("=" * width)
+    header = f"{'Coin':<15}{'Price($)':<15}{'24h Change':<12}"
+    if stats_window is not None:
+        header += f"{'Mean':>12}{'Min':>12}{'Max':>12}{'StdDev':>10}{'VWAP':>12}"
+        header += f"  (last {stats_window})"
+    print(header.rstrip())
+    print("-" * width)
+
+    for coin, (data, error) in zip(coins, results):
+        if error is not None:
+            print(f"{coin.title():<15}Error: {error}")
+        elif not data:
+            print(f"{coin.title():<15}Not found")
+        else:
+            row = f"{coin.title():<15}{data.price:<15.2f}{str(data.percent_change_24h) + '%':<12}"
+            stats = None
+            if stats_window in quote_store.windows:
+                stats = quote_store.stats(coin.lower(), "price", stats_window)
+            if stats:
+                row += (f"{stats['mean']:>12.2f}{stats['min']:>12.2f}{stats['max']:>12.2f}"
+                        f"{stats['stddev']:>10.2f}{stats['vwap']:>12.2f}")
+            elif stats_window is not None:
+                row += f"{'n/a':>12}{'n/a':>12}{'n/a':>12}{'n/a':>10}{'n/a':>12}"
+            print(row.rstrip())
 
-    for coin in coins:
-        data = get_crypto(coin)
-        if data:
-            usd = data["quotes"]["USD"]
-            print(f"{coin.title():<15}{usd['price']:<15.2f}{usd['percent_change_24h']}%")
+    print("=" * width)
 
-    print("=" * 55)
+
+# ==================================================
+# ASYNC VERSIONS (needs: pip install aiohttp)
+# ==================================================
+# get_weather_async / get_crypto_async are in api_basics.weather / .crypto.
+
+
+async def compare_cryptos_async(coins, limit=6, deadline=15, client=None):
+    """Async compare_cryptos(): same table, fetched with gather_limited()."""
+    from api_basics.aio import gather_limited
+
+    results = await gather_limited(lambda coin: get_crypto_async(coin, client),
+                                   coins, limit=limit, deadline=deadline)
+    print_crypto_table(coins, results)
 
 
 # ==================================================
@@ -143,7 +205,7 @@ def create_post():
         "userId": 1
     }
 
-    response = requests.post(url, json=payload)
+    response = get_client().post(url, json=payload)
     print("\nPOST Response:")
     print(response.json())
 
@@ -157,6 +219,26 @@ def save_to_file(filename, data):
     print(f"✔ Data saved to {filename}")
 
 
+# Every result is appended to results.jsonl. Set SAVE_SNAPSHOTS = True to
+# also write the pretty-printed weather_result.json / crypto_result.json.
+SAVE_SNAPSHOTS = False
+result_log = None
+
+
+def save_result(source, data, key=None, snapshot=True):
+    """Append a result to the JSONL log (and the snapshot file if enabled)."""
+    global result_log
+    if isinstance(data, Record):
+        data = data.to_dict()
+    if result_log is None:
+        result_log = ResultLog()
+    result_log.append(source, data, key)
+    print(f"✔ Result logged to {result_log.path}")
+
+    if snapshot and SAVE_SNAPSHOTS:
+        save_to_file(f"{source}_result.json", data)
+
+
 # ==================================================
 # Exercise 5: API Key Support (Example)
 # ==================================================
@@ -169,14 +251,82 @@ def openweather_example():
     url = "https://api.openweathermap.org/data/2.5/weather"
     params = {"q": "Delhi", "appid": api_key, "units": "metric"}
 
-    response = requests.get(url, params=params)
+    response = get_client().get(url, params=params)
     print(response.json())
 
 
+# ==================================================
+# BACKGROUND REFRESH
+# ==================================================
+# What the dashboard keeps fresh in the background.
+WATCH_CITIES = list(CITIES)
+WATCH_COINS = list(CRYPTO_IDS)
+
+scheduler = None
+
+
+def refresh_weather(cities):
+    return {city: data for city, data in get_weather_many(cities, refresh=True).items() if data}
+
+
+def refresh_crypto(coins):
+    results = fan_out(lambda coin: get_crypto(coin, refresh=True), coins)
+    return {coin: data for coin, (data, error) in zip(coins, results) if data}
+
+
+def start_background_refresh(cities=WATCH_CITIES, coins=WATCH_COINS,
+                             weather_interval=900, crypto_interval=60):
+    """
+    Keep the watchlists fresh in a background thread.
+
+    display_weather, display_crypto and compare_cryptos read the latest
+    snapshot instead of waiting on the network. Items outside the
+    watchlist are still fetched directly.
+    """
+    global scheduler
+    stop_background_refresh()
+    scheduler = RefreshScheduler()
+    scheduler.add("weather", lambda: refresh_weather(cities), weather_interval)
+    scheduler.add("crypto", lambda: refresh_crypto(coins), crypto_interval)
+    return scheduler.start()
+
+
+def stop_background_refresh():
+    global scheduler
+    if scheduler is not None:
+        scheduler.stop()
+        scheduler = None
+
+
+def background_value(source, key):
+    """Latest background-refreshed value for ``key``, or None."""
+    if scheduler is None:
+        return None
+    return scheduler.snapshot.get(source, key)
+
+
+def print_data_age(source):
+    age = scheduler.snapshot.age(source) if scheduler is not None else None
+    if age is not None:
+        print(f"(background data, updated {age:.0f}s ago)")
+
+
 # ==================================================
 # DASHBOARD
 # ==================================================
-def dashboard():
+def dashboard(background=True):
+    """Interactive menu. ``background`` keeps WATCH_CITIES / WATCH_COINS fresh."""
+    if background:
+        start_background_refresh()
+    try:
+        dashboard_loop()
+    finally:
+        stop_background_refresh()
+        if result_log is not None:
+            result_log.close()
+
+
+def dashboard_loop():
     while True:
         print("\n" + "=" * 50)
         print(" Real-World API Dashboard")
@@ -191,7 +341,7 @@ def dashboard():
         choice = input("Select (1-5): ")
 
         if choice == "1":
-            city = input("Enter city: ")
+            city = input("Enter city (or 'all'): ")
             display_weather(city)
 
         elif choice == "2":
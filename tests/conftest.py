@@ -0,0 +1,32 @@
+"""
+Fixtures shared by the tests: a stand-in server (benchmarks/standin_server.py)
+and a process-wide client pointed at it, so no test touches the internet.
+"""
+
+import pytest
+
+from api_basics import ApiClient
+from api_basics.client import set_client
+from api_basics.ratelimit import reset_rate_limits
+from api_basics.retry import reset_hosts
+from benchmarks.standin_server import StandinServer, redirect_to
+
+
+@pytest.fixture
+def server():
+    with StandinServer() as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    """A fresh shared client for the real API hosts, answered by ``server``."""
+    client = ApiClient()
+    redirect_to(client, server.url)
+    previous = set_client(client)
+    reset_hosts()
+    yield client
+    set_client(previous)
+    client.close()
+    reset_hosts()
+    reset_rate_limits()
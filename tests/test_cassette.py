@@ -0,0 +1,27 @@
+import pytest
+
+from api_basics.cassette import use_cassette
+from api_basics.ratelimit import RateLimited, configure_rate_limit, limiter_for, wait_for_slot
+
+POSTS_URL = "https://jsonplaceholder.typicode.com/posts"
+HOST = "jsonplaceholder.typicode.com"
+
+
+def test_replay_skips_rate_limits_without_changing_them(client, tmp_path):
+    cassette_path = str(tmp_path / "posts.cassette")
+    use_cassette(client, cassette_path, mode="record")
+    client.get(f"{POSTS_URL}/1")
+    client.post(POSTS_URL, json={"title": "hello"})
+
+    configure_rate_limit(HOST, [(1, 1)], max_wait=0)
+    wait_for_slot(POSTS_URL)           # the only slot is gone
+
+    use_cassette(client, cassette_path, mode="replay")
+    assert client.get(f"{POSTS_URL}/1").json()["id"] == 1
+    assert client.post(POSTS_URL, json={"title": "hello"}).status_code == 201
+    assert limiter_for(POSTS_URL) is not None
+
+    # Going back to the network goes back to the limit.
+    use_cassette(client, cassette_path, mode="record")
+    with pytest.raises(RateLimited):
+        client.get(f"{POSTS_URL}/1")
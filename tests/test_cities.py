@@ -0,0 +1,16 @@
+import pytest
+
+from api_basics.cities import nearest_cities
+
+
+@pytest.mark.parametrize("k", [0, -1])
+def test_nearest_with_no_cities_asked_for(k):
+    assert nearest_cities(28.61, 77.21, k=k) == []
+
+
+def test_nearest_is_sorted_by_distance():
+    found = nearest_cities(28.61, 77.21, k=5)
+    assert len(found) == 5
+    assert found[0][0].name in ("New Delhi", "Delhi")
+    distances = [km for _, km in found]
+    assert distances == sorted(distances)
@@ -0,0 +1,97 @@
+import multiprocessing
+
+import pytest
+
+from api_basics import disk_cache
+from api_basics.disk_cache import SQLiteCache
+
+
+class Clock:
+    """Stands in for the time module in api_basics.disk_cache."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(disk_cache, "time", clock)
+    return clock
+
+
+def test_entries_expire(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    cache.set("a", {"n": 1}, ttl=60)
+    clock.now += 59
+    assert cache.get("a") == {"n": 1}
+    clock.now += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 1
+
+
+def test_compaction_keeps_the_most_recently_used(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_entries=5, compact_every=1000)
+    for i in range(10):
+        clock.now += 1
+        cache.set(f"k{i}", {"n": i}, ttl=3600)
+    clock.now += 1
+    cache.get("k0")                    # recently used again
+
+    cache.compact()
+    assert sorted(cache._connect().execute("SELECT key FROM responses").fetchall()) == [
+        ("k0",), ("k6",), ("k7",), ("k8",), ("k9",)]
+    assert cache.stats()["evictions"] == 5
+
+
+def test_compaction_drops_expired_rows_and_caps_bytes(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_bytes=300, compact_every=1000)
+    cache.set("old", {"n": 0}, size=100, ttl=1)
+    for i in range(5):
+        clock.now += 1
+        cache.set(f"k{i}", {"n": i}, size=100, ttl=3600)
+
+    cache.compact()
+    stats = cache.stats()
+    assert stats["bytes"] <= 300
+    assert stats["expirations"] == 1
+    assert cache.get("k4") == {"n": 4}
+
+
+def test_set_compacts_every_few_writes(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_entries=3, compact_every=4)
+    for i in range(8):
+        clock.now += 1
+        cache.set(f"k{i}", i, ttl=3600)
+    assert len(cache) == 3             # compacted after the 8th write
+
+
+def write_and_read(path, worker, count, errors):
+    try:
+        cache = SQLiteCache(path, compact_every=25)
+        for i in range(count):
+            cache.set(f"w{worker}-{i}", {"worker": worker, "i": i}, ttl=3600)
+            cache.get(f"w{(worker + 1) % 4}-{i}")
+    except Exception as e:
+        errors.put(repr(e))
+
+
+def test_processes_share_one_file(tmp_path):
+    path = str(tmp_path / "cache.db")
+    errors = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=write_and_read, args=(path, n, 100, errors))
+               for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+
+    assert all(worker.exitcode == 0 for worker in workers)
+    assert errors.empty(), errors.get()
+    cache = SQLiteCache(path)
+    assert len(cache) == 400
+    assert cache.get("w3-99") == {"worker": 3, "i": 99}
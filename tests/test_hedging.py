@@ -0,0 +1,93 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from api_basics import ApiClient
+from api_basics.hedging import HedgePolicy
+from api_basics.ratelimit import reset_rate_limits
+from benchmarks.standin_server import StandinHandler, StandinServer, redirect_to
+
+TICKER_URL = "https://api.coinpaprika.com/v1/tickers/btc-bitcoin"
+HANG = 0.5
+
+
+class SlowFirstHandler(StandinHandler):
+    """The first request stalls for HANG seconds, the rest answer at once."""
+
+    def inject_faults(self):
+        if next(self.server.arrivals) == 0:
+            time.sleep(HANG)
+        return super().inject_faults()
+
+
+@pytest.fixture
+def slow_first():
+    with StandinServer(handler=SlowFirstHandler) as server:
+        server.httpd.arrivals = itertools.count()
+        yield server
+    reset_rate_limits()
+
+
+def hedging_client(server, policy):
+    client = ApiClient(hedge=policy)
+    redirect_to(client, server.url)
+    return client
+
+
+def test_hedge_wins_when_the_first_request_is_slow(slow_first):
+    policy = HedgePolicy(delay=0.05)
+    client = hedging_client(slow_first, policy)
+
+    start = time.perf_counter()
+    response = client.get(TICKER_URL)
+    elapsed = time.perf_counter() - start
+
+    assert response.json()["id"] == "btc-bitcoin"
+    assert elapsed < HANG / 2
+    assert policy.stats() == {"requests": 1, "hedged": 1, "hedge_wins": 1, "refused": 0}
+    client.close()
+
+
+def test_no_hedge_once_the_budget_is_spent(slow_first):
+    policy = HedgePolicy(delay=0.05, budget_ratio=0.1, max_tokens=0)
+    client = hedging_client(slow_first, policy)
+
+    start = time.perf_counter()
+    assert client.get(TICKER_URL).ok
+    elapsed = time.perf_counter() - start
+
+    assert elapsed >= HANG
+    assert policy.stats() == {"requests": 1, "hedged": 0, "hedge_wins": 0, "refused": 1}
+    assert next(slow_first.httpd.arrivals) == 1   # only the one request reached the server
+    client.close()
+
+
+def test_losing_response_is_closed(slow_first):
+    policy = HedgePolicy(delay=0.05)
+    client = hedging_client(slow_first, policy)
+    responses = []
+    lost = threading.Event()
+    send = client._send
+
+    def recording_send(method, url, kwargs):
+        response = send(method, url, kwargs)
+        responses.append(response)
+        if len(responses) == 2:
+            lost.set()
+        return response
+
+    client._send = recording_send
+    winner = client.get(TICKER_URL)
+    assert lost.wait(HANG * 4)
+    loser = next(response for response in responses if response is not winner)
+    # The done-callback that closes it runs just after the loser returns.
+    deadline = time.monotonic() + 1
+    while not loser.raw.closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert loser.raw.closed
+    assert loser._content is False   # its body was never read
+    assert winner.json()["id"] == "btc-bitcoin"
+    client.close()
@@ -0,0 +1,22 @@
+from api_basics.pagination import count_items, iter_todos, paginate
+
+
+def test_total_comes_with_the_first_page(client):
+    urls = []
+    client.session.hooks["response"].append(lambda response, **kwargs: urls.append(response.url))
+
+    pages = iter_todos(completed=True, limit=10, page_size=10)
+    assert pages.total is None
+    todos = list(pages)
+
+    assert len(todos) == 10
+    assert len(urls) == 1
+    assert pages.total == count_items("todos", completed="true")
+    assert pages.total > 10
+
+
+def test_close_stops_paging(client):
+    pages = paginate("https://jsonplaceholder.typicode.com/comments", page_size=5)
+    assert next(pages)["id"] == 1
+    pages.close()
+    assert list(pages) == []
@@ -0,0 +1,27 @@
+import time
+
+from api_basics.result_log import ResultLog, read_results
+
+
+def test_quiet_log_is_flushed_after_the_interval(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    log = ResultLog(path, flush_interval=0.1, fsync=False)
+    log.append("weather", {"temperature": 21.5}, key="delhi")
+    assert list(read_results(path)) == []     # still buffered
+
+    deadline = time.monotonic() + 2
+    while not list(read_results(path)) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    [record] = read_results(path)
+    assert record["key"] == "delhi"
+    log.close()
+
+
+def test_close_writes_everything_and_stops_the_timer(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    log = ResultLog(path, flush_interval=60, fsync=False)
+    for i in range(3):
+        log.append("crypto", {"price": i})
+    log.close()
+    assert [record["data"]["price"] for record in read_results(path)] == [0, 1, 2]
+    assert log._timer is None
@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+from api_basics.cassette import use_cassette
+from api_basics.ratelimit import configure_rate_limit, wait_for_slot
+from api_basics.retry import CircuitBreaker, host_state
+from api_basics.safe_request import safe_api_request
+
+POST_URL = "https://jsonplaceholder.typicode.com/posts/1"
+OTHER_POST_URL = "https://jsonplaceholder.typicode.com/posts/2"
+HOST = "jsonplaceholder.typicode.com"
+
+
+def half_open(url):
+    """Open ``url``'s breaker with its reset timeout already passed."""
+    breaker = host_state(url).breaker
+    breaker.state = CircuitBreaker.OPEN
+    breaker.opened_at = time.monotonic() - breaker.reset_timeout - 1
+    return breaker
+
+
+def test_rate_limited_trial_does_not_keep_breaker_open(client):
+    configure_rate_limit(HOST, [(1, 1)], max_wait=0)
+    wait_for_slot(POST_URL)            # the only slot is gone
+    breaker = half_open(POST_URL)
+
+    result = safe_api_request(POST_URL, retries=1)
+    assert not result["success"]
+    assert "rate limit" in result["error"].lower()
+
+    configure_rate_limit(HOST, None)
+    result = safe_api_request(POST_URL, retries=1)
+    assert result["success"], result["error"]
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_fetch_data_reports_our_rate_limit(client, capsys):
+    from part1_basic_request import fetch_data
+
+    configure_rate_limit(HOST, [(1, 1)], max_wait=0)
+    wait_for_slot(POST_URL)            # the only slot is gone
+    assert fetch_data(POST_URL) is None
+    assert "rate limit" in capsys.readouterr().out.lower()
+
+
+def test_cassette_miss_trial_does_not_keep_breaker_open(client, tmp_path):
+    cassette_path = str(tmp_path / "posts.cassette")
+    use_cassette(client, cassette_path, mode="record")
+    client.get(OTHER_POST_URL)
+    use_cassette(client, cassette_path, mode="replay")
+    breaker = half_open(POST_URL)
+
+    result = safe_api_request(POST_URL, retries=1)
+    assert not result["success"]
+
+    result = safe_api_request(OTHER_POST_URL, retries=1)
+    assert result["success"], result["error"]
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_streamed_error_response_is_closed_before_retrying(client, server, monkeypatch):
+    server.httpd.error_rate = 1.0      # every request gets a 503
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    responses = []
+    client.session.hooks["response"].append(lambda response, **kwargs: responses.append(response))
+
+    result = safe_api_request(POST_URL, retries=3, max_bytes=10_000)
+    assert result["error"] == "HTTP Error: 503"
+    assert len(responses) == 3
+    assert all(response.raw.closed for response in responses)
+
+
+def test_capped_call_is_not_answered_by_an_uncapped_one_in_flight(client, server):
+    server.httpd.latency = 0.3
+    comments_url = "https://jsonplaceholder.typicode.com/comments"
+    uncapped = []
+    thread = threading.Thread(target=lambda: uncapped.append(safe_api_request(comments_url)))
+    thread.start()
+    time.sleep(0.1)                    # the uncapped call is now in flight
+
+    result = safe_api_request(comments_url, retries=1, max_bytes=1000)
+    thread.join()
+
+    assert uncapped[0]["success"]
+    assert not result["success"]
+    assert "larger than 1000 bytes" in result["error"]
+
+
+@pytest.mark.parametrize("retries", [0, -1])
+def test_no_attempts_is_an_error_result(client, retries):
+    result = safe_api_request(POST_URL, retries=retries)
+    assert result == {"success": False, "error": f"retries must be at least 1, not {retries}"}
+
+
+def test_no_attempts_is_an_error_result_async():
+    import asyncio
+
+    from api_basics.aio import safe_api_request_async
+
+    result = asyncio.run(safe_api_request_async(POST_URL, retries=0))
+    assert result == {"success": False, "error": "retries must be at least 1, not 0"}
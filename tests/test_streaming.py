@@ -0,0 +1,56 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from api_basics.streaming import CHUNK_SIZE, ResponseTooLarge, iter_json_array, read_body
+
+COINS = 20_000                     # about 20 MB of JSON, 60+ MB once decoded
+MAX_BYTES = 1_000_000
+RSS_CEILING_KB = 8 * 1024
+TICKERS_URL = f"https://api.coinpaprika.com/v1/tickers?count={COINS}"
+
+
+def peak_rss(server, mode):
+    """Run one bench_streaming mode in a fresh process; its result line as a dict."""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_streaming", "--coins", str(COINS),
+         "--max-mb", str(MAX_BYTES / 1e6), "--child", mode, server.url],
+        check=True, capture_output=True, text=True, timeout=120,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_buffered_read_is_measured(server):
+    # The baseline the ceilings below are meant to beat.
+    assert peak_rss(server, "buffered")["rss_kb"] > 4 * RSS_CEILING_KB
+
+
+@pytest.mark.parametrize("mode", ["capped", "streamed", "snapshot"])
+def test_peak_rss_stays_bounded(server, mode):
+    result = peak_rss(server, mode)
+    assert result["rss_kb"] < RSS_CEILING_KB, result
+    if mode == "capped":
+        assert f"larger than {MAX_BYTES} bytes" in result["outcome"]
+    if mode == "streamed":
+        assert result["outcome"] == f"{COINS} items"
+
+
+def test_max_bytes_aborts_early(client):
+    response = client.get(TICKERS_URL, stream=True)
+    with pytest.raises(ResponseTooLarge):
+        read_body(response, MAX_BYTES)
+    assert response.raw.closed
+    # Stopped within a chunk or two of the cap, not after the whole body.
+    assert response.raw.tell() <= MAX_BYTES + 2 * CHUNK_SIZE
+
+
+def test_iter_json_array_aborts_early(client):
+    response = client.get(TICKERS_URL, stream=True)
+    items = 0
+    with pytest.raises(ResponseTooLarge):
+        for _ in iter_json_array(response, MAX_BYTES):
+            items += 1
+    assert 0 < items < COINS
+    assert response.raw.tell() <= MAX_BYTES + 2 * CHUNK_SIZE
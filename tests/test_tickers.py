@@ -0,0 +1,33 @@
+import json
+
+import pytest
+from requests import HTTPError
+
+from api_basics.tickers import TickerSnapshot
+
+TICKERS_URL = "https://api.coinpaprika.com/v1/tickers"
+
+
+def responses_of(client):
+    responses = []
+    client.session.hooks["response"].append(lambda response, **kwargs: responses.append(response))
+    return responses
+
+
+def test_refresh_keeps_the_requested_coins(client):
+    snapshot = TickerSnapshot(["btc-bitcoin", "eth-ethereum"], url=f"{TICKERS_URL}?count=500",
+                              client=client)
+    assert snapshot.get("btc-bitcoin").symbol == "BTC"
+    assert set(snapshot._index) == {"btc-bitcoin", "eth-ethereum"}
+
+
+@pytest.mark.parametrize("url, error", [
+    (f"{TICKERS_URL}/bitcoin", HTTPError),                     # 404
+    (f"{TICKERS_URL}/btc-bitcoin", json.JSONDecodeError),      # an object, not a list
+])
+def test_failed_refresh_closes_the_response(client, url, error):
+    responses = responses_of(client)
+    with pytest.raises(error):
+        TickerSnapshot(url=url, client=client).refresh()
+    assert len(responses) == 1
+    assert responses[0].raw.closed
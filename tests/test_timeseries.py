@@ -0,0 +1,78 @@
+import math
+import random
+import statistics
+import tracemalloc
+
+import pytest
+
+from api_basics.records import Ticker
+from api_basics.timeseries import BYTES_PER_SAMPLE, QuoteStore
+
+
+def tickers(count, seed=1):
+    rng = random.Random(seed)
+    for i in range(count):
+        price = 30_000 + rng.gauss(0, 500)
+        yield Ticker(id="btc-bitcoin", name="Bitcoin", symbol="BTC",
+                     last_updated=f"2026-01-01T00:00:00.{i:06d}Z", price=price,
+                     market_cap=price * 19_000_000, percent_change_24h=rng.uniform(-5, 5),
+                     volume_24h=rng.uniform(1e6, 1e7))
+
+
+def allocated_by_store(samples):
+    """Bytes allocated while filling a store with exactly ``samples`` quotes."""
+    quotes = list(tickers(samples))
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        store = QuoteStore(capacity=samples, windows=(10, 60))
+        for ticker in quotes:
+            store.record("btc", ticker)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    assert store.memory_bytes() == BYTES_PER_SAMPLE * samples
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+def test_bytes_per_sample():
+    # The difference between two sizes cancels the fixed per-store overhead.
+    allocated_by_store(1_000)   # first-use allocations (imports, caches)
+    per_sample = (allocated_by_store(6_000) - allocated_by_store(2_000)) / 4_000
+    assert BYTES_PER_SAMPLE == 40
+    assert per_sample < BYTES_PER_SAMPLE * 1.25   # + the min/max deques
+
+
+def test_rolling_stats_match_naive_recomputation():
+    store = QuoteStore(capacity=100, windows=(10, 60))
+    prices, volumes = [], []
+    for ticker in tickers(500):
+        store.record("btc", ticker)
+        prices.append(ticker.price)
+        volumes.append(ticker.volume_24h)
+        for window in (10, 60):
+            stats = store.stats("btc", "price", window)
+            last_p, last_v = prices[-window:], volumes[-window:]
+            assert stats["count"] == len(last_p)
+            assert stats["min"] == min(last_p)
+            assert stats["max"] == max(last_p)
+            assert math.isclose(stats["mean"], statistics.fmean(last_p), rel_tol=1e-9)
+            assert math.isclose(stats["stddev"], statistics.pstdev(last_p),
+                                rel_tol=1e-4, abs_tol=1e-6)
+            vwap = sum(p * v for p, v in zip(last_p, last_v)) / sum(last_v)
+            assert math.isclose(stats["vwap"], vwap, rel_tol=1e-9)
+
+
+def test_unknown_window_names_the_configured_ones():
+    store = QuoteStore(windows=(10, 60))
+    store.record("btc", next(tickers(1)))
+    with pytest.raises(ValueError, match="windows: 10, 60"):
+        store.stats("btc", "price", 30)
+
+
+def test_crypto_table_shows_na_for_unknown_window(capsys):
+    from part5_real_api import print_crypto_table
+
+    ticker = next(tickers(1))
+    print_crypto_table(["bitcoin"], [(ticker, None)], stats_window=30)
+    assert "n/a" in capsys.readouterr().out
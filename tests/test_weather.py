@@ -0,0 +1,44 @@
+import random
+from unittest import mock
+from urllib.parse import urlsplit
+
+from api_basics import weather
+from api_basics.cities import City
+from api_basics.grid import GridSnapper
+
+
+def places_around(lat0, lon0, count, seed):
+    rng = random.Random(seed)
+    return {f"p{seed}-{i}": City(f"p{seed}-{i}", "IN",
+                                 round(lat0 + rng.uniform(-5, 5), 5),
+                                 round(lon0 + rng.uniform(-5, 5), 5), 0)
+            for i in range(count)}
+
+
+def test_get_weather_many_keeps_urls_under_the_limit(client, monkeypatch):
+    monkeypatch.setattr(weather, "weather_grid", GridSnapper())
+    urls = []
+
+    def sent(response, **kwargs):
+        # The stand-in redirect changes the host; measure the real URL.
+        urls.append(f"{weather.WEATHER_URL}?{urlsplit(response.url).query}")
+
+    client.session.hooks["response"].append(sent)
+
+    # The first call teaches weather_grid the grid, so the second batches by cell.
+    for seed in (1, 2):
+        places = places_around(28.6, 77.2, 400, seed)
+        with mock.patch.object(weather, "lookup_city", places.get):
+            results = weather.get_weather_many(list(places))
+        assert all(results.values())
+
+    assert weather.weather_grid.cell(28.6, 77.2) is not None
+    assert len(urls) > 2
+    assert max(len(url) for url in urls) <= weather.MAX_URL_LENGTH
+
+
+def test_city_lookups_print_nothing(client, capsys):
+    assert weather.get_weather("no such city anywhere") is None
+    assert weather.get_weather("londn") is not None      # typo for London
+    assert weather.get_weather_many(["no such city anywhere"]) == {"no such city anywhere": None}
+    assert capsys.readouterr().out == ""